@@ -0,0 +1,126 @@
+"""Cold-start benchmark for the serving app.
+
+Measures, in fresh interpreter processes:
+
+* ``import_seconds``: time to import ``serving.main``;
+* ``health_seconds``: process start until ``GET /health`` answers;
+* ``ready_seconds``: process start until ``GET /ready`` returns 200, i.e. the
+  ``SERVING_PRELOAD_MODEL`` model is loaded and warm.
+
+A startup that never gets there reports ``null`` and an ``error`` saying why.
+
+Run from the repository root::
+
+    python benchmarks/cold_start.py --preload <RUN_ID> --runs 5
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import serving.main; "
+    "print(time.perf_counter() - t)"
+)
+
+
+def measure_import(runs: int) -> list:
+    """Seconds to import ``serving.main`` in ``runs`` fresh interpreters."""
+    return [
+        float(subprocess.run(
+            [sys.executable, "-c", _IMPORT_SNIPPET], cwd=ROOT, check=True, capture_output=True, text=True
+        ).stdout.strip().splitlines()[-1])
+        for _ in range(runs)
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _status(url: str) -> int | None:
+    try:
+        with urllib.request.urlopen(url, timeout=1) as resp:
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def measure_startup(preload: str | None, timeout: float = 120.0) -> dict:
+    """Start uvicorn and time the first healthy and the first ready response.
+
+    ``error`` is set when the server exited or never became ready within ``timeout``.
+    """
+    port = _free_port()
+    env = dict(os.environ)
+    if preload:
+        env["SERVING_PRELOAD_MODEL"] = preload
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "serving.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    result = {"health_seconds": None, "ready_seconds": None, "error": None}
+    try:
+        while time.perf_counter() - start < timeout and proc.poll() is None:
+            if result["health_seconds"] is None and _status(f"http://127.0.0.1:{port}/health") == 200:
+                result["health_seconds"] = time.perf_counter() - start
+            if result["health_seconds"] is not None and _status(f"http://127.0.0.1:{port}/ready") == 200:
+                result["ready_seconds"] = time.perf_counter() - start
+                break
+            time.sleep(0.02)
+        if result["ready_seconds"] is None:
+            if proc.poll() is not None:
+                result["error"] = f"server exited with code {proc.returncode}"
+            else:
+                stage = "/ready" if result["health_seconds"] is not None else "/health"
+                result["error"] = f"{stage} did not return 200 within {timeout:g}s"
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--preload", help="SERVING_PRELOAD_MODEL for the startup runs (run_id, models:/ URI or 'latest')")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Write the JSON report here as well")
+    args = parser.parse_args()
+
+    imports = measure_import(args.runs)
+    startups = [measure_startup(args.preload) for _ in range(args.runs)]
+    report = {
+        "preload": args.preload,
+        "runs": args.runs,
+        "import_seconds": statistics.median(imports),
+    }
+    for key in ("health_seconds", "ready_seconds"):
+        values = [s[key] for s in startups if s[key] is not None]
+        report[key] = statistics.median(values) if len(values) == len(startups) else None
+    errors = [s["error"] for s in startups if s["error"]]
+    if errors:
+        report["error"] = errors[0]
+
+    text = json.dumps(report, indent=2, allow_nan=False)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""Serving and training benchmark suite with regression checks.
+
+Runs against a throwaway local ``file:`` MLflow store (like ``tests/conftest.py``)
+and a real uvicorn process, then writes every result as JSON:
+
+* ``predict_c<N>_*``: ``/predict`` throughput and p50 / p99 latency with N
+  concurrent clients;
+* ``batch_<N>_*``: ``/predict/batch`` rows per second and latency for N-row batches;
+* ``stream_rows_per_s``: ``/predict/stream`` NDJSON throughput over one connection;
+* ``model_load_seconds``: ``/load-model`` with ``reload`` (fetch, warmup, swap);
+* ``cold_start_*``: import time and time to ``/ready`` (see ``cold_start.py``);
+* ``train_*``: ``train_demo`` wall time and the ``load`` / ``fit`` /
+  ``evaluate`` / ``log_model`` stage times and peak memory it logs.
+
+With ``--baseline`` the results are compared against a stored run and the
+exit status is 1 when any metric is worse by more than its threshold.  A
+measurement that failed is written as ``null`` with the reason under
+``errors`` and counts as a regression, as does a baseline metric that is
+missing from the current run.
+Run from the repository root::
+
+    python benchmarks/run.py --output bench.json --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --output bench.json --baseline benchmarks/baseline.json --threshold 0.25
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+from cold_start import ROOT, _free_port, _status, measure_import, measure_startup
+
+IRIS_ROW = {"sepal_length": 5.1, "sepal_width": 3.5, "petal_length": 1.4, "petal_width": 0.2}
+
+# Metric name -> whether a larger value is better.
+HIGHER_IS_BETTER_SUFFIXES = ("_rps", "_rows_per_s")
+
+
+def _percentile(values, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(round(q * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def _timed_requests(url: str, concurrency: int, total: int, make_request) -> tuple:
+    """Issue ``total`` requests from ``concurrency`` threads; return (latencies, wall seconds)."""
+    latencies = []
+    lock = threading.Lock()
+    per_worker = max(total // concurrency, 1)
+
+    def worker():
+        local = []
+        with httpx.Client(base_url=url, timeout=30) as client:
+            for _ in range(per_worker):
+                start = time.perf_counter()
+                response = make_request(client)
+                local.append(time.perf_counter() - start)
+                response.raise_for_status()
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return latencies, time.perf_counter() - start
+
+
+def bench_predict(url: str, concurrency_levels, requests: int) -> dict:
+    results = {}
+    for c in concurrency_levels:
+        latencies, wall = _timed_requests(url, c, requests, lambda client: client.post("/predict", json=IRIS_ROW))
+        results[f"predict_c{c}_rps"] = len(latencies) / wall
+        results[f"predict_c{c}_p50_seconds"] = _percentile(latencies, 0.50)
+        results[f"predict_c{c}_p99_seconds"] = _percentile(latencies, 0.99)
+    return results
+
+
+def bench_batch(url: str, batch_sizes, requests: int) -> dict:
+    results = {}
+    for n in batch_sizes:
+        body = {name: [value] * n for name, value in IRIS_ROW.items()}
+        latencies, wall = _timed_requests(url, 1, requests, lambda client: client.post("/predict/batch", json=body))
+        results[f"batch_{n}_rows_per_s"] = n * len(latencies) / wall
+        results[f"batch_{n}_p50_seconds"] = _percentile(latencies, 0.50)
+    return results
+
+
+def bench_stream(url: str, rows: int) -> dict:
+    line = (json.dumps(list(IRIS_ROW.values())) + "\n").encode()
+
+    def body():
+        for start in range(0, rows, 1000):
+            yield line * min(1000, rows - start)
+
+    start = time.perf_counter()
+    received = 0
+    with httpx.stream("POST", f"{url}/predict/stream", content=body(), timeout=120) as response:
+        response.raise_for_status()
+        for _ in response.iter_lines():
+            received += 1
+    if received != rows:
+        raise RuntimeError(f"/predict/stream returned {received} of {rows} rows")
+    return {"stream_rows_per_s": rows / (time.perf_counter() - start)}
+
+
+def bench_model_load(url: str, run_id: str, repeats: int) -> dict:
+    durations = []
+    with httpx.Client(base_url=url, timeout=120) as client:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            client.post("/load-model", json={"run_id": run_id, "reload": True}).raise_for_status()
+            durations.append(time.perf_counter() - start)
+    return {"model_load_seconds": statistics.median(durations)}
+
+
+def bench_train(repeats: int) -> dict:
+    """``train_demo`` wall time plus the per-stage time and peak memory it logs.
+
+    Timings come from untraced runs; the memory peaks from one extra run with
+    ``track_memory=True``, since tracing would inflate the timings.
+    """
+    sys.path.insert(0, str(ROOT))
+    from src.mlops_framework.train import train_demo
+
+    rows = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        stages = train_demo()["stages"]
+        rows.append({"train_total_seconds": time.perf_counter() - start, **stages})
+    peaks = {k: v for k, v in train_demo(track_memory=True)["stages"].items() if k.endswith("_peak_mb")}
+    # stage_fit_seconds -> train_fit_seconds, stage_fit_peak_mb -> train_fit_peak_mb
+    results = {name: statistics.median(row[name] for row in rows) for name in rows[0]}
+    return {name.replace("stage_", "train_", 1): value for name, value in {**results, **peaks}.items()}
+
+
+def _start_server(env: dict) -> tuple:
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "serving.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120
+    while _status(f"{url}/ready") != 200:
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            raise RuntimeError("Serving app did not become ready")
+        time.sleep(0.05)
+    return proc, url
+
+
+def run_suite(args) -> tuple:
+    """Run every benchmark; returns ``(results, errors)`` keyed by metric name."""
+    errors = {}
+    tracking_dir = tempfile.mkdtemp(prefix="mlruns_bench_")
+    os.environ["MLFLOW_TRACKING_URI"] = f"file:{tracking_dir}"
+    results = bench_train(args.repeats)
+
+    # The last train_demo run is the model served below.
+    import mlflow
+
+    run_id = mlflow.search_runs(experiment_names=["iris-demo"], order_by=["start_time DESC"], max_results=1).run_id[0]
+    env = {**os.environ, "SERVING_PRELOAD_MODEL": run_id}
+
+    imports = measure_import(args.repeats)
+    startups = [measure_startup(run_id) for _ in range(args.repeats)]
+    results["cold_start_import_seconds"] = statistics.median(imports)
+    failed = [s["error"] for s in startups if s["ready_seconds"] is None]
+    results["cold_start_ready_seconds"] = None if failed else statistics.median(s["ready_seconds"] for s in startups)
+    if failed:
+        errors["cold_start_ready_seconds"] = f"{len(failed)}/{len(startups)} startups failed: {failed[0]}"
+
+    proc, url = _start_server(env)
+    try:
+        results.update(bench_model_load(url, run_id, args.repeats))
+        results.update(bench_predict(url, args.concurrency, args.requests))
+        results.update(bench_batch(url, args.batch_sizes, max(args.requests // 10, 5)))
+        results.update(bench_stream(url, args.stream_rows))
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+    return results, errors
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return ``(name, baseline, current, change)`` for metrics worse than allowed.
+
+    ``change`` is the relative slowdown (positive is worse).  Per-metric
+    thresholds in the baseline file's ``"thresholds"`` override ``threshold``.
+    A metric of the baseline that is missing or ``None`` in ``results`` (the
+    measurement failed) is always a regression, with ``current`` and
+    ``change`` set to ``None``.
+    """
+    base_values = baseline.get("results", {})
+    overrides = baseline.get("thresholds", {})
+    regressions = []
+    for name, base in base_values.items():
+        current = results.get(name)
+        if current is None:
+            regressions.append((name, base, None, None))
+            continue
+        if not base:
+            continue
+        higher_better = name.endswith(HIGHER_IS_BETTER_SUFFIXES)
+        change = (base - current) / base if higher_better else (current - base) / base
+        if change > overrides.get(name, threshold):
+            regressions.append((name, base, current, change))
+    return regressions
+
+
+def _parse_ints(text: str) -> list:
+    return [int(v) for v in text.split(",") if v.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, help="Write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", type=Path, help="Store this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%)")
+    parser.add_argument("--concurrency", type=_parse_ints, default=[1, 8, 32])
+    parser.add_argument("--batch-sizes", type=_parse_ints, default=[1, 64, 1024, 16384])
+    parser.add_argument("--requests", type=int, default=2000, help="/predict requests per concurrency level")
+    parser.add_argument("--stream-rows", type=int, default=200_000, help="Rows sent through /predict/stream")
+    parser.add_argument("--repeats", type=int, default=3, help="Repeats for train, load and cold-start timings")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {k: v for k, v in vars(args).items() if not isinstance(v, Path)},
+        },
+    }
+    report["results"], errors = run_suite(args)
+    if errors:
+        report["errors"] = errors
+    text = json.dumps(report, indent=2, sort_keys=True, allow_nan=False)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n")
+    if args.save_baseline:
+        args.save_baseline.write_text(text + "\n")
+
+    if args.baseline:
+        regressions = compare(report["results"], json.loads(args.baseline.read_text()), args.threshold)
+        for name, base, current, change in regressions:
+            if current is None:
+                reason = errors.get(name, "not measured")
+                print(f"REGRESSION {name}: {base} -> null ({reason})", file=sys.stderr)
+            else:
+                print(f"REGRESSION {name}: {base:.6g} -> {current:.6g} ({change:+.1%})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
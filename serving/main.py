@@ -1,14 +1,132 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Body
+from fastapi import FastAPI, HTTPException, Body, Header, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import mlflow
-import mlflow.sklearn
-from mlflow.tracking import MlflowClient
 import numpy as np
-from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Any, Optional
+import glob
 import os
+import threading
+import time
+import uuid
+
+try:
+    from mlops_framework.batching import MicroBatcher
+    from mlops_framework.jobs import JobExecutor, JobQueueFull, run_training_job
+    from mlops_framework.metrics import CONTENT_TYPE, MetricsRegistry
+    from mlops_framework.model_cache import CachedModel, ModelCache
+    from mlops_framework.prediction_cache import PredictionCache
+    from mlops_framework.registry import ModelVersionRef, PromotionWatcher, StageResolver, parse_models_uri
+    from mlops_framework.response_cache import ResponseCache, etag_matches
+    from mlops_framework.run_index import RunIndex
+    from mlops_framework.scoring import compile_model, load_local_model, warmup_model
+    from mlops_framework.shared_artifacts import ArtifactWatcher, current_version, load_shared_scorer
+    from mlops_framework.serialization import (
+        NDJSONReader, UnsupportedFormat, decode_features, decode_ndjson_rows, dumps_json,
+        encode_ndjson_predictions, encode_predictions, negotiate,
+    )
+except ModuleNotFoundError:
+    from src.mlops_framework.batching import MicroBatcher
+    from src.mlops_framework.jobs import JobExecutor, JobQueueFull, run_training_job
+    from src.mlops_framework.metrics import CONTENT_TYPE, MetricsRegistry
+    from src.mlops_framework.model_cache import CachedModel, ModelCache
+    from src.mlops_framework.prediction_cache import PredictionCache
+    from src.mlops_framework.registry import ModelVersionRef, PromotionWatcher, StageResolver, parse_models_uri
+    from src.mlops_framework.response_cache import ResponseCache, etag_matches
+    from src.mlops_framework.run_index import RunIndex
+    from src.mlops_framework.scoring import compile_model, load_local_model, warmup_model
+    from src.mlops_framework.shared_artifacts import ArtifactWatcher, current_version, load_shared_scorer
+    from src.mlops_framework.serialization import (
+        NDJSONReader, UnsupportedFormat, decode_features, decode_ndjson_rows, dumps_json,
+        encode_ndjson_predictions, encode_predictions, negotiate,
+    )
 
 EXPERIMENT_NAME = "iris-demo"
 
+# mlflow is imported on first use: it dominates import time, and only model
+# loading and the registry/training endpoints need it.
+def _mlflow():
+    import mlflow
+    import mlflow.sklearn
+    return mlflow
+
+def _mlflow_client():
+    from mlflow.tracking import MlflowClient
+    return MlflowClient()
+
+def _local_tracking_root() -> str:
+    """Directory of a ``file:`` MLFLOW_TRACKING_URI, else ""."""
+    tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "")
+    return tracking_uri.replace("file:", "") if tracking_uri.startswith("file:") else ""
+
+# SQLite index of a file: tracking store, so run lookups do not scan every run
+# directory (SERVING_RUN_INDEX=0 falls back to search_runs)
+RUN_INDEX_ENABLED = os.getenv("SERVING_RUN_INDEX", "1").lower() in ("1", "true", "yes")
+# Minimum time between refreshes: each one stats every experiment directory.
+# Runs finished by this process's /train jobs mark the index stale at once.
+RUN_INDEX_REFRESH_SECONDS = float(os.getenv("SERVING_RUN_INDEX_REFRESH_SECONDS", "2"))
+_run_index_state: Dict[str, Any] = {"index": None, "root": None, "refreshed_at": 0.0}
+_run_index_lock = threading.Lock()
+
+def _run_index() -> Optional[RunIndex]:
+    """The run index of the file store, refreshed at most every few seconds, or None to use search_runs."""
+    root = _local_tracking_root()
+    if not RUN_INDEX_ENABLED or not root or not os.path.isdir(root):
+        return None
+    with _run_index_lock:
+        index = _run_index_state["index"]
+        if index is None or _run_index_state["root"] != root:
+            index = _run_index_state["index"] = RunIndex(root)
+            _run_index_state.update(root=root, refreshed_at=0.0)
+        now = time.monotonic()
+        stale = now - _run_index_state["refreshed_at"] >= RUN_INDEX_REFRESH_SECONDS
+        if stale:
+            _run_index_state["refreshed_at"] = now
+    if stale:
+        index.refresh()
+    return index
+
+def _runs_changed() -> None:
+    """Drop cached run responses and make the next run lookup refresh the index."""
+    _query_cache.invalidate("runs")
+    with _run_index_lock:
+        _run_index_state["refreshed_at"] = 0.0
+
+# Memory-mapped linear models exported with `cli.py export-model`; every worker
+# maps the same files and follows the CURRENT version pointer
+SHARED_ARTIFACT_DIR = os.getenv("SERVING_SHARED_ARTIFACT_DIR", "")
+
+# Model loaded and warmed at startup: a run_id, a models:/ URI, "latest" or
+# "shared" (the current version in SERVING_SHARED_ARTIFACT_DIR)
+PRELOAD_MODEL = os.getenv("SERVING_PRELOAD_MODEL", "shared" if SHARED_ARTIFACT_DIR else "")
+_preload_state: Dict[str, Any] = {"status": "disabled" if not PRELOAD_MODEL else "pending", "target": PRELOAD_MODEL or None}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the workers and the configured preload without blocking startup; stop them on shutdown.
+
+    The executors are created here rather than at import, so an app started
+    again in the same process (e.g. in tests) does not inherit shut-down pools.
+    """
+    global _load_executor, _train_executor
+    _load_executor = ThreadPoolExecutor(max_workers=LOAD_WORKERS, thread_name_prefix="model-load")
+    _train_executor = JobExecutor(
+        max_workers=TRAIN_WORKERS, max_queue=TRAIN_MAX_QUEUE, on_done=lambda job: _runs_changed()
+    )
+    if PRELOAD_MODEL:
+        _load_executor.submit(_preload_model, PRELOAD_MODEL)
+    yield
+    if _batcher is not None:
+        await _batcher.aclose()
+    _promotion_watcher.stop()
+    if _artifact_watcher is not None:
+        _artifact_watcher.stop()
+    _train_executor.shutdown(wait=False)
+    _load_executor.shutdown(wait=False, cancel_futures=True)
+
 openapi_tags = [
     {"name": "training", "description": "Train model & monitor status"},
     {"name": "registry", "description": "Model Registry operations"},
@@ -17,7 +135,79 @@ openapi_tags = [
     {"name": "health", "description": "Health checks"},
 ]
 
-app = FastAPI(title="Iris Classifier API", version="1.0.0", openapi_tags=openapi_tags)
+class _FastJSONResponse(JSONResponse):
+    """JSON encoded with orjson when installed (compact stdlib JSON otherwise)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+app = FastAPI(
+    title="Iris Classifier API",
+    version="1.0.0",
+    openapi_tags=openapi_tags,
+    lifespan=lifespan,
+    default_response_class=_FastJSONResponse,
+)
+
+# Prometheus metrics, exported by GET /metrics
+_metrics = MetricsRegistry()
+HTTP_LATENCY = _metrics.histogram(
+    "http_request_duration_seconds", "Request latency by route template", ["method", "route", "status"]
+)
+HTTP_ERRORS = _metrics.counter(
+    "http_request_errors_total", "Responses with status >= 400 by route template", ["method", "route", "status"]
+)
+PREDICT_STAGE = _metrics.histogram(
+    "predict_stage_seconds",
+    "Time per inference stage: convert (input to array), predict_proba, respond (build response)",
+    ["endpoint", "stage"],
+)
+PREDICT_ROWS = _metrics.histogram(
+    "predict_batch_rows",
+    "Rows per predict_proba call; endpoint=microbatch for batched /predict calls",
+    ["endpoint"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 1024, 4096, 16384, 65536),
+)
+MODEL_LOAD = _metrics.histogram(
+    "model_load_seconds",
+    "Model load time per phase: fetch, compile, warmup, swap",
+    ["phase"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+MODEL_INFO = _metrics.gauge(
+    "model_loaded_info", "Models held in memory (always 1), by cache key, version and alias", ["key", "version", "alias"]
+)
+
+class _MetricsMiddleware:
+    """Pure ASGI middleware recording latency per route template (cheaper than BaseHTTPMiddleware)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope; templates keep label cardinality bounded.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            labels = {"method": scope["method"], "route": route, "status": status_code}
+            HTTP_LATENCY.observe(time.perf_counter() - start, **labels)
+            if status_code >= 400:
+                HTTP_ERRORS.inc(**labels)
+
+app.add_middleware(_MetricsMiddleware)
 
 class IrisFeatures(BaseModel):
     sepal_length: float
@@ -30,8 +220,31 @@ class PredictionResult(BaseModel):
     probabilities: Dict[str, float]
     model_version: str
 
+class BatchPredictRequest(BaseModel):
+    """Either ``rows`` (list of feature objects) or one array per feature."""
+    rows: Optional[List[IrisFeatures]] = None
+    sepal_length: Optional[List[float]] = None
+    sepal_width: Optional[List[float]] = None
+    petal_length: Optional[List[float]] = None
+    petal_width: Optional[List[float]] = None
+
+class BatchPredictionResult(BaseModel):
+    predictions: List[str]
+    probabilities: List[List[float]]
+    class_names: List[str]
+    model_version: str
+
 class LoadModelRequest(BaseModel):
-    run_id: str
+    run_id: Optional[str] = None
+    # Registry model, used instead of run_id
+    model_uri: Optional[str] = None  # e.g. "models:/iris-demo/Production"
+    model_name: Optional[str] = None
+    version: Optional[str] = None
+    watch: bool = True  # follow promotions when model_uri names a stage
+    compile: Optional[bool] = None  # defaults to SERVING_COMPILE_MODELS
+    alias: Optional[str] = None  # defaults to SERVING_DEFAULT_MODEL; "" loads without aliasing
+    reload: bool = False  # bypass the in-memory model cache
+    background: bool = False  # return a job_id immediately and load in a worker thread
 
 class RegisterModelRequest(BaseModel):
     run_id: str
@@ -44,95 +257,241 @@ class TrainRequest(BaseModel):
     model_name: str = EXPERIMENT_NAME
     C: float = 1.0
     max_iter: int = 200
+    # Warm-start from this run's model instead of fitting from scratch
+    parent_run_id: Optional[str] = None
+
+CLASS_NAMES = ["setosa", "versicolor", "virginica"]
+FEATURE_NAMES = ["sepal_length", "sepal_width", "petal_length", "petal_width"]
+MAX_BATCH_ROWS = int(os.getenv("PREDICT_MAX_BATCH_ROWS", "100000"))
+# Body size cap for /predict/raw, checked before the body is buffered: room for
+# MAX_BATCH_ROWS rows of JSON objects (key + value, ~64 bytes per feature)
+MAX_RAW_BODY_BYTES = int(
+    os.getenv("PREDICT_MAX_BODY_BYTES", str(MAX_BATCH_ROWS * len(FEATURE_NAMES) * 64 + 65536))
+)
+# Rows per vectorized predict_proba call in /predict/stream
+STREAM_CHUNK_ROWS = int(os.getenv("PREDICT_STREAM_CHUNK_ROWS", "1024"))
+# Compile supported models into NumPy-only scorers on load (SERVING_COMPILE_MODELS=1)
+COMPILE_MODELS = os.getenv("SERVING_COMPILE_MODELS", "0").lower() in ("1", "true", "yes")
+
+# Loaded models keyed by run_id or "<name>/<version>", with LRU eviction
+DEFAULT_MODEL_ALIAS = os.getenv("SERVING_DEFAULT_MODEL", "default")
+_models = ModelCache(max_bytes=int(os.getenv("MODEL_CACHE_MAX_BYTES", str(1024 ** 3))))
+
+# Model loads run off the event loop; background loads are tracked by job_id.
+# The executor exists while the app is running (see lifespan).
+LOAD_WORKERS = int(os.getenv("SERVING_LOAD_WORKERS", "2"))
+_load_executor: Optional[ThreadPoolExecutor] = None
+_load_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_load_jobs_lock = threading.Lock()
+MAX_LOAD_JOBS = 100
+
+# models:/<name>/<stage> resolution, cached for SERVING_STAGE_TTL_SECONDS
+_stage_resolver = StageResolver(ttl=float(os.getenv("SERVING_STAGE_TTL_SECONDS", "30")))
+# (name, stage) -> aliases/compile settings to apply when a new version is promoted
+_stage_watches: Dict[tuple, Dict[str, Any]] = {}
+
+# Cached responses of the MLflow query endpoints: endpoint -> (scope, TTL seconds).
+# TTLs can be overridden per endpoint, e.g. QUERY_CACHE_TTL_MODELS=60.
+_QUERY_CACHE_CONFIG = {
+    "models": ("registry", 10.0),
+    "model_versions": ("registry", 10.0),
+    "experiments": ("runs", 30.0),
+    "runs": ("runs", 5.0),
+    "train_status": ("runs", 2.0),
+}
+QUERY_CACHE_TTLS = {
+    name: float(os.getenv(f"QUERY_CACHE_TTL_{name.upper()}", str(ttl)))
+    for name, (_, ttl) in _QUERY_CACHE_CONFIG.items()
+}
+_query_cache = ResponseCache()
+
+# Training runs in worker processes so it never competes with inference;
+# the executor is created by lifespan like _load_executor
+TRAIN_WORKERS = int(os.getenv("TRAIN_WORKERS", "1"))
+TRAIN_MAX_QUEUE = int(os.getenv("TRAIN_MAX_QUEUE", "4"))
+_train_executor: Optional[JobExecutor] = None
+
+# Optional memoization of /predict results (PREDICT_CACHE_SIZE > 0), keyed by
+# the loaded model instance and the (optionally rounded) feature vector
+_prediction_cache: Optional[PredictionCache] = None
+if int(os.getenv("PREDICT_CACHE_SIZE", "0")) > 0:
+    _decimals = os.getenv("PREDICT_CACHE_DECIMALS")
+    _prediction_cache = PredictionCache(
+        max_entries=int(os.getenv("PREDICT_CACHE_SIZE")),
+        decimals=int(_decimals) if _decimals else None,
+    )
+PREDICT_CACHE_LOOKUPS = _metrics.counter(
+    "predict_cache_lookups_total", "Prediction cache lookups by result (hit or miss)", ["result"]
+)
 
-# Cache for the loaded model
-_model = None
-_model_version = None
+def _model_token(entry: CachedModel) -> tuple:
+    """Identity of one loaded model instance; a reload or swap yields a new token."""
+    return (entry.key, entry.version, entry.loaded_at)
+
+# Optional micro-batching of concurrent /predict calls (PREDICT_BATCHING=1)
+_batcher: Optional[MicroBatcher] = None
+if os.getenv("PREDICT_BATCHING", "0").lower() in ("1", "true", "yes"):
+    _batcher = MicroBatcher(
+        max_batch_size=int(os.getenv("PREDICT_MAX_BATCH_SIZE", "32")),
+        max_wait_ms=float(os.getenv("PREDICT_MAX_WAIT_MS", "2")),
+        on_flush=lambda size: PREDICT_ROWS.observe(size, endpoint="microbatch"),
+    )
 
 def load_latest_model():
-    """Load the latest model from MLflow."""
-    global _model, _model_version
+    """Load the latest model from MLflow.
+
+    If ``SERVING_MODEL_URI`` is a ``models:/<name>/<stage>`` URI, the Model
+    Registry is the source of truth and promotions are followed; otherwise
+    the newest ``logreg_demo`` run is used.
+    """
+    try:
+        entry = _load_latest_entry()
+    except Exception as e:
+        print(f"Error loading model: {str(e)}")
+        return None, None
+    return entry.model, entry.version
+
+def _load_latest_entry() -> CachedModel:
+    """The default-alias model, loading the latest one first if needed; raises on failure."""
+    entry = _models.get(DEFAULT_MODEL_ALIAS)
     
-    if _model is None:
-        try:
-            # Connect to MLflow tracking URI (env or default)
-            mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://mlflow:5000"))
-            mlflow.set_experiment(EXPERIMENT_NAME)
-            
+    if entry is None:
+        mlflow = _mlflow()
+        # Connect to MLflow tracking URI (env or default)
+        mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://mlflow:5000"))
+
+        registry_uri = os.getenv("SERVING_MODEL_URI")
+        if registry_uri:
+            key, _, stage = _resolve_models_uri(registry_uri)
+            entry = _load_model_sync(key, None, [DEFAULT_MODEL_ALIAS], COMPILE_MODELS)
+            if stage:
+                _watch_stage(entry.key, stage, [DEFAULT_MODEL_ALIAS], COMPILE_MODELS)
+        else:
             # Get the latest run with 'logreg_demo' in the run name
-            runs = mlflow.search_runs(
-                filter_string="attributes.run_name LIKE '%logreg_demo%'",
-                order_by=["start_time DESC"],
-                max_results=1,
-            )
-            
-            if runs.empty:
+            index = _run_index()
+            if index is not None:
+                runs = index.search(EXPERIMENT_NAME, run_name_like="%logreg_demo%", max_results=1)
+                latest_run_id = runs[0]["run_id"] if runs else None
+            else:
+                mlflow.set_experiment(EXPERIMENT_NAME)
+                runs = mlflow.search_runs(
+                    filter_string="attributes.run_name LIKE '%logreg_demo%'",
+                    order_by=["start_time DESC"],
+                    max_results=1,
+                )
+                latest_run_id = None if runs.empty else runs.iloc[0].run_id
+        
+            if latest_run_id is None:
                 raise ValueError("No trained model found in MLflow")
-                
-            latest_run = runs.iloc[0]
-            model_uri = f"runs:/{latest_run.run_id}/model"
-            
-            # Load the model
-            _model = mlflow.sklearn.load_model(model_uri)
-            _model_version = latest_run.run_id
-            print(f"Loaded model version: {_model_version}")
             
-        except Exception as e:
-            print(f"Error loading model: {str(e)}")
-            _model = None
-            _model_version = None
-    
-    return _model, _model_version
+            entry = _load_model_sync(
+                latest_run_id, latest_run_id, [DEFAULT_MODEL_ALIAS], COMPILE_MODELS
+            )
+        print(f"Loaded model version: {entry.version}")
+    return entry
+
+def _get_model(model_key: Optional[str] = None) -> CachedModel:
+    """Resolve a cache key or alias (default alias if omitted) to a loaded model."""
+    entry = _models.get(model_key or DEFAULT_MODEL_ALIAS)
+    if entry is None:
+        if model_key and model_key != DEFAULT_MODEL_ALIAS:
+            raise HTTPException(status_code=404, detail=f"Model '{model_key}' not loaded")
+        raise HTTPException(
+            status_code=503,
+            detail="Model not loaded. Please train a model first."
+        )
+    return entry
 
 @app.get("/health", tags=["health"])
 async def health() -> Dict[str, str]:
     """Simple health check endpoint."""
     return {"status": "ok"}
 
+@app.get("/ready", tags=["health"])
+async def ready(response: Response) -> Dict[str, Any]:
+    """Readiness probe: 503 until the SERVING_PRELOAD_MODEL model is loaded and warm.
+
+    Without a configured preload the app is ready as soon as it starts. A
+    failed preload reports ``"status": "failed"`` and the exception in ``error``.
+    """
+    body = {
+        **_preload_state,
+        "ready": _preload_state["status"] in ("disabled", "ready"),
+        "model_loaded": DEFAULT_MODEL_ALIAS in _models,
+    }
+    if not body["ready"]:
+        response.status_code = 503
+    return body
+
 # Example root endpoint
 @app.get("/")
 async def root() -> Dict[str, str]:
     return {"message": "Welcome to the MLOps Framework API"}
 
+def _column_labels(model) -> np.ndarray:
+    """Class names in the column order of ``model.predict_proba``."""
+    return np.asarray(CLASS_NAMES)[np.asarray(model.classes_, dtype=int)]
+
+def _predict_proba(model, input_data: np.ndarray):
+    """Run a single predict_proba pass and derive labels by argmax."""
+    probabilities = model.predict_proba(input_data)
+    labels = _column_labels(model)[np.argmax(probabilities, axis=1)]
+    return labels, probabilities
+
 @app.post("/predict", response_model=PredictionResult, tags=["predict"])
-async def predict(features: IrisFeatures):
-    """Predict the iris flower type from input features."""
-    global _model, _model_version
+async def predict(
+    features: IrisFeatures,
+    model_key: Optional[str] = Query(None, alias="model", description="Model cache key or alias"),
+    x_model_key: Optional[str] = Header(None),
+):
+    """Predict the iris flower type from input features.
 
-    if _model is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Model not loaded. Please train a model first."
-        )
-    
-    model, model_version = _model, _model_version
+    The model is picked by the ``X-Model-Key`` header or ``model`` query
+    parameter (run_id, ``<name>/<version>`` or alias), else the default alias.
+    """
+    entry = _get_model(x_model_key or model_key)
+    model, model_version = entry.model, entry.version
     
     # Prepare input features
-    input_data = np.array([
-        [features.sepal_length, features.sepal_width, 
-         features.petal_length, features.petal_width]
-    ])
+    t0 = time.perf_counter()
+    row = [features.sepal_length, features.sepal_width,
+           features.petal_length, features.petal_width]
     
     try:
-        # Get prediction and probabilities
-        prediction = model.predict(input_data)[0]
-        probabilities = model.predict_proba(input_data)[0]
-        
-        # Map class indices to class names
-        class_names = ['setosa', 'versicolor', 'virginica']
-        predicted_class = class_names[int(prediction)]
+        class_names = _column_labels(model)
+        t1 = time.perf_counter()
+        probabilities = None
+        if _prediction_cache is not None:
+            probabilities = _prediction_cache.get(_model_token(entry), row)
+            PREDICT_CACHE_LOOKUPS.inc(result="miss" if probabilities is None else "hit")
+        if probabilities is None:
+            if _batcher is not None:
+                # Share one vectorized predict_proba with concurrent callers
+                # (the predict_proba stage then includes the batching wait)
+                probabilities = await _batcher.submit(model, row)
+            else:
+                probabilities = model.predict_proba(np.array([row]))[0]
+            if _prediction_cache is not None:
+                _prediction_cache.put(_model_token(entry), row, probabilities)
+        t2 = time.perf_counter()
+        predicted_class = class_names[int(np.argmax(probabilities))]
         
         # Format probabilities
         prob_dict = {
-            class_name: float(prob) 
+            str(class_name): float(prob) 
             for class_name, prob in zip(class_names, probabilities)
         }
         
-        return {
+        result = {
             "prediction": predicted_class,
             "probabilities": prob_dict,
             "model_version": model_version
         }
+        t3 = time.perf_counter()
+        PREDICT_STAGE.observe(t1 - t0, endpoint="predict", stage="convert")
+        PREDICT_STAGE.observe(t2 - t1, endpoint="predict", stage="predict_proba")
+        PREDICT_STAGE.observe(t3 - t2, endpoint="predict", stage="respond")
+        return result
         
     except Exception as e:
         raise HTTPException(
@@ -140,45 +499,567 @@ async def predict(features: IrisFeatures):
             detail=f"Prediction failed: {str(e)}"
         )
 
+@app.post("/predict/batch", response_model=BatchPredictionResult, tags=["predict"])
+async def predict_batch(
+    payload: BatchPredictRequest,
+    model_key: Optional[str] = Query(None, alias="model", description="Model cache key or alias"),
+    x_model_key: Optional[str] = Header(None),
+):
+    """Predict many rows with one vectorized predict_proba call.
+
+    Request body, either row-wise:
+    {"rows": [{"sepal_length": 5.1, ...}, ...]}
+    or columnar (one array per feature, all the same length):
+    {"sepal_length": [...], "sepal_width": [...], "petal_length": [...], "petal_width": [...]}
+    """
+    entry = _get_model(x_model_key or model_key)
+    model, model_version = entry.model, entry.version
+
+    t0 = time.perf_counter()
+    columns = [getattr(payload, name) for name in FEATURE_NAMES]
+    if payload.rows is not None:
+        if any(col is not None for col in columns):
+            raise HTTPException(status_code=422, detail="Provide either rows or feature columns, not both")
+        input_data = np.array(
+            [[r.sepal_length, r.sepal_width, r.petal_length, r.petal_width] for r in payload.rows],
+            dtype=np.float64,
+        ).reshape(-1, len(FEATURE_NAMES))
+    elif all(col is not None for col in columns):
+        if len({len(col) for col in columns}) != 1:
+            raise HTTPException(status_code=422, detail="Feature columns must have equal length")
+        input_data = np.column_stack([np.asarray(col, dtype=np.float64) for col in columns])
+    else:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Provide rows or all feature columns: {', '.join(FEATURE_NAMES)}",
+        )
+
+    if len(input_data) > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_ROWS} rows")
+    t1 = time.perf_counter()
+    if len(input_data) == 0:
+        labels, probabilities = np.empty(0, dtype=str), np.empty((0, len(model.classes_)))
+    else:
+        try:
+            labels, probabilities = _predict_proba(model, input_data)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    t2 = time.perf_counter()
+
+    # Returning a Response skips response_model re-validation of every row;
+    # the array is encoded directly by the JSON serializer.
+    result = _FastJSONResponse({
+        "predictions": labels.tolist(),
+        "probabilities": probabilities,
+        "class_names": _column_labels(model).tolist(),
+        "model_version": model_version,
+    })
+    t3 = time.perf_counter()
+    PREDICT_ROWS.observe(len(input_data), endpoint="predict_batch")
+    PREDICT_STAGE.observe(t1 - t0, endpoint="predict_batch", stage="convert")
+    PREDICT_STAGE.observe(t2 - t1, endpoint="predict_batch", stage="predict_proba")
+    PREDICT_STAGE.observe(t3 - t2, endpoint="predict_batch", stage="respond")
+    return result
+
+@app.get("/predict/cache", tags=["predict"])
+async def prediction_cache_stats() -> Dict[str, Any]:
+    """Report prediction cache size and hit/miss counts."""
+    if _prediction_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **_prediction_cache.stats()}
+
+@app.delete("/predict/cache", tags=["predict"])
+async def clear_prediction_cache() -> Dict[str, Any]:
+    """Drop every memoized prediction."""
+    if _prediction_cache is None:
+        return {"enabled": False, "dropped": 0}
+    return {"enabled": True, "dropped": _prediction_cache.invalidate()}
+
+async def _read_capped_body(request: Request, limit: int) -> bytes:
+    """Read the request body, answering 413 as soon as it exceeds ``limit`` bytes."""
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=413, detail=f"Body exceeds {limit} bytes")
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(status_code=413, detail=f"Body exceeds {limit} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+@app.post("/predict/raw", tags=["predict"])
+async def predict_raw(
+    request: Request,
+    model_key: Optional[str] = Query(None, alias="model", description="Model cache key or alias"),
+    x_model_key: Optional[str] = Header(None),
+):
+    """Content-negotiated batch prediction without per-row validation.
+
+    Request ``Content-Type``:
+    - ``application/octet-stream; dtype=float32|float64``: raw little-endian rows
+    - ``application/msgpack`` or ``application/json``: ``[[...], ...]``,
+      ``{"rows": [[...], ...]}`` or one array per feature
+
+    Response (``Accept``): ``application/json`` (default) or
+    ``application/msgpack`` with compact arrays, or ``application/octet-stream``
+    with the raw probability matrix and ``X-Shape``, ``X-Class-Names`` and
+    ``X-Model-Version`` headers.
+    """
+    entry = _get_model(x_model_key or model_key)
+    model, model_version = entry.model, entry.version
+
+    t0 = time.perf_counter()
+    body = await _read_capped_body(request, MAX_RAW_BODY_BYTES)
+    try:
+        media_type, params = negotiate(request.headers.get("accept"))
+        input_data = decode_features(
+            body,
+            request.headers.get("content-type"),
+            FEATURE_NAMES,
+            getattr(model, "n_features_in_", None),
+        )
+    except UnsupportedFormat as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode request: {str(e)}")
+    if len(input_data) > MAX_BATCH_ROWS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_ROWS} rows")
+
+    t1 = time.perf_counter()
+    if len(input_data) == 0:
+        labels, probabilities = np.empty(0, dtype=str), np.empty((0, len(model.classes_)))
+    else:
+        try:
+            labels, probabilities = _predict_proba(model, input_data)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    t2 = time.perf_counter()
+
+    body, headers = encode_predictions(
+        labels, probabilities, _column_labels(model).tolist(), model_version, media_type, params
+    )
+    t3 = time.perf_counter()
+    PREDICT_ROWS.observe(len(input_data), endpoint="predict_raw")
+    PREDICT_STAGE.observe(t1 - t0, endpoint="predict_raw", stage="convert")
+    PREDICT_STAGE.observe(t2 - t1, endpoint="predict_raw", stage="predict_proba")
+    PREDICT_STAGE.observe(t3 - t2, endpoint="predict_raw", stage="respond")
+    return Response(content=body, headers=headers)
+
+class _NDJSONStreamResponse(Response):
+    """Score an NDJSON request body chunk by chunk while streaming the results.
+
+    The body is pulled from ``receive`` only after the previous results were
+    sent, so a client that reads slowly is also throttled on upload (TCP
+    backpressure) and at most one chunk of rows is in flight. This is not a
+    StreamingResponse: under ASGI spec < 2.4 that drains ``receive``
+    concurrently to watch for disconnects, racing the body reads.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def __init__(self, score: Callable[[List[bytes], int], bytes], chunk_rows: int, headers: Dict[str, str]):
+        self.score = score
+        self.chunk_rows = max(chunk_rows, 1)
+        self.status_code = 200
+        self.background = None
+        self.init_headers(headers)
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        reader = NDJSONReader()
+        pending: List[bytes] = []
+        done = 0
+        more_body = True
+        try:
+            while more_body or pending:
+                if more_body and len(pending) < self.chunk_rows:
+                    message = await receive()
+                    if message["type"] == "http.disconnect":
+                        return
+                    pending.extend(reader.feed(message.get("body", b"")))
+                    more_body = message.get("more_body", False)
+                    if not more_body:
+                        pending.extend(reader.close())
+                    continue
+                chunk, pending = pending[:self.chunk_rows], pending[self.chunk_rows:]
+                body = await run_in_threadpool(self.score, chunk, done)
+                done += len(chunk)
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+        except Exception as e:
+            # The status line is already sent: report the error in-band and end
+            # the stream cleanly instead of cutting the connection
+            if isinstance(e, ValueError):
+                message = str(e)
+            else:
+                message = f"Prediction failed: {type(e).__name__}: {e}"
+                print(f"Error in /predict/stream after {done} rows: {message}")
+            error = {"error": message, "rows_completed": done}
+            await send({"type": "http.response.body", "body": dumps_json(error) + b"\n", "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+@app.post("/predict/stream", tags=["predict"])
+async def predict_stream(
+    model_key: Optional[str] = Query(None, alias="model", description="Model cache key or alias"),
+    x_model_key: Optional[str] = Header(None),
+):
+    """Stream NDJSON predictions for an NDJSON body of feature rows.
+
+    Each request line is a feature array (``[5.1, 3.5, 1.4, 0.2]``) or an
+    object with the feature names. Each response line is
+    ``{"prediction": ..., "probabilities": {...}}`` in request order. Rows are
+    predicted in vectorized chunks of ``PREDICT_STREAM_CHUNK_ROWS`` as the body
+    arrives. A malformed row, or any failure while scoring, ends the stream
+    with an ``{"error": ..., "rows_completed": n}`` line.
+    """
+    entry = _get_model(x_model_key or model_key)
+    model, model_version = entry.model, entry.version
+    class_names = _column_labels(model).tolist()
+    n_features = getattr(model, "n_features_in_", None) or len(FEATURE_NAMES)
+
+    def score(lines: List[bytes], offset: int) -> bytes:
+        t0 = time.perf_counter()
+        input_data = decode_ndjson_rows(lines, FEATURE_NAMES, n_features, offset)
+        t1 = time.perf_counter()
+        labels, probabilities = _predict_proba(model, input_data)
+        t2 = time.perf_counter()
+        body = encode_ndjson_predictions(labels, probabilities, class_names)
+        t3 = time.perf_counter()
+        PREDICT_ROWS.observe(len(input_data), endpoint="predict_stream")
+        PREDICT_STAGE.observe(t1 - t0, endpoint="predict_stream", stage="convert")
+        PREDICT_STAGE.observe(t2 - t1, endpoint="predict_stream", stage="predict_proba")
+        PREDICT_STAGE.observe(t3 - t2, endpoint="predict_stream", stage="respond")
+        return body
+
+    headers = {"X-Model-Version": str(model_version), "X-Class-Names": ",".join(class_names)}
+    return _NDJSONStreamResponse(score, STREAM_CHUNK_ROWS, headers)
+
+@app.get("/predict/batching", tags=["predict"])
+async def batching_stats() -> Dict[str, Any]:
+    """Report micro-batching configuration and observed batch sizes."""
+    if _batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **_batcher.stats()}
+
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint."""
+    aliases = _models.aliases()
+    MODEL_INFO.clear()
+    for e in _models.entries():
+        for alias in sorted(a for a, k in aliases.items() if k == e.key) or [""]:
+            MODEL_INFO.set(1, key=e.key, version=e.version or "", alias=alias)
+    return PlainTextResponse(_metrics.render(), media_type=CONTENT_TYPE)
+
 # -------------------------
 # New endpoint: /load-model
 # -------------------------
 
+def _load_model_sync(key: str, run_id: Optional[str], aliases: List[str], compile_scorer: bool) -> CachedModel:
+    """Fetch, optionally compile and warm up a model, then swap it into the cache.
+
+    ``key`` is the run_id, or ``<name>/<version>`` for registry models when
+    ``run_id`` is None. Runs in a worker thread. The cache (and aliases) only
+    change once the model has served warmup inference, so traffic never sees
+    a cold model.
+    """
+    if run_id:
+        # Always try local store first based on tracking URI if it uses file:
+        local_root = _local_tracking_root()
+
+        if local_root:
+            potential_local = f"{local_root}/{EXPERIMENT_NAME}/{run_id}/artifacts/model"
+            if not os.path.exists(potential_local):
+                # File stores lay runs out as <root>/<experiment_id>/<run_id>
+                matches = glob.glob(f"{local_root}/*/{run_id}/artifacts/model/MLmodel")
+                potential_local = os.path.dirname(matches[0]) if matches else potential_local
+            model_uri = potential_local if os.path.exists(potential_local) else None
+        else:
+            model_uri = None
+    else:
+        model_uri = None
+
+    t0 = time.perf_counter()
+    if model_uri:
+        model = load_local_model(model_uri)  # avoids importing mlflow on a cold start
+    else:
+        mlflow = _mlflow()
+        mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://mlflow:5000"))
+        model_uri = f"runs:/{run_id}/model" if run_id else f"models:/{key}"
+        model = mlflow.sklearn.load_model(model_uri)
+    t1 = time.perf_counter()
+    if compile_scorer:
+        model = compile_model(model)
+    t2 = time.perf_counter()
+    warmup_model(model, n_features=getattr(model, "n_features_in_", len(FEATURE_NAMES)))
+    t3 = time.perf_counter()
+    entry = _swap_in(key, model, aliases, compile=compile_scorer)
+    MODEL_LOAD.observe(t1 - t0, phase="fetch")
+    MODEL_LOAD.observe(t2 - t1, phase="compile")
+    MODEL_LOAD.observe(t3 - t2, phase="warmup")
+    MODEL_LOAD.observe(time.perf_counter() - t3, phase="swap")
+    return entry
+
+def _swap_in(key: str, model, aliases: List[str], **put_kwargs) -> CachedModel:
+    """Put a warmed model into the cache and drop memoized results of the instance it replaces."""
+    entry = _models.put(key, model, aliases=aliases, **put_kwargs)
+    if _prediction_cache is not None:
+        # Memoized results of the replaced instance can never be hit again
+        _prediction_cache.invalidate(lambda token: token[0] == key and token != _model_token(entry))
+    return entry
+
+def _load_shared_sync(version: str) -> CachedModel:
+    """Map an exported shared artifact read-only, warm it up and point the default alias at it."""
+    t0 = time.perf_counter()
+    scorer = load_shared_scorer(SHARED_ARTIFACT_DIR, version)
+    t1 = time.perf_counter()
+    warmup_model(scorer)
+    t2 = time.perf_counter()
+    key = f"shared/{version}"
+    # The mapped pages are shared with the other workers, so they do not count
+    # against this process's cache budget.
+    entry = _swap_in(key, scorer, [DEFAULT_MODEL_ALIAS], version=version, nbytes=0, shared=True)
+    pinned = set(_models.aliases().values())
+    for old in _models.entries():
+        if old.key.startswith("shared/") and old.key != key and old.key not in pinned:
+            _models.remove(old.key)
+    MODEL_LOAD.observe(t1 - t0, phase="fetch")
+    MODEL_LOAD.observe(t2 - t1, phase="warmup")
+    MODEL_LOAD.observe(time.perf_counter() - t2, phase="swap")
+    print(f"Serving shared artifact version {version}")
+    return entry
+
+_artifact_watcher: Optional[ArtifactWatcher] = None
+if SHARED_ARTIFACT_DIR:
+    _artifact_watcher = ArtifactWatcher(
+        SHARED_ARTIFACT_DIR,
+        _load_shared_sync,
+        interval=float(os.getenv("SERVING_SHARED_POLL_SECONDS", "2")),
+    )
+
+def _resolve_models_uri(model_uri: str):
+    """Map ``models:/<name>/<stage-or-version>`` to (cache key, name, stage or None)."""
+    name, ref = parse_models_uri(model_uri)
+    if ref.isdigit():
+        return f"{name}/{ref}", name, None
+    return f"{name}/{_stage_resolver.resolve(name, ref).version}", name, ref
+
+def _watch_stage(key: str, stage: str, aliases: List[str], compile_scorer: bool) -> None:
+    """Keep ``aliases`` pointed at whatever version is in ``stage``.
+
+    ``key`` is the ``<name>/<version>`` that was actually loaded; call this only
+    after the load succeeded so a failed load never leaves a watch behind.
+    """
+    name, version = key.rsplit("/", 1)
+    _stage_watches[(name, stage)] = {"aliases": list(aliases), "compile": compile_scorer}
+    _promotion_watcher.watch(name, stage, version)
+
+def _on_promotion(ref: ModelVersionRef) -> None:
+    """Preload and warm a newly promoted version, then switch its aliases."""
+    target = _stage_watches.get((ref.name, ref.stage))
+    if target is None:
+        return
+    _load_model_sync(f"{ref.name}/{ref.version}", None, target["aliases"], target["compile"])
+    print(f"models:/{ref.name}/{ref.stage} now serving version {ref.version}")
+
+_promotion_watcher = PromotionWatcher(
+    _stage_resolver, _on_promotion, interval=float(os.getenv("SERVING_STAGE_POLL_SECONDS", "30"))
+)
+
+def _update_load_job(job_id: str, **fields: Any) -> None:
+    with _load_jobs_lock:
+        job = _load_jobs.get(job_id)
+        if job is not None:
+            job.update(fields)
+
+def _run_load_job(job_id: str, *args, stage: Optional[str] = None) -> None:
+    _update_load_job(job_id, status="running")
+    try:
+        entry = _load_model_sync(*args)
+        if stage:
+            _watch_stage(entry.key, stage, *args[2:])
+        _update_load_job(
+            job_id, status="done", model_version=entry.version,
+            scorer=type(entry.model).__name__, finished_at=time.time(),
+        )
+    except Exception as e:
+        _update_load_job(job_id, status="failed", error=str(e), finished_at=time.time())
+
+def _preload_model(target: str) -> None:
+    """Load and warm the startup model under the default alias (runs in a load worker)."""
+    _preload_state.update(status="loading", error=None)
+    start = time.perf_counter()
+    try:
+        if target == "shared":
+            if _artifact_watcher is None:
+                raise ValueError("SERVING_SHARED_ARTIFACT_DIR is not set")
+            version = current_version(SHARED_ARTIFACT_DIR)
+            if version is None:
+                raise ValueError(f"No shared artifact exported to {SHARED_ARTIFACT_DIR}")
+            _load_shared_sync(version)
+            _artifact_watcher.start(version)
+        elif target == "latest":
+            # Not load_latest_model(): its errors are only printed, /ready must show them
+            version = _load_latest_entry().version
+        elif target.startswith("models:/"):
+            key, _, stage = _resolve_models_uri(target)
+            entry = _load_model_sync(key, None, [DEFAULT_MODEL_ALIAS], COMPILE_MODELS)
+            version = entry.version
+            if stage:
+                _watch_stage(entry.key, stage, [DEFAULT_MODEL_ALIAS], COMPILE_MODELS)
+        else:
+            version = _load_model_sync(target, target, [DEFAULT_MODEL_ALIAS], COMPILE_MODELS).version
+        _preload_state.update(status="ready", model_version=version)
+    except Exception as e:
+        _preload_state.update(status="failed", error=str(e))
+        print(f"Error preloading model {target}: {str(e)}")
+    _preload_state["seconds"] = round(time.perf_counter() - start, 3)
+    print(f"Preload of {target} {_preload_state['status']} after {_preload_state['seconds']}s")
+
 @app.post("/load-model", tags=["load"])
 async def load_model_endpoint(payload: LoadModelRequest):
-    """Load a specific MLflow run's model into memory.
+    """Load a specific MLflow run's (or registry version's) model into memory.
 
     Request body:
     {
-        "run_id": "<mlflow_run_id>"
+        "run_id": "<mlflow_run_id>",
+        "compile": false,  # optional, compile LogisticRegression to a NumPy scorer
+        "alias": "default",  # optional, alias to point at the loaded model
+        "background": false  # optional, return a job_id to poll at /load-model/{job_id}
     }
+    or, for a registered model, {"model_uri": "models:/<name>/<stage or version>"}
+    or {"model_name": "<name>", "version": "<version>"}. Stage URIs are
+    followed: when a new version is promoted it is preloaded and swapped in.
+    Models already in the cache are reused unless "reload" is true.
     """
-    global _model, _model_version
+    stage = None
+    if payload.run_id:
+        key = payload.run_id
+    elif payload.model_uri:
+        try:
+            key, _, stage = await run_in_threadpool(_resolve_models_uri, payload.model_uri)
+        except (ValueError, LookupError) as e:
+            raise HTTPException(status_code=404, detail=f"Failed to load model: {str(e)}")
+    elif payload.model_name and payload.version:
+        key = f"{payload.model_name}/{payload.version}"
+    else:
+        raise HTTPException(status_code=422, detail="Provide run_id, model_uri or model_name and version")
+    alias = DEFAULT_MODEL_ALIAS if payload.alias is None else payload.alias
+    aliases = [alias] if alias else []
+    compile_scorer = COMPILE_MODELS if payload.compile is None else payload.compile
+    watch_stage = stage if payload.watch else None
 
-    try:
-        # Always try local store first based on tracking URI if it uses file:
-        tracking_uri = os.getenv("MLFLOW_TRACKING_URI", "")
-        local_root = tracking_uri.replace("file:", "") if tracking_uri.startswith("file:") else ""
+    entry = _models.get(key)
+    if entry is not None and not payload.reload and entry.meta.get("compile") == compile_scorer:
+        for a in aliases:
+            _models.set_alias(a, key)
+        if watch_stage:
+            _watch_stage(entry.key, watch_stage, aliases, compile_scorer)
+        return {
+            "status": "cached",
+            "model_version": entry.version,
+            "scorer": type(entry.model).__name__,
+            "alias": alias or None,
+        }
 
-        if local_root:
-            potential_local = f"{local_root}/{EXPERIMENT_NAME}/{payload.run_id}/artifacts/model"
-            model_uri = potential_local if os.path.exists(potential_local) else None
-        else:
-            model_uri = None
+    if payload.background:
+        job_id = uuid.uuid4().hex
+        with _load_jobs_lock:
+            _load_jobs[job_id] = {
+                "job_id": job_id,
+                "status": "pending",
+                "key": key,
+                "alias": alias or None,
+                "submitted_at": time.time(),
+            }
+            # Forget the oldest finished jobs; pending and running ones stay pollable
+            excess = len(_load_jobs) - MAX_LOAD_JOBS
+            if excess > 0:
+                finished = [k for k, j in _load_jobs.items() if j["status"] in ("done", "failed")]
+                for k in finished[:excess]:
+                    del _load_jobs[k]
+        _load_executor.submit(
+            _run_load_job, job_id, key, payload.run_id, aliases, compile_scorer, stage=watch_stage
+        )
+        return {"status": "pending", "job_id": job_id}
 
-        if not model_uri:
-            mlflow.set_tracking_uri(os.getenv("MLFLOW_TRACKING_URI", "http://mlflow:5000"))
-            model_uri = f"runs:/{payload.run_id}/model"
-        _model = mlflow.sklearn.load_model(model_uri)
-        _model_version = payload.run_id
-        return {"status": "loaded", "model_version": _model_version}
+    try:
+        entry = await run_in_threadpool(_load_model_sync, key, payload.run_id, aliases, compile_scorer)
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Failed to load model: {str(e)}")
+    # Only a model that is actually serving gets a stage watch, pinned at the
+    # version that was loaded.
+    if watch_stage:
+        _watch_stage(entry.key, watch_stage, aliases, compile_scorer)
+    return {
+        "status": "loaded",
+        "model_version": entry.version,
+        "scorer": type(entry.model).__name__,
+        "alias": alias or None,
+    }
+
+@app.get("/load-model/{job_id}", tags=["load"])
+async def load_model_status(job_id: str):
+    """Poll a background model load started with "background": true."""
+    with _load_jobs_lock:
+        job = _load_jobs.get(job_id)
+        job = dict(job) if job is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Load job not found")
+    return job
+
+@app.get("/loaded-models", tags=["load"])
+async def list_loaded_models():
+    """List models held in memory, least recently used first."""
+    aliases = _models.aliases()
+    return {
+        "max_bytes": _models.max_bytes,
+        "total_bytes": _models.total_bytes,
+        "watching": _promotion_watcher.watched(),
+        "models": [
+            {
+                "key": e.key,
+                "model_version": e.version,
+                "scorer": type(e.model).__name__,
+                "nbytes": e.nbytes,
+                "loaded_at": e.loaded_at,
+                "aliases": sorted(a for a, k in aliases.items() if k == e.key),
+            }
+            for e in _models.entries()
+        ],
+    }
+
+@app.delete("/loaded-models/{key:path}", tags=["load"])
+async def unload_model(key: str):
+    """Evict a model (and any aliases pointing at it) from memory."""
+    if _models.remove(key) is None:
+        raise HTTPException(status_code=404, detail=f"Model '{key}' not loaded")
+    if _prediction_cache is not None:
+        _prediction_cache.invalidate(lambda token: token[0] == key)
+    return {"status": "unloaded", "key": key}
+
+async def _cached_query(request: Request, response: Response, endpoint: str, fn, *args):
+    """Serve ``fn(*args)`` from the query cache, computing it in a worker thread on a miss.
+
+    Sets ``ETag``/``Cache-Control`` and answers 304 when ``If-None-Match`` matches.
+    """
+    key = (endpoint,) + args
+    entry = _query_cache.get(key)
+    if entry is None:
+        value = await run_in_threadpool(fn, *args)
+        entry = _query_cache.set(
+            key, value, ttl=QUERY_CACHE_TTLS[endpoint], scope=_QUERY_CACHE_CONFIG[endpoint][0]
+        )
+    headers = {"ETag": entry.etag, "Cache-Control": f"max-age={int(entry.ttl_remaining())}"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return entry.value
 
 @app.post("/register-model", tags=["registry"])
 async def register_model(payload: RegisterModelRequest):
     """Register an MLflow run as a new model version in the Model Registry."""
-    client = MlflowClient()
+    client = _mlflow_client()
     model_uri = f"runs:/{payload.run_id}/model"
     try:
         mv = client.create_model_version(
@@ -197,12 +1078,13 @@ async def register_model(payload: RegisterModelRequest):
             )
         else:
             raise HTTPException(status_code=400, detail=f"Registration failed: {str(e)}")
+    _query_cache.invalidate("registry")
     return {"model_name": mv.name, "version": mv.version, "status": mv.status}
 
 @app.post("/model/{model_name}/{version}/promote", tags=["registry"])
 async def promote_model(model_name: str, version: str, payload: PromoteRequest):
     """Transition a model version to a new stage (e.g., Staging, Production)."""
-    client = MlflowClient()
+    client = _mlflow_client()
     try:
         client.transition_model_version_stage(
             name=model_name,
@@ -210,6 +1092,11 @@ async def promote_model(model_name: str, version: str, payload: PromoteRequest):
             stage=payload.stage,
             archive_existing_versions=False,
         )
+        _stage_resolver.invalidate(model_name)
+        _query_cache.invalidate("registry")
+        if any(name == model_name for name, _ in _stage_watches):
+            # Pick up our own promotion now instead of on the next poll
+            _load_executor.submit(_promotion_watcher.check)
         return {"model_name": model_name, "version": version, "new_stage": payload.stage}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -217,9 +1104,11 @@ async def promote_model(model_name: str, version: str, payload: PromoteRequest):
 @app.delete("/model/{model_name}", tags=["registry"])
 async def delete_model(model_name: str):
     """Delete a registered model and all its versions."""
-    client = MlflowClient()
+    client = _mlflow_client()
     try:
         client.delete_registered_model(model_name)
+        _stage_resolver.invalidate(model_name)
+        _query_cache.invalidate("registry")
         return {"status": "deleted", "model_name": model_name}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -227,17 +1116,17 @@ async def delete_model(model_name: str):
 @app.delete("/model/{model_name}/{version}", tags=["registry"])
 async def delete_model_version(model_name: str, version: str):
     """Delete a specific model version from the registry."""
-    client = MlflowClient()
+    client = _mlflow_client()
     try:
         client.delete_model_version(name=model_name, version=version)
+        _stage_resolver.invalidate(model_name)
+        _query_cache.invalidate("registry")
         return {"status": "deleted", "model_name": model_name, "version": version}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-@app.get("/models", tags=["registry"])
-async def list_registered_models():
-    """List all registered models."""
-    client = MlflowClient()
+def _query_registered_models():
+    client = _mlflow_client()
     models = client.search_registered_models()
     return [
         {
@@ -250,10 +1139,13 @@ async def list_registered_models():
         for m in models
     ]
 
-@app.get("/models/{model_name}/versions", tags=["registry"])
-async def list_model_versions(model_name: str):
-    """List versions of a given model."""
-    client = MlflowClient()
+@app.get("/models", tags=["registry"])
+async def list_registered_models(request: Request, response: Response):
+    """List all registered models."""
+    return await _cached_query(request, response, "models", _query_registered_models)
+
+def _query_model_versions(model_name: str):
+    client = _mlflow_client()
     versions = client.search_model_versions(filter_string=f"name='{model_name}'")
     if not versions:
         raise HTTPException(status_code=404, detail="Model not found")
@@ -268,34 +1160,61 @@ async def list_model_versions(model_name: str):
         for v in versions
     ]
 
+@app.get("/models/{model_name}/versions", tags=["registry"])
+async def list_model_versions(model_name: str, request: Request, response: Response):
+    """List versions of a given model."""
+    return await _cached_query(request, response, "model_versions", _query_model_versions, model_name)
+
 # ---------- Train endpoint ----------
 @app.post("/train", tags=["training"])
-async def train(background_tasks: BackgroundTasks, payload: TrainRequest = Body(default=TrainRequest())):
+async def train(payload: TrainRequest = Body(default=TrainRequest())):
     """Trigger a training run using train_demo and log to MLflow.
-    Runs in background to avoid blocking request."""
+    Runs in a worker process; poll /train/jobs/{job_id} for its state."""
     try:
-        from mlops_framework.train import train_demo
-    except ModuleNotFoundError:
-        from src.mlops_framework.train import train_demo
+        job = _train_executor.submit(
+            "train_demo",
+            run_training_job,
+            model_name=payload.model_name,
+            C=payload.C,
+            max_iter=payload.max_iter,
+            parent_run_id=payload.parent_run_id,
+        )
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Training queue is full: {str(e)}")
+    return {"status": "training_started", "model_name": payload.model_name, "job_id": job.job_id}
 
-    def _run_train():
-        try:
-            result = train_demo(C=payload.C, max_iter=payload.max_iter)
-            run_id = result.get("run_id")
-            # add model_name tag after run exists
-            MlflowClient().set_tag(run_id, "model_name", payload.model_name)
-            print("Training completed", result)
-        except Exception as exc:
-            print("Training failed", exc)
+@app.get("/train/jobs", tags=["training"])
+async def list_train_jobs():
+    """List training jobs known to this process, oldest first."""
+    return [job.to_dict() for job in _train_executor.jobs()]
+
+@app.get("/train/jobs/{job_id}", tags=["training"])
+async def get_train_job(job_id: str):
+    """Return the state (queued/running/succeeded/failed/cancelled) of a training job."""
+    job = _train_executor.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Training job not found")
+    return job.to_dict()
 
-    background_tasks.add_task(_run_train)
-    return {"status": "training_started", "model_name": payload.model_name}
+@app.delete("/train/jobs/{job_id}", tags=["training"])
+async def cancel_train_job(job_id: str):
+    """Cancel a training job that has not started yet."""
+    job = _train_executor.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Training job not found")
+    if not _train_executor.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job is {job.status} and cannot be cancelled")
+    return job.to_dict()
 
 # ---------- Train status endpoint ----------
-@app.get("/train-status", tags=["training"])
-async def train_status(model_name: str = EXPERIMENT_NAME):
-    """Return status of the latest run for a given model_name tag."""
-    client = MlflowClient()
+def _query_train_status(model_name: str):
+    index = _run_index()
+    if index is not None:
+        runs = index.search(EXPERIMENT_NAME, tags={"model_name": model_name}, max_results=1)
+        if not runs:
+            raise HTTPException(status_code=404, detail="No run found for model")
+        return {key: runs[0][key] for key in ("run_id", "status", "start_time")}
+    client = _mlflow_client()
     runs = client.search_runs(
         experiment_ids=[client.get_experiment_by_name(EXPERIMENT_NAME).experiment_id],
         filter_string=f"tag.model_name = '{model_name}'",
@@ -311,22 +1230,41 @@ async def train_status(model_name: str = EXPERIMENT_NAME):
         "start_time": r.info.start_time,
     }
 
+@app.get("/train-status", tags=["training"])
+async def train_status(request: Request, response: Response, model_name: str = EXPERIMENT_NAME):
+    """Return status of the latest run for a given model_name tag."""
+    return await _cached_query(request, response, "train_status", _query_train_status, model_name)
+
 # ----------- MLflow query endpoints -----------
 
-@app.get("/experiments", tags=["mlflow"])
-async def list_experiments():
-    """Return all experiments id & name."""
-    client = MlflowClient()
+def _query_experiments():
+    client = _mlflow_client()
     experiments = client.search_experiments(max_results=10000)
     return [
         {"experiment_id": exp.experiment_id, "name": exp.name}
         for exp in experiments
     ]
 
-@app.get("/experiments/{experiment_name}/runs", tags=["mlflow"])
-async def list_runs(experiment_name: str, max_results: int = 20):
-    """List recent runs of an experiment by name."""
-    client = MlflowClient()
+@app.get("/experiments", tags=["mlflow"])
+async def list_experiments(request: Request, response: Response):
+    """Return all experiments id & name."""
+    return await _cached_query(request, response, "experiments", _query_experiments)
+
+def _query_runs(experiment_name: str, max_results: int):
+    index = _run_index()
+    if index is not None:
+        if index.experiment_id(experiment_name) is None:
+            raise HTTPException(status_code=404, detail="Experiment not found")
+        return [
+            {
+                "run_id": r["run_id"],
+                "status": r["status"],
+                "start_time": r["start_time"],
+                "run_name": r["run_name"] or "",
+            }
+            for r in index.search(experiment_name, max_results=max_results)
+        ]
+    client = _mlflow_client()
     # Resolve experiment id
     exp = client.get_experiment_by_name(experiment_name)
     if exp is None:
@@ -346,6 +1284,11 @@ async def list_runs(experiment_name: str, max_results: int = 20):
         for r in runs
     ]
 
+@app.get("/experiments/{experiment_name}/runs", tags=["mlflow"])
+async def list_runs(experiment_name: str, request: Request, response: Response, max_results: int = 20):
+    """List recent runs of an experiment by name."""
+    return await _cached_query(request, response, "runs", _query_runs, experiment_name, max_results)
+
 if __name__ == "__main__":
     import uvicorn
 
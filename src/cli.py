@@ -1,3 +1,5 @@
+import json
+
 import typer
 import rich
 from pathlib import Path
@@ -9,18 +11,148 @@ app = typer.Typer(help="CLI entry for MLOps framework demo")
 
 @app.command()
 def run_pipeline(config_path: Path | None = typer.Option(None, help="Path to YAML/JSON config")):
-    """Run the end-to-end demo pipeline."""
-    # For now we ignore config_path; future versions can parse it.
-    metrics = pipeline.run()
+    """Run the end-to-end demo pipeline.
+
+    A config with a "steps" list (or "steps": "default") runs the cached step
+    pipeline; unchanged steps are skipped on rerun.
+    """
+    config = None
+    if config_path is not None:
+        text = config_path.read_text()
+        if config_path.suffix in (".yaml", ".yml"):
+            import yaml  # optional dependency, only needed for YAML configs
+
+            config = yaml.safe_load(text)
+        else:
+            config = json.loads(text)
+    metrics = pipeline.run(config)
     rich.print({"metrics": metrics})
 
 
 @app.command()
-def train_demo(C: float = 1.0, max_iter: int = 200):
+def train_demo(
+    C: float = 1.0,
+    max_iter: int = 200,
+    data: str | None = typer.Option(None, help="CSV/Parquet input (cached); default: Iris"),
+    target: str = typer.Option("target", help="Label column of --data"),
+    profile: bool = typer.Option(False, help="Attach a cProfile of the run as a run artifact"),
+    parent_run_id: str | None = typer.Option(None, help="Warm-start from this run's model"),
+    track_memory: bool = typer.Option(False, help="Log per-stage tracemalloc peaks (slows the run)"),
+):
     """Train logistic regression demo and log to MLflow."""
-    metrics = train.train_demo(C=C, max_iter=max_iter)
+    metrics = train.train_demo(
+        C=C, max_iter=max_iter, data_source=data, target=target, profile=profile,
+        parent_run_id=parent_run_id, track_memory=track_memory,
+    )
+    rich.print({"metrics": metrics})
+
+
+@app.command()
+def train_streaming(
+    data: str = typer.Option("iris", help="CSV/Parquet input streamed in chunks; default: Iris"),
+    target: str = typer.Option("target", help="Label column of --data"),
+    chunk_size: int = typer.Option(10_000, help="Rows per chunk"),
+    epochs: int = typer.Option(5, help="Passes over the data"),
+    alpha: float = typer.Option(1e-4, help="SGDClassifier regularisation"),
+    profile: bool = typer.Option(False, help="Attach a cProfile of the run as a run artifact"),
+    track_memory: bool = typer.Option(False, help="Log per-stage tracemalloc peaks (slows the run)"),
+):
+    """Train an incremental (partial_fit) model out-of-core and log to MLflow."""
+    metrics = train.train_streaming(
+        data, target=target, chunk_size=chunk_size, epochs=epochs, alpha=alpha, profile=profile,
+        track_memory=track_memory,
+    )
     rich.print({"metrics": metrics})
 
 
+def _parse_values(values: str | None, cast):
+    return [cast(v) for v in values.split(",")] if values else None
+
+
+@app.command()
+def sweep(
+    c: str = typer.Option("0.01,0.1,1,10", "--c", help="Comma-separated C values"),
+    max_iter: str = typer.Option("200", help="Comma-separated max_iter values"),
+    mode: str = typer.Option("grid", help="grid or random"),
+    n_trials: int | None = typer.Option(None, help="Random draws (or grid size cap)"),
+    workers: int | None = typer.Option(None, help="Worker processes (default: all cores)"),
+    halving: bool = typer.Option(False, help="Successive halving over max_iter"),
+    eta: int = typer.Option(3, help="Halving reduction factor"),
+    data: str | None = typer.Option(None, help="CSV/Parquet input (cached); default: Iris"),
+    target: str = typer.Option("target", help="Label column of --data"),
+):
+    """Run a parallel hyper-parameter sweep with nested MLflow runs."""
+    space = {"C": _parse_values(c, float), "max_iter": _parse_values(max_iter, int)}
+    result = pipeline.run(
+        {
+            "sweep": {
+                "space": space,
+                "mode": mode,
+                "n_trials": n_trials,
+                "max_workers": workers,
+                "halving": halving,
+                "eta": eta,
+                "data_source": data,
+                "target": target,
+            }
+        }
+    )
+    rich.print({"run_id": result["run_id"], "best": result["best"]})
+
+
+@app.command()
+def score(
+    model: str = typer.Argument(..., help="run_id, runs:/ or models:/ URI"),
+    input_path: Path = typer.Argument(..., help="CSV or Parquet file to score"),
+    output_path: Path = typer.Argument(..., help="Parquet file to write"),
+    chunk_size: int = typer.Option(100_000, help="Rows per chunk"),
+    workers: int | None = typer.Option(None, help="Scoring processes (default: all cores)"),
+    features: str | None = typer.Option(None, help="Comma-separated feature columns"),
+    ids: str | None = typer.Option(None, help="Comma-separated columns copied to the output"),
+    compile_scorer: bool = typer.Option(True, "--compile/--no-compile", help="Use the NumPy scorer for linear models"),
+):
+    """Score a large file in parallel chunks and write predictions to Parquet."""
+    summary = pipeline.score(
+        {
+            "model": model,
+            "input_path": input_path,
+            "output_path": output_path,
+            "chunk_size": chunk_size,
+            "workers": workers,
+            "feature_columns": _parse_values(features, str),
+            "id_columns": _parse_values(ids, str) or (),
+            "compile_scorer": compile_scorer,
+        }
+    )
+    rich.print(summary)
+
+
+@app.command()
+def export_model(
+    model: str = typer.Argument(..., help="run_id, runs:/ or models:/ URI, or local model directory"),
+    artifact_dir: Path = typer.Argument(..., help="Shared artifact root (SERVING_SHARED_ARTIFACT_DIR)"),
+    version: str | None = typer.Option(None, help="Version name (default: timestamp + model reference)"),
+    keep: int = typer.Option(3, help="Exported versions to keep"),
+):
+    """Export a linear model as memory-mapped arrays and make it the version all workers serve."""
+    from mlops_framework.shared_artifacts import export_model as export
+
+    path = export(model, artifact_dir, version=version, keep=keep)
+    rich.print({"exported": str(path), "version": path.name})
+
+
+@app.command()
+def index_runs(
+    tracking_dir: Path = typer.Argument(..., help="Directory of a file: MLflow tracking store"),
+    full: bool = typer.Option(False, help="Re-read every run, e.g. after deleting or re-tagging old runs"),
+):
+    """Build or refresh the SQLite run index that serving uses for run lookups."""
+    from mlops_framework.run_index import RunIndex
+
+    index = RunIndex(tracking_dir)
+    runs_read = index.refresh(full=full)
+    rich.print({"index": str(index.path), "runs_read": runs_read})
+
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
@@ -2,4 +2,19 @@ __all__ = [
     "data",
     "train",
     "pipeline",
+    "dag",
+    "batching",
+    "metrics",
+    "scoring",
+    "serialization",
+    "model_cache",
+    "prediction_cache",
+    "profiling",
+    "registry",
+    "run_index",
+    "response_cache",
+    "shared_artifacts",
+    "jobs",
+    "sweep",
+    "tracking",
 ]
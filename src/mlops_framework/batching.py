@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+"""Asynchronous micro-batching for online inference.
+
+Concurrent single-row requests are queued and flushed together, either when
+``max_batch_size`` rows are waiting or ``max_wait_ms`` has elapsed since the
+first queued row.  Each flush runs one vectorized ``predict_proba`` per model
+and hands every caller back its own row of probabilities.
+"""
+
+import asyncio
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ["MicroBatcher"]
+
+
+class MicroBatcher:
+    """Group concurrent ``predict_proba`` calls into vectorized batches.
+
+    Parameters
+    ----------
+    max_batch_size : Upper bound on rows per ``predict_proba`` call.
+    max_wait_ms : How long the first queued row may wait for company.
+    on_flush : Optional callback invoked with the size of every flushed batch.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 2.0,
+        on_flush: Optional[Callable[[int], None]] = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(max_wait_ms, 0.0) / 1000.0
+        self.batch_sizes: Counter[int] = Counter()
+        self.on_flush = on_flush
+        self._queue: asyncio.Queue | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, model: Any, row: Sequence[float]) -> np.ndarray:
+        """Queue one feature row and wait for its probability vector."""
+        queue = self._ensure_worker()
+        future = self._loop.create_future()
+        await queue.put((model, row, future))
+        return await future
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counts of flushed batches keyed by batch size."""
+        batches = sum(self.batch_sizes.values())
+        rows = sum(size * n for size, n in self.batch_sizes.items())
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": batches,
+            "rows": rows,
+            "mean_batch_size": rows / batches if batches else 0.0,
+            "batch_sizes": {str(size): n for size, n in sorted(self.batch_sizes.items())},
+        }
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        # Queues and tasks are bound to the loop that created them; recreate
+        # them if the app is restarted on a fresh loop (e.g. in tests).
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def aclose(self) -> None:
+        """Stop the worker task; rows still waiting fail with ``RuntimeError``."""
+        worker, self._worker = self._worker, None
+        if worker is None:
+            return
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+        queue = self._queue
+        while queue is not None and not queue.empty():
+            self._fail([queue.get_nowait()])
+
+    async def _run(self) -> None:
+        queue, loop = self._queue, self._loop
+        while True:
+            batch = [await queue.get()]
+            try:
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    # Drain whatever is already queued before waiting on the clock.
+                    try:
+                        batch.append(queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                self._fail(batch)
+                raise
+            self._flush(batch)
+
+    @staticmethod
+    def _fail(batch: List[Tuple[Any, Sequence[float], asyncio.Future]]) -> None:
+        for _, _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher stopped before the row was scored"))
+
+    def _flush(self, batch: List[Tuple[Any, Sequence[float], asyncio.Future]]) -> None:
+        self.batch_sizes[len(batch)] += 1
+        if self.on_flush is not None:
+            self.on_flush(len(batch))
+
+        # A hot swap can leave rows for two models in one batch; score each
+        # model's rows separately.
+        groups: Dict[int, List[Tuple[Any, Sequence[float], asyncio.Future]]] = {}
+        for item in batch:
+            groups.setdefault(id(item[0]), []).append(item)
+
+        for items in groups.values():
+            model = items[0][0]
+            try:
+                X = np.asarray([row for _, row, _ in items], dtype=np.float64)
+                probabilities = model.predict_proba(X)
+            except Exception as exc:
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, _, future), proba in zip(items, probabilities):
+                if not future.done():
+                    future.set_result(proba)
@@ -0,0 +1,447 @@
+from __future__ import annotations
+
+"""Declarative step pipelines with content-addressed result caching.
+
+A pipeline is a list of steps such as ``load -> split -> featurize -> train ->
+evaluate -> register``.  Each step's output is stored under a key derived from
+the step's source code, its params and the keys of its inputs, so a rerun
+skips every step whose code, config and upstream results are unchanged.
+Changing only the ``train`` hyper-parameters therefore re-runs ``train`` and
+its descendants but reuses the cached data and feature steps.  Steps whose
+inputs are ready run concurrently in a thread pool.
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import inspect
+import json
+import logging
+import os
+import pickle
+import sys
+import sysconfig
+import tempfile
+import time
+import types
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from .data import DEFAULT_CACHE_DIR, _read_source, _source_fingerprint
+from .train import fit_and_evaluate
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DEFAULT_STEPS", "Step", "StepCache", "register_step", "run_steps", "step_key"]
+
+DEFAULT_STEP_CACHE_DIR = Path(os.getenv("MLOPS_STEP_CACHE_DIR", DEFAULT_CACHE_DIR.parent / "steps"))
+DEFAULT_STEP_CACHE_MAX_BYTES = int(os.getenv("MLOPS_STEP_CACHE_MAX_BYTES", str(5 * 1024 ** 3)))
+
+# Bump when the key derivation or on-disk format changes.
+_CACHE_FORMAT = 2
+
+# Installed code: referenced by package version rather than by source.
+_INSTALLED_PREFIXES = tuple(
+    os.path.realpath(p) for p in {sysconfig.get_paths()[k] for k in ("stdlib", "platstdlib", "purelib", "platlib")}
+)
+
+
+@dataclass(frozen=True)
+class _StepSpec:
+    fn: Callable[..., Any]
+    cache: bool = True
+    # Extra identity folded into the key, e.g. the mtime of an input file.
+    fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None
+
+
+_REGISTRY: Dict[str, _StepSpec] = {}
+
+
+def register_step(
+    name: str,
+    cache: bool = True,
+    fingerprint: Optional[Callable[[Dict[str, Any]], Any]] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator registering ``fn(*inputs, **params)`` as step type ``name``.
+
+    Steps with side effects (e.g. logging to MLflow) should pass ``cache=False``.
+    """
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        _REGISTRY[name] = _StepSpec(fn=fn, cache=cache, fingerprint=fingerprint)
+        return fn
+
+    return decorator
+
+
+@dataclass
+class Step:
+    """One node of a pipeline.
+
+    Parameters
+    ----------
+    name : Unique node name; other steps refer to it in ``inputs``.
+    step : Registered step type, defaults to ``name``.
+    inputs : Names of upstream steps whose outputs are passed positionally.
+    params : Keyword arguments of the step function.
+    """
+
+    name: str
+    step: Optional[str] = None
+    inputs: List[str] = field(default_factory=list)
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def spec(self) -> _StepSpec:
+        kind = self.step or self.name
+        if kind not in _REGISTRY:
+            raise ValueError(f"Unknown step type: {kind}")
+        return _REGISTRY[kind]
+
+
+def _referenced_modules(code: types.CodeType, namespace: Dict[str, Any]) -> List[types.ModuleType]:
+    """Modules that the names used by ``code`` (and its nested functions) resolve to."""
+    modules = []
+    for name in code.co_names:
+        obj = namespace.get(name, sys.modules.get(name))
+        if obj is None and "." in name:  # ``import a.b`` inside a function
+            obj = sys.modules.get(name)
+        module = obj if isinstance(obj, types.ModuleType) else sys.modules.get(getattr(obj, "__module__", None) or "")
+        if module is not None:
+            modules.append(module)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            modules.extend(_referenced_modules(const, namespace))
+    return modules
+
+
+@functools.lru_cache(maxsize=None)
+def _package_version(top: str) -> str:
+    version = getattr(sys.modules.get(top), "__version__", None)
+    if version is None:
+        try:
+            version = importlib.metadata.version(top)
+        except importlib.metadata.PackageNotFoundError:
+            version = ""
+    return f"{top}=={version}"
+
+
+@functools.lru_cache(maxsize=None)
+def _code_hash(fn: Callable[..., Any]) -> str:
+    """Hash of ``fn``'s source and of everything it calls into.
+
+    ``fn``'s own module and the local modules it references are hashed by
+    file content, following their own references, so an edit to a helper
+    next to the step or in another module such as
+    ``train.fit_and_evaluate`` changes the key.  Installed packages (e.g.
+    scikit-learn) contribute their version; the Python version is included
+    because cached outputs are pickles.
+    """
+    try:
+        source = inspect.getsource(fn)
+    except (OSError, TypeError):
+        source = f"{fn.__module__}.{fn.__qualname__}"
+    digest = hashlib.sha256(source.encode())
+    digest.update(f"python {sys.version_info[0]}.{sys.version_info[1]}".encode())
+
+    code = getattr(fn, "__code__", None)
+    pending = _referenced_modules(code, fn.__globals__) if code is not None else []
+    # The step's own module is hashed too: helpers defined next to the step
+    # are not reachable through other modules.
+    own = sys.modules.get(fn.__module__)
+    if own is not None:
+        pending.append(own)
+    seen = set()
+    parts = set()
+    while pending:
+        module = pending.pop()
+        if id(module) in seen:
+            continue
+        seen.add(id(module))
+        path = getattr(module, "__file__", None)
+        if path is None:
+            continue  # builtin module
+        if os.path.realpath(path).startswith(_INSTALLED_PREFIXES):
+            top = module.__name__.split(".")[0]
+            if top not in sys.stdlib_module_names:  # stdlib is covered by the Python version
+                parts.add(_package_version(top))
+            continue
+        with open(path, "rb") as fh:
+            parts.add(f"{module.__name__}:{hashlib.sha256(fh.read()).hexdigest()}")
+        namespace = vars(module)
+        pending.extend(m for m in namespace.values() if isinstance(m, types.ModuleType))
+        pending.extend(
+            sys.modules[v.__module__] for v in namespace.values()
+            if callable(v) and getattr(v, "__module__", None) in sys.modules
+        )
+    for part in sorted(parts):
+        digest.update(part.encode())
+    return digest.hexdigest()
+
+
+def step_key(step: Step, input_keys: Sequence[str]) -> str:
+    """Content address of ``step``'s output given its inputs' addresses."""
+    spec = step.spec
+    payload = {
+        "code": _code_hash(spec.fn),
+        "params": step.params,
+        "inputs": list(input_keys),
+        "fingerprint": spec.fingerprint(step.params) if spec.fingerprint else None,
+        "format": _CACHE_FORMAT,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+
+class StepCache:
+    """Pickle store addressed by :func:`step_key`.
+
+    Parameters
+    ----------
+    root : Cache directory, defaults to ``MLOPS_STEP_CACHE_DIR``.
+    max_bytes : Least recently used entries are evicted once the cache grows
+        beyond this size (``MLOPS_STEP_CACHE_MAX_BYTES``, default 5 GiB).
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None, max_bytes: Optional[int] = None) -> None:
+        self.root = Path(root) if root is not None else DEFAULT_STEP_CACHE_DIR
+        self.max_bytes = DEFAULT_STEP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.pkl"
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, key: str) -> Any:
+        path = self._path(key)
+        with open(path, "rb") as fh:
+            value = pickle.load(fh)
+        os.utime(path)  # mark as recently used for eviction
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{key}-", dir=path.parent)
+        with os.fdopen(fd, "wb") as fh:
+            pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        # Atomic rename: concurrent writers of the same key produce identical content.
+        os.replace(tmp, path)
+        self.prune(keep=key)
+
+    def prune(self, keep: Optional[str] = None) -> int:
+        """Evict least recently used entries until the cache fits ``max_bytes``; return the count."""
+        entries = []
+        for path in self.root.glob("*/*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path.stem == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every cached step output; return the count."""
+        paths = list(self.root.glob("*/*.pkl"))
+        for path in paths:
+            path.unlink(missing_ok=True)
+        return len(paths)
+
+
+def _parse_steps(steps: Sequence[Union[Step, Dict[str, Any]]]) -> List[Step]:
+    """Build :class:`Step` objects; a step without ``inputs`` reads the previous step."""
+    parsed: List[Step] = []
+    for raw in steps:
+        if isinstance(raw, Step):
+            step = raw
+        else:
+            step = Step(**raw)
+            if "inputs" not in raw and parsed:
+                step.inputs = [parsed[-1].name]
+        parsed.append(step)
+
+    names = [s.name for s in parsed]
+    if len(set(names)) != len(names):
+        raise ValueError("Step names must be unique")
+    for s in parsed:
+        s.spec  # raises for unknown step types
+        missing = [i for i in s.inputs if i not in names]
+        if missing:
+            raise ValueError(f"Step '{s.name}' depends on unknown steps: {missing}")
+    return parsed
+
+
+def run_steps(
+    steps: Sequence[Union[Step, Dict[str, Any]]],
+    cache_dir: Union[str, Path, None] = None,
+    max_workers: int | None = None,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """Execute a step pipeline.
+
+    Parameters
+    ----------
+    steps : :class:`Step` objects or dicts with the same fields.
+    cache_dir : Step cache location, defaults to ``MLOPS_STEP_CACHE_DIR``
+        (``~/.cache/mlops_framework/steps``).
+    max_workers : Threads for independent steps; defaults to the step count.
+    use_cache : Set to ``False`` to recompute (and overwrite) every step.
+
+    Returns
+    -------
+    dict with ``outputs`` (step name -> output) and ``steps`` (step name ->
+    ``{"key", "cached", "seconds"}``)
+    """
+    parsed = _parse_steps(steps)
+    cache = StepCache(cache_dir)
+    by_name = {s.name: s for s in parsed}
+    outputs: Dict[str, Any] = {}
+    keys: Dict[str, str] = {}
+    report: Dict[str, Dict[str, Any]] = {}
+    pending = list(parsed)
+    running: Dict[Future, Step] = {}
+
+    def execute(step: Step, key: str) -> Any:
+        spec = step.spec
+        if use_cache and spec.cache and key in cache:
+            logger.info("Step %s: cached (%s)", step.name, key)
+            report[step.name] = {"key": key, "cached": True, "seconds": 0.0}
+            return cache.get(key)
+        start = time.perf_counter()
+        result = spec.fn(*(outputs[i] for i in step.inputs), **step.params)
+        if spec.cache:
+            cache.put(key, result)
+        seconds = time.perf_counter() - start
+        logger.info("Step %s: ran in %.3fs (%s)", step.name, seconds, key)
+        report[step.name] = {"key": key, "cached": False, "seconds": seconds}
+        return result
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(parsed) or 1, thread_name_prefix="pipeline-step") as pool:
+        while pending or running:
+            ready = [s for s in pending if all(i in outputs for i in s.inputs)]
+            if not ready and not running:
+                raise ValueError(f"Dependency cycle between steps: {[s.name for s in pending]}")
+            for step in ready:
+                pending.remove(step)
+                keys[step.name] = step_key(step, [keys[i] for i in step.inputs])
+                running[pool.submit(execute, step, keys[step.name])] = step
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step = running.pop(future)
+                # Re-raises the step's exception; the pool waits for running siblings.
+                outputs[step.name] = future.result()
+
+    return {"outputs": {name: outputs[name] for name in by_name}, "steps": report}
+
+
+# --- built-in steps -------------------------------------------------------------
+
+
+def _load_fingerprint(params: Dict[str, Any]) -> Any:
+    return _source_fingerprint(params.get("source", "iris"))
+
+
+@register_step("load", fingerprint=_load_fingerprint)
+def load(source: str = "iris", target: str = "target") -> Dict[str, Any]:
+    """Read a CSV / Parquet table (or ``"iris"``) into feature and label arrays."""
+    X, y, columns = _read_source(source, target)
+    return {"X": X, "y": y, "columns": columns}
+
+
+@register_step("split")
+def split(data: Dict[str, Any], test_size: float = 0.2, random_state: int = 42, stratify: bool = True) -> Dict[str, Any]:
+    X_train, X_test, y_train, y_test = train_test_split(
+        data["X"], data["y"], test_size=test_size, random_state=random_state,
+        stratify=data["y"] if stratify else None,
+    )
+    return {"X_train": X_train, "y_train": y_train, "X_test": X_test, "y_test": y_test, "columns": data["columns"]}
+
+
+@register_step("featurize")
+def featurize(splits: Dict[str, Any], scale: bool = True) -> Dict[str, Any]:
+    """Standardise features with statistics from the train split."""
+    scaler = StandardScaler().fit(splits["X_train"]) if scale else None
+    transform = scaler.transform if scaler is not None else np.asarray
+    return {
+        **splits,
+        "X_train": transform(splits["X_train"]),
+        "X_test": transform(splits["X_test"]),
+        "scaler": scaler,
+    }
+
+
+@register_step("train")
+def train(features: Dict[str, Any], C: float = 1.0, max_iter: int = 200) -> Any:
+    model, _ = fit_and_evaluate(
+        features["X_train"], features["y_train"], features["X_test"], features["y_test"], C=C, max_iter=max_iter
+    )
+    return model
+
+
+@register_step("evaluate")
+def evaluate(model: Any, features: Dict[str, Any]) -> Dict[str, float]:
+    from sklearn.metrics import accuracy_score, f1_score
+
+    preds = model.predict(features["X_test"])
+    return {
+        "accuracy": accuracy_score(features["y_test"], preds),
+        "f1_micro": f1_score(features["y_test"], preds, average="micro"),
+    }
+
+
+@register_step("register", cache=False)
+def register(
+    model: Any,
+    metrics: Dict[str, float],
+    features: Dict[str, Any],
+    model_name: str | None = None,
+    mlflow_tracking_uri: str | None = None,
+) -> Dict[str, Any]:
+    """Log scaler + model as one sklearn pipeline and optionally register it."""
+    import mlflow
+    from sklearn.pipeline import make_pipeline
+
+    from .tracking import RunLogger
+
+    if mlflow_tracking_uri:
+        mlflow.set_tracking_uri(mlflow_tracking_uri)
+    mlflow.set_experiment("iris-demo")
+
+    scaler = features.get("scaler")
+    served = make_pipeline(scaler, model) if scaler is not None else model
+    with mlflow.start_run(run_name="logreg_demo_pipeline") as run, RunLogger(run.info.run_id) as tracker:
+        tracker.log_params({"C": model.C, "max_iter": model.max_iter})
+        tracker.log_metrics(metrics)
+        tracker.log_model(served, "model")
+    result: Dict[str, Any] = {"run_id": run.info.run_id, "metrics": metrics}
+    if model_name:
+        version = mlflow.register_model(f"runs:/{run.info.run_id}/model", model_name)
+        result["version"] = version.version
+    return result
+
+
+DEFAULT_STEPS: List[Dict[str, Any]] = [
+    {"name": "load"},
+    {"name": "split"},
+    {"name": "featurize"},
+    {"name": "train"},
+    {"name": "evaluate", "inputs": ["train", "featurize"]},
+    {"name": "register", "inputs": ["train", "evaluate", "featurize"]},
+]
@@ -7,17 +7,38 @@ swap this out for any custom loader later.  The helper returns Pandas
 DataFrames / Series which play nicely with the rest of the pipeline.
 """
 
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
 from pathlib import Path
-from typing import Tuple, Union
+from typing import Iterator, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from sklearn.datasets import load_iris
 from sklearn.model_selection import train_test_split
 
 __all__ = [
     "load_demo_iris",
+    "load_dataset",
+    "dataset_cache_key",
+    "iter_array_chunks",
+    "iter_file_chunks",
+    "iter_frames",
 ]
 
+DEFAULT_CACHE_DIR = Path(
+    os.getenv("MLOPS_DATA_CACHE_DIR", Path.home() / ".cache" / "mlops_framework" / "datasets")
+)
+DEFAULT_CACHE_MAX_BYTES = int(os.getenv("MLOPS_DATA_CACHE_MAX_BYTES", str(10 * 1024 ** 3)))
+
+# Bump when the on-disk layout or split logic changes to invalidate old entries.
+_CACHE_FORMAT = 1
+_SPLITS = ("X_train", "y_train", "X_test", "y_test")
+
 
 def load_demo_iris(
     test_size: float = 0.2,
@@ -37,3 +58,155 @@ def load_demo_iris(
         X, y, test_size=test_size, random_state=random_state, stratify=y
     )
     return X_train, y_train, X_test, y_test
+
+
+def _source_fingerprint(source: Union[str, Path]) -> dict:
+    if str(source) == "iris":
+        return {"source": "sklearn:iris"}
+    path = Path(source).resolve()
+    stat = path.stat()
+    # Path + size + mtime identifies the file without re-reading multi-GB inputs.
+    return {"source": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def dataset_cache_key(
+    source: Union[str, Path],
+    target: str = "target",
+    test_size: float = 0.2,
+    random_state: int = 42,
+    stratify: bool = True,
+) -> str:
+    """Hash of the source identity and split parameters."""
+    spec = {
+        **_source_fingerprint(source),
+        "target": target,
+        "test_size": test_size,
+        "random_state": random_state,
+        "stratify": stratify,
+        "format": _CACHE_FORMAT,
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()[:32]
+
+
+def _read_source(source: Union[str, Path], target: str) -> Tuple[np.ndarray, np.ndarray, list]:
+    if str(source) == "iris":
+        iris = load_iris(as_frame=True)
+        df = iris.frame
+        target = "target"
+    elif str(source).endswith((".parquet", ".pq")):
+        df = pd.read_parquet(source)
+    else:
+        df = pd.read_csv(source)
+    features = df.drop(columns=[target])
+    y = df[target].to_numpy()
+    if y.dtype == object:
+        # Fixed-width strings can be memory-mapped, Python objects cannot.
+        y = y.astype(str)
+    return features.to_numpy(dtype=np.float64), y, list(features.columns)
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+
+def _evict(cache_dir: Path, max_bytes: int, keep: str) -> None:
+    """Remove least recently used entries until the cache fits ``max_bytes``."""
+    entries = [p for p in cache_dir.iterdir() if p.is_dir() and (p / "meta.json").exists()]
+    entries.sort(key=lambda p: (p / "meta.json").stat().st_mtime)
+    total = sum(_dir_size(p) for p in entries)
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        if entry.name == keep:
+            continue
+        total -= _dir_size(entry)
+        shutil.rmtree(entry, ignore_errors=True)
+
+
+def load_dataset(
+    source: Union[str, Path] = "iris",
+    target: str = "target",
+    test_size: float = 0.2,
+    random_state: int = 42,
+    stratify: bool = True,
+    cache_dir: Union[str, Path, None] = None,
+    max_cache_bytes: int | None = None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Load and split a dataset through a content-addressed ``.npy`` cache.
+
+    Parameters
+    ----------
+    source : ``"iris"`` or a path to a CSV / Parquet file.
+    target : Label column name in ``source``.
+    test_size, random_state, stratify : Split parameters (part of the cache key).
+    cache_dir : Cache location, defaults to ``MLOPS_DATA_CACHE_DIR``.
+    max_cache_bytes : Cache size budget, defaults to ``MLOPS_DATA_CACHE_MAX_BYTES``.
+
+    Returns
+    -------
+    X_train, y_train, X_test, y_test as read-only memory-mapped arrays
+    """
+    cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    max_cache_bytes = DEFAULT_CACHE_MAX_BYTES if max_cache_bytes is None else max_cache_bytes
+    key = dataset_cache_key(source, target, test_size, random_state, stratify)
+    entry = cache_dir / key
+
+    if not (entry / "meta.json").exists():
+        X, y, columns = _read_source(source, target)
+        splits = train_test_split(
+            X, y, test_size=test_size, random_state=random_state, stratify=y if stratify else None
+        )
+        X_train, X_test, y_train, y_test = splits
+
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{key}-", dir=cache_dir))
+        for name, arr in zip(_SPLITS, (X_train, y_train, X_test, y_test)):
+            np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr))
+        # meta.json is written last: its presence marks a complete entry.
+        (tmp / "meta.json").write_text(
+            json.dumps({"source": str(source), "target": target, "columns": columns})
+        )
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            # Another process materialised the same entry first.
+            shutil.rmtree(tmp, ignore_errors=True)
+        _evict(cache_dir, max_cache_bytes, keep=key)
+    else:
+        # Refresh the entry's position in the LRU order.
+        os.utime(entry / "meta.json", (time.time(), time.time()))
+
+    X_train, y_train, X_test, y_test = (np.load(entry / f"{name}.npy", mmap_mode="r") for name in _SPLITS)
+    return X_train, y_train, X_test, y_test
+
+
+def iter_array_chunks(
+    X: np.ndarray,
+    y: np.ndarray,
+    chunk_size: int = 10_000,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Yield ``(X, y)`` slices of at most ``chunk_size`` rows (views, no copies)."""
+    for start in range(0, len(X), chunk_size):
+        yield X[start:start + chunk_size], y[start:start + chunk_size]
+
+
+def iter_frames(path: Union[str, Path], chunk_size: int = 10_000) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most ``chunk_size`` rows from a CSV or Parquet file."""
+    if str(path).endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def iter_file_chunks(
+    path: Union[str, Path],
+    target: str = "target",
+    chunk_size: int = 10_000,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Stream ``(X, y)`` chunks from a CSV or Parquet file without loading it whole."""
+    for df in iter_frames(path, chunk_size):
+        y = df[target].to_numpy()
+        yield df.drop(columns=[target]).to_numpy(dtype=np.float64), y
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+"""Bounded process-pool executor for training jobs.
+
+Training runs in separate worker processes so it never competes with the
+serving process for the GIL.  Jobs get an ID and move through
+``queued -> running -> succeeded | failed``; a queued job can also become
+``cancelled``.  The state is an explicit field changed under the executor
+lock, together with the result or error, so a reader never sees a finished
+job without its outcome.
+
+Jobs wait in the executor's own queue, capped by ``max_queue``, and are only
+handed to the process pool when a worker is free.  The pool's internal call
+queue therefore never holds jobs that are still waiting, and every queued job
+can be cancelled.
+"""
+
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+__all__ = ["Job", "JobExecutor", "JobQueueFull", "run_training_job"]
+
+_FINISHED = ("succeeded", "failed", "cancelled")
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when ``max_queue`` jobs are already waiting for a worker."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    name: str
+    params: Dict[str, Any]
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _FINISHED
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "status": self.status,
+            "params": self.params,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobExecutor:
+    """Run jobs in a lazily started ``ProcessPoolExecutor``.
+
+    Parameters
+    ----------
+    max_workers : Number of worker processes.
+    max_queue : Maximum number of jobs waiting for a worker.
+    on_done : Optional callback invoked with each finished or cancelled :class:`Job`.
+    max_history : Number of finished jobs kept for status lookups.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        max_queue: int = 4,
+        on_done: Optional[Callable[[Job], None]] = None,
+        max_history: int = 100,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.on_done = on_done
+        self.max_history = max_history
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._pending: Deque[Tuple[Job, Callable[..., Any]]] = deque()
+        self._running = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # "spawn" keeps workers free of the parent's threads and sockets.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def submit(self, name: str, fn: Callable[..., Any], **params: Any) -> Job:
+        """Queue ``fn(**params)``; raises :class:`JobQueueFull` when the queue is full."""
+        with self._lock:
+            if len(self._pending) >= self.max_queue:
+                raise JobQueueFull(f"{len(self._pending)} jobs already queued")
+            job = Job(job_id=uuid.uuid4().hex, name=name, params=params)
+            self._jobs[job.job_id] = job
+            self._pending.append((job, fn))
+            self._trim()
+            started = self._dispatch()
+        self._watch(started)
+        return job
+
+    def _dispatch(self) -> List[Job]:
+        """Move queued jobs to free workers; called with the lock held."""
+        started = []
+        while self._pending and self._running < self.max_workers:
+            job, fn = self._pending.popleft()
+            try:
+                job.future = self._get_pool().submit(fn, **job.params)
+            except BrokenProcessPool:
+                self._pool = None
+                job.future = self._get_pool().submit(fn, **job.params)
+            job.status, job.started_at = "running", time.time()
+            self._running += 1
+            started.append(job)
+        return started
+
+    def _watch(self, jobs: List[Job]) -> None:
+        # Outside the lock: the callback runs inline when the future is already done.
+        for job in jobs:
+            job.future.add_done_callback(lambda f, job=job: self._finish(job, f))
+
+    def _finish(self, job: Job, future: Future) -> None:
+        result, error, status = None, None, "succeeded"
+        if future.cancelled():
+            status = "cancelled"
+        elif future.exception() is not None:
+            exc = future.exception()
+            error, status = f"{type(exc).__name__}: {exc}", "failed"
+        else:
+            result = future.result()
+        with self._lock:
+            job.result, job.error, job.status, job.finished_at = result, error, status, time.time()
+            self._running -= 1
+            started = self._dispatch()
+        self._watch(started)
+        if self.on_done is not None:
+            self.on_done(job)
+
+    def _trim(self) -> None:
+        finished = [k for k, j in self._jobs.items() if j.finished]
+        for key in finished[: max(len(self._jobs) - self.max_history, 0)]:
+            del self._jobs[key]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job; running jobs cannot be cancelled."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "queued":
+                return False
+            self._pending = deque(item for item in self._pending if item[0] is not job)
+            job.status, job.finished_at = "cancelled", time.time()
+        if self.on_done is not None:
+            self.on_done(job)
+        return True
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Cancel queued jobs and stop the pool; running jobs are left to finish unless ``wait``."""
+        with self._lock:
+            cancelled = [job for job, _ in self._pending]
+            self._pending.clear()
+            for job in cancelled:
+                job.status, job.finished_at = "cancelled", time.time()
+            pool, self._pool = self._pool, None
+        if self.on_done is not None:
+            for job in cancelled:
+                self.on_done(job)
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def run_training_job(model_name: str, **train_kwargs: Any) -> Dict[str, Any]:
+    """Worker entry point: run ``train_demo`` and tag the run with ``model_name``."""
+    from mlflow.tracking import MlflowClient
+
+    from .train import train_demo
+
+    result = train_demo(**train_kwargs)
+    MlflowClient().set_tag(result["run_id"], "model_name", model_name)
+    return result
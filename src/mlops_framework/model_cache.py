@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+"""In-memory cache of loaded models with LRU eviction under a byte budget.
+
+Models are stored under a cache key (an MLflow run_id or ``<name>/<version>``
+for registry models) and can additionally be reached through aliases such as
+``"default"``.  Entries referenced by an alias are pinned: eviction only drops
+un-aliased entries, least recently used first, until the cache fits its budget.
+"""
+
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+__all__ = ["CachedModel", "ModelCache", "estimate_nbytes"]
+
+
+def estimate_nbytes(model: Any) -> int:
+    """Approximate the in-memory size of ``model`` by its pickled size."""
+    try:
+        return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+@dataclass
+class CachedModel:
+    key: str
+    model: Any
+    version: str
+    nbytes: int
+    loaded_at: float = field(default_factory=time.time)
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+class ModelCache:
+    """Thread-safe LRU cache of models keyed by run_id or registry version.
+
+    Parameters
+    ----------
+    max_bytes : Total size budget; ``None`` or ``0`` disables eviction.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None) -> None:
+        self.max_bytes = max_bytes or None
+        self._entries: "OrderedDict[str, CachedModel]" = OrderedDict()
+        self._aliases: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, key_or_alias: str) -> bool:
+        with self._lock:
+            return self._aliases.get(key_or_alias, key_or_alias) in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(e.nbytes for e in self._entries.values())
+
+    def get(self, key_or_alias: str) -> Optional[CachedModel]:
+        """Return the entry for a key or alias and mark it recently used."""
+        with self._lock:
+            key = self._aliases.get(key_or_alias, key_or_alias)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(
+        self,
+        key: str,
+        model: Any,
+        version: Optional[str] = None,
+        aliases: Iterable[str] = (),
+        nbytes: Optional[int] = None,
+        **meta: Any,
+    ) -> CachedModel:
+        """Insert or replace ``key`` and point ``aliases`` at it atomically."""
+        entry = CachedModel(
+            key=key,
+            model=model,
+            version=version or key,
+            nbytes=estimate_nbytes(model) if nbytes is None else nbytes,
+            meta=meta,
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            for alias in aliases:
+                self._aliases[alias] = key
+            self._evict(keep=key)
+        return entry
+
+    def set_alias(self, alias: str, key: str) -> None:
+        with self._lock:
+            if key not in self._entries:
+                raise KeyError(key)
+            self._aliases[alias] = key
+            self._evict()
+
+    def remove(self, key: str) -> Optional[CachedModel]:
+        """Drop ``key`` and any aliases that point at it."""
+        with self._lock:
+            self._aliases = {a: k for a, k in self._aliases.items() if k != key}
+            return self._entries.pop(key, None)
+
+    def aliases(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._aliases)
+
+    def entries(self) -> List[CachedModel]:
+        """Entries from least to most recently used."""
+        with self._lock:
+            return list(self._entries.values())
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        if self.max_bytes is None:
+            return
+        pinned = set(self._aliases.values())
+        if keep is not None:
+            pinned.add(keep)
+        total = self.total_bytes
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            if key in pinned:
+                continue
+            total -= self._entries.pop(key).nbytes
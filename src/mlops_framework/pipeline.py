@@ -5,23 +5,57 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict
 
+from .dag import DEFAULT_STEPS, run_steps
+from .scoring import score_file
+from .sweep import sweep
 from .train import train_demo
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["run"]
+__all__ = ["run", "score"]
 
 
 def run(config: Dict[str, Any] | None = None) -> Dict[str, float]:
     """Run the default demo pipeline.
 
-    Currently this is just train_demo but in the future could chain multiple
-    steps (data versioning, feature engineering, model registry, etc.).
+    By default this is just train_demo.
+
+    If ``config`` has a ``"steps"`` key the steps are executed by
+    :func:`mlops_framework.dag.run_steps`, which caches each step's output and
+    skips unchanged steps on rerun.  ``"steps": "default"`` selects
+    ``load -> split -> featurize -> train -> evaluate -> register``; other keys
+    of ``config`` (``cache_dir``, ``max_workers``, ``use_cache``) are passed
+    through, e.g.
+    ``{"steps": [{"name": "load", "params": {"source": "data.csv"}}, ...]}``.
+
+    If ``config`` has a ``"sweep"`` key its value is passed to
+    :func:`mlops_framework.sweep.sweep` instead, e.g.
+    ``{"sweep": {"space": {"C": [0.1, 1, 10]}, "mode": "grid"}}``.
     """
     config = config or {}
     logger.info("Starting demo pipeline with config=%s", config)
 
-    metrics = train_demo(**config)
+    if "steps" in config:
+        options = dict(config)
+        steps = options.pop("steps")
+        metrics = run_steps(DEFAULT_STEPS if steps == "default" else steps, **options)
+    elif "sweep" in config:
+        metrics = sweep(**config["sweep"])
+    else:
+        metrics = train_demo(**config)
 
     logger.info("Pipeline finished. Metrics: %s", metrics)
     return metrics
+
+
+def score(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Offline batch-scoring stage.
+
+    ``config`` holds the keyword arguments of
+    :func:`mlops_framework.scoring.score_file`; at least ``model``,
+    ``input_path`` and ``output_path``.
+    """
+    logger.info("Starting batch scoring with config=%s", config)
+    summary = score_file(**config)
+    logger.info("Batch scoring finished: %s", summary)
+    return summary
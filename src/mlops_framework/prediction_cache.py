@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+"""Memoization of single-row predictions.
+
+Retries and upstream fan-out send the same feature vector many times.
+:class:`PredictionCache` maps ``(model token, feature vector)`` to the
+probability row computed for it, so repeats are answered without touching the
+model.  The model token identifies one loaded model instance (cache key,
+version and load time); a hot swap therefore starts a fresh namespace, and
+:meth:`PredictionCache.invalidate` frees the entries of the replaced model.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ["PredictionCache"]
+
+
+class PredictionCache:
+    """Bounded LRU cache of probability rows.
+
+    Parameters
+    ----------
+    max_entries : Maximum number of cached feature vectors.
+    decimals : Round features to this many decimals before lookup, so
+        vectors that differ only by float noise share an entry (the cached
+        answer is the one computed for the first such vector).  ``None`` keys
+        on the exact values.
+    """
+
+    def __init__(self, max_entries: int = 10_000, decimals: Optional[int] = None) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, bytes], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, model_token: Hashable, row: Sequence[float]) -> Tuple[Hashable, bytes]:
+        values = np.asarray(row, dtype=np.float64)
+        if self.decimals is not None:
+            # + 0.0 folds -0.0 into 0.0 so both round to the same bytes.
+            values = np.round(values, self.decimals) + 0.0
+        return model_token, values.tobytes()
+
+    def get(self, model_token: Hashable, row: Sequence[float]) -> Optional[np.ndarray]:
+        key = self._key(model_token, row)
+        with self._lock:
+            proba = self._entries.get(key)
+            if proba is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return proba
+
+    def put(self, model_token: Hashable, row: Sequence[float], proba: Any) -> None:
+        key = self._key(model_token, row)
+        value = np.array(proba, dtype=np.float64)
+        value.setflags(write=False)  # shared between requests
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, match: Optional[Any] = None) -> int:
+        """Drop all entries, or those whose token satisfies ``match(token)``; return the count."""
+        with self._lock:
+            if match is None:
+                dropped = len(self._entries)
+                self._entries.clear()
+                return dropped
+            stale = [k for k in self._entries if match(k[0])]
+            for k in stale:
+                del self._entries[k]
+            return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "decimals": self.decimals,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+"""Model Registry helpers for serving ``models:/<name>/<stage>`` URIs.
+
+:class:`StageResolver` maps a registered model name and stage to its current
+version using the same ``MlflowClient.search_model_versions`` call as the
+serving API, caching the answer for ``ttl`` seconds.  :class:`PromotionWatcher`
+polls the resolver in a background thread and reports stage changes so the
+caller can preload the newly promoted version before switching traffic.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ModelVersionRef", "PromotionWatcher", "StageResolver", "parse_models_uri"]
+
+
+@dataclass(frozen=True)
+class ModelVersionRef:
+    name: str
+    version: str
+    run_id: str
+    stage: str  # the stage that was resolved, e.g. "Production" or "latest"
+
+
+def parse_models_uri(uri: str) -> Tuple[str, str]:
+    """Split ``models:/<name>/<stage-or-version>`` into ``(name, ref)``."""
+    if not uri.startswith("models:/"):
+        raise ValueError(f"Not a models:/ URI: {uri}")
+    name, _, ref = uri[len("models:/"):].strip("/").rpartition("/")
+    if not name or not ref:
+        raise ValueError(f"Expected models:/<name>/<stage or version>, got {uri}")
+    return name, ref
+
+
+class StageResolver:
+    """Resolve ``(name, stage)`` to the latest model version in that stage.
+
+    Parameters
+    ----------
+    ttl : Seconds a resolved version is reused before asking the registry again.
+    client_factory : Returns an ``MlflowClient``; defaults to ``MlflowClient()``.
+    """
+
+    def __init__(self, ttl: float = 30.0, client_factory: Optional[Callable[[], Any]] = None) -> None:
+        self.ttl = ttl
+        self._client_factory = client_factory
+        self._cache: Dict[Tuple[str, str], Tuple[float, ModelVersionRef]] = {}
+        self._lock = threading.Lock()
+
+    def _client(self) -> Any:
+        if self._client_factory is not None:
+            return self._client_factory()
+        from mlflow.tracking import MlflowClient
+
+        return MlflowClient()
+
+    def resolve(self, name: str, stage: str, refresh: bool = False) -> ModelVersionRef:
+        """Return the newest version of ``name`` in ``stage`` ("latest" for any stage)."""
+        cache_key = (name, stage.lower())
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(cache_key)
+        if hit is not None and not refresh and now - hit[0] < self.ttl:
+            return hit[1]
+
+        versions = self._client().search_model_versions(filter_string=f"name='{name}'")
+        if stage.lower() != "latest":
+            versions = [v for v in versions if (v.current_stage or "").lower() == stage.lower()]
+        if not versions:
+            raise LookupError(f"No version of model '{name}' in stage '{stage}'")
+        latest = max(versions, key=lambda v: int(v.version))
+        ref = ModelVersionRef(name=name, version=str(latest.version), run_id=latest.run_id, stage=stage)
+        with self._lock:
+            self._cache[cache_key] = (time.monotonic(), ref)
+        return ref
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Forget cached resolutions for ``name`` (or all models)."""
+        with self._lock:
+            if name is None:
+                self._cache.clear()
+            else:
+                for key in [k for k in self._cache if k[0] == name]:
+                    del self._cache[key]
+
+
+class PromotionWatcher:
+    """Poll watched ``(name, stage)`` pairs and report version changes.
+
+    Parameters
+    ----------
+    resolver : Resolver used for lookups; polling always bypasses its TTL.
+    on_change : Called as ``on_change(ref)`` when a stage points at a new
+        version.  It should load and warm the model before switching to it.
+    interval : Seconds between polls.
+    """
+
+    def __init__(
+        self,
+        resolver: StageResolver,
+        on_change: Callable[[ModelVersionRef], None],
+        interval: float = 30.0,
+    ) -> None:
+        self.resolver = resolver
+        self.on_change = on_change
+        self.interval = interval
+        self._current: Dict[Tuple[str, str], Optional[str]] = {}
+        self._lock = threading.Lock()
+        # Held for a whole poll, so the thread and an explicit check() never
+        # both see a new version and load it twice.
+        self._check_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, name: str, stage: str, version: Optional[str] = None) -> None:
+        """Start watching ``name``/``stage``, currently served at ``version``."""
+        with self._lock:
+            self._current[(name, stage)] = version
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="promotion-watcher", daemon=True)
+            self._thread.start()
+
+    def unwatch(self, name: str, stage: str) -> None:
+        with self._lock:
+            self._current.pop((name, stage), None)
+
+    def watched(self) -> Dict[str, Optional[str]]:
+        with self._lock:
+            return {f"models:/{n}/{s}": v for (n, s), v in self._current.items()}
+
+    def check(self) -> None:
+        """Poll every watched stage once and apply any changes.
+
+        Safe to call from any thread; concurrent calls run one after another.
+        """
+        with self._check_lock:
+            with self._lock:
+                targets = list(self._current.items())
+            for (name, stage), version in targets:
+                try:
+                    ref = self.resolver.resolve(name, stage, refresh=True)
+                    if ref.version == version:
+                        continue
+                    self.on_change(ref)
+                except Exception as exc:
+                    logger.warning("Promotion watcher failed for models:/%s/%s: %s", name, stage, exc)
+                    continue
+                with self._lock:
+                    if (name, stage) in self._current:
+                        self._current[(name, stage)] = ref.version
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
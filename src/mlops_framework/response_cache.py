@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+"""TTL cache for JSON-serialisable responses, with ETags for revalidation.
+
+Entries belong to a *scope* (e.g. ``"registry"`` or ``"runs"``) so that a
+write through the API can drop every cached read it may have made stale.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional
+
+__all__ = ["CacheEntry", "ResponseCache", "etag_matches"]
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: Any
+    etag: str
+    expires_at: float
+    scope: Optional[str] = None
+
+    def ttl_remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header against ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in {c[2:] if c.startswith("W/") else c for c in candidates}
+
+
+class ResponseCache:
+    """Thread-safe ``key -> CacheEntry`` map with per-entry TTL."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[Hashable, CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry
+
+    def set(self, key: Hashable, value: Any, ttl: float, scope: Optional[str] = None) -> CacheEntry:
+        body = json.dumps(value, sort_keys=True, default=str).encode()
+        entry = CacheEntry(
+            value=value,
+            etag='"' + hashlib.sha1(body).hexdigest() + '"',
+            expires_at=time.monotonic() + ttl,
+            scope=scope,
+        )
+        if ttl > 0:
+            with self._lock:
+                self._entries[key] = entry
+        return entry
+
+    def invalidate(self, scope: Optional[str] = None) -> None:
+        """Drop all entries in ``scope`` (or every entry)."""
+        with self._lock:
+            if scope is None:
+                self._entries.clear()
+            else:
+                self._entries = {k: e for k, e in self._entries.items() if e.scope != scope}
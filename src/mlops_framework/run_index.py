@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+"""SQLite index of the runs in a ``file:`` MLflow tracking store.
+
+On a file store, ``search_runs`` parses the ``meta.yaml`` and tag files of
+every run in the experiment on every call, so lookups slow down linearly as
+runs accumulate.  :class:`RunIndex` keeps run_id, name, status, start / end
+time, artifact URI and tags in SQLite.  Its indexes match the serving
+queries: the newest run by name pattern or tag, and the recent runs of an
+experiment.
+
+:meth:`RunIndex.refresh` is incremental.  An experiment directory is listed
+again only when its mtime changed, which happens when a run was created or
+removed.  New runs are read.  Runs that are still active, or finished within
+``settle_seconds``, are re-read when the mtimes of their ``meta.yaml`` or
+tag files changed.  The settle window catches tags such as ``model_name``
+that are set right after a run ends.  Refresh does not notice changes to
+long-finished runs, such as deleting or re-tagging them.  Instead,
+:meth:`RunIndex.search` checks the file mtimes of the runs it is about to
+return and re-reads the changed ones, so a deleted run is never returned.
+A run that starts to match only after such a change needs
+``refresh(full=True)``.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Set, Union
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DEFAULT_RUN_INDEX_DIR", "RunIndex"]
+
+DEFAULT_RUN_INDEX_DIR = Path(
+    os.getenv("MLOPS_RUN_INDEX_DIR", Path.home() / ".cache" / "mlops_framework" / "run_index")
+)
+
+# Bump when the schema changes; older index files are rebuilt.
+_INDEX_FORMAT = 1
+
+# mlflow.entities.RunStatus values as stored in a file store's meta.yaml
+_STATUS = {1: "RUNNING", 2: "SCHEDULED", 3: "FINISHED", 4: "FAILED", 5: "KILLED"}
+_UNSETTLED = ("RUNNING", "SCHEDULED")
+# File stores name run directories after uuid4().hex
+_RUN_DIR = re.compile(r"^[0-9a-f]{32}$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS experiments (
+    experiment_id TEXT PRIMARY KEY,
+    name TEXT,
+    lifecycle_stage TEXT,
+    dir_mtime_ns INTEGER
+);
+CREATE INDEX IF NOT EXISTS experiments_by_name ON experiments (name);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    experiment_id TEXT NOT NULL,
+    run_name TEXT,
+    status TEXT,
+    start_time INTEGER,
+    end_time INTEGER,
+    artifact_uri TEXT,
+    lifecycle_stage TEXT,
+    signature TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_start ON runs (experiment_id, start_time DESC);
+CREATE TABLE IF NOT EXISTS tags (
+    run_id TEXT,
+    key TEXT,
+    value TEXT,
+    PRIMARY KEY (run_id, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_by_value ON tags (key, value);
+"""
+
+_RUN_COLUMNS = ("run_id", "experiment_id", "run_name", "status", "start_time", "end_time", "artifact_uri")
+
+
+def _read_yaml(path: str) -> Optional[Dict[str, Any]]:
+    # PyYAML ships with mlflow; imported here to keep the serving import light.
+    import yaml
+
+    try:
+        with open(path) as fh:
+            return yaml.load(fh, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+    except FileNotFoundError:
+        return None
+
+
+def _signature(run_dir: str) -> Optional[str]:
+    """mtimes of ``meta.yaml`` and the newest tag file; None while meta.yaml is missing."""
+    try:
+        meta = os.stat(os.path.join(run_dir, "meta.yaml")).st_mtime_ns
+        newest = 0
+        for dirpath, _, filenames in os.walk(os.path.join(run_dir, "tags")):
+            newest = max([newest, os.stat(dirpath).st_mtime_ns,
+                          *(os.stat(os.path.join(dirpath, f)).st_mtime_ns for f in filenames)])
+    except FileNotFoundError:  # being created, or a tag was just deleted
+        return None
+    return f"{meta}:{newest}"
+
+
+def _read_tags(tags_dir: str) -> Dict[str, str]:
+    """Tag files of a run; keys containing ``/`` are nested directories."""
+    tags = {}
+    for dirpath, _, filenames in os.walk(tags_dir):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            key = os.path.relpath(path, tags_dir).replace(os.sep, "/")
+            try:
+                with open(path) as fh:
+                    tags[key] = fh.read()
+            except FileNotFoundError:
+                continue
+    return tags
+
+
+class RunIndex:
+    """Incrementally refreshed SQLite index of one file store.
+
+    Parameters
+    ----------
+    root : Tracking directory, i.e. the path of a ``file:`` tracking URI.
+    path : SQLite file; defaults to one per ``root`` under
+        ``MLOPS_RUN_INDEX_DIR``.  Several processes may share it.
+    settle_seconds : How long after a run ends it is still re-read on refresh.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        path: Union[str, Path, None] = None,
+        settle_seconds: float = 300.0,
+    ) -> None:
+        self.root = Path(root).resolve()
+        if path is None:
+            digest = hashlib.sha1(str(self.root).encode()).hexdigest()[:16]
+            path = DEFAULT_RUN_INDEX_DIR / f"{digest}.sqlite"
+        self.path = Path(path)
+        self.settle_seconds = settle_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # MLflow's LIKE is case-sensitive
+        self._conn.execute("PRAGMA case_sensitive_like=ON")
+        self._init_schema()
+
+    def _init_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'format'").fetchone()
+            if row is not None and int(row["value"]) == _INDEX_FORMAT:
+                return
+            for table in ("tags", "runs", "experiments"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('format', ?)", (str(_INDEX_FORMAT),))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ------------------------------------------------------------------ sync
+
+    def refresh(self, full: bool = False) -> int:
+        """Bring the index up to date with the store; return the number of runs read.
+
+        ``full`` re-reads every run, e.g. after long-finished runs were re-tagged.
+        """
+        now_ms = int(time.time() * 1000)
+        with self._lock, self._conn:
+            conn = self._conn
+            known = {r["experiment_id"]: r["dir_mtime_ns"] for r in conn.execute(
+                "SELECT experiment_id, dir_mtime_ns FROM experiments")}
+            to_read: Set[tuple] = set()
+            seen = set()
+            for entry in os.scandir(self.root):
+                if not entry.is_dir() or entry.name.startswith("."):
+                    continue
+                meta = _read_yaml(os.path.join(entry.path, "meta.yaml"))
+                if not meta or "name" not in meta or "experiment_id" not in meta:
+                    continue  # e.g. the model registry's "models" directory
+                experiment_id = str(meta["experiment_id"])
+                seen.add(experiment_id)
+                # stat before listing, so a run created in between is seen next time
+                mtime = entry.stat().st_mtime_ns
+                conn.execute(
+                    "INSERT INTO experiments VALUES (?, ?, ?, NULL) ON CONFLICT (experiment_id) "
+                    "DO UPDATE SET name = excluded.name, lifecycle_stage = excluded.lifecycle_stage",
+                    (experiment_id, meta["name"], meta.get("lifecycle_stage", "active")),
+                )
+                if not full and known.get(experiment_id) == mtime:
+                    continue
+                on_disk = {e.name for e in os.scandir(entry.path) if e.is_dir() and _RUN_DIR.match(e.name)}
+                indexed = {r[0] for r in conn.execute(
+                    "SELECT run_id FROM runs WHERE experiment_id = ?", (experiment_id,))}
+                self._delete_runs(indexed - on_disk)
+                to_read.update((experiment_id, run_id) for run_id in (on_disk if full else on_disk - indexed))
+                conn.execute(
+                    "UPDATE experiments SET dir_mtime_ns = ? WHERE experiment_id = ?", (mtime, experiment_id)
+                )
+
+            for experiment_id in set(known) - seen:
+                self._delete_runs(r[0] for r in conn.execute(
+                    "SELECT run_id FROM runs WHERE experiment_id = ?", (experiment_id,)))
+                conn.execute("DELETE FROM experiments WHERE experiment_id = ?", (experiment_id,))
+
+            settle_ms = now_ms - int(self.settle_seconds * 1000)
+            for experiment_id, run_id, signature in conn.execute(
+                "SELECT experiment_id, run_id, signature FROM runs WHERE status IS NULL OR status IN (?, ?) "
+                "OR end_time >= ?",
+                (*_UNSETTLED, settle_ms),
+            ).fetchall():
+                run_dir = os.path.join(self.root, experiment_id, run_id)
+                if signature is None or _signature(run_dir) != signature:
+                    to_read.add((experiment_id, run_id))
+            for experiment_id, run_id in to_read:
+                self._index_run(experiment_id, run_id)
+        if to_read:
+            logger.debug("Run index %s: read %d runs", self.path, len(to_read))
+        return len(to_read)
+
+    def _delete_runs(self, run_ids) -> None:
+        for run_id in list(run_ids):
+            self._conn.execute("DELETE FROM tags WHERE run_id = ?", (run_id,))
+            self._conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+
+    def _index_run(self, experiment_id: str, run_id: str) -> None:
+        run_dir = os.path.join(self.root, experiment_id, run_id)
+        if not os.path.isdir(run_dir):
+            self._delete_runs([run_id])
+            return
+        # Taken before reading, so a write in between triggers another read.
+        signature = _signature(run_dir)
+        meta = _read_yaml(os.path.join(run_dir, "meta.yaml")) or {}
+        tags = _read_tags(os.path.join(run_dir, "tags"))
+        status = meta.get("status")
+        # A run without meta.yaml is still being created: NULL fields keep it
+        # out of queries and queue it for the next refresh.
+        self._conn.execute(
+            "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                run_id,
+                experiment_id,
+                meta.get("run_name") or tags.get("mlflow.runName"),
+                _STATUS.get(status, status) if status is not None else None,
+                meta.get("start_time"),
+                meta.get("end_time"),
+                meta.get("artifact_uri"),
+                meta.get("lifecycle_stage"),
+                signature if meta else None,
+            ),
+        )
+        self._conn.execute("DELETE FROM tags WHERE run_id = ?", (run_id,))
+        self._conn.executemany("INSERT INTO tags VALUES (?, ?, ?)", [(run_id, k, v) for k, v in tags.items()])
+
+    # --------------------------------------------------------------- queries
+
+    def experiment_id(self, name: str) -> Optional[str]:
+        """Id of the active experiment called ``name``, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT experiment_id FROM experiments WHERE name = ? AND lifecycle_stage = 'active'", (name,)
+            ).fetchone()
+        return row["experiment_id"] if row else None
+
+    def search(
+        self,
+        experiment_name: str,
+        run_name_like: Optional[str] = None,
+        tags: Optional[Mapping[str, str]] = None,
+        max_results: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Active runs of an experiment, newest ``start_time`` first.
+
+        Runs whose files changed since they were indexed are re-read before
+        they are returned, so runs deleted or re-tagged after the settle
+        window drop out of the results without a full refresh.
+
+        Parameters
+        ----------
+        experiment_name : Experiment to search; unknown names give ``[]``.
+        run_name_like : SQL ``LIKE`` pattern on the run name, as in
+            ``attributes.run_name LIKE '%logreg_demo%'``.
+        tags : Exact tag values the runs must have.
+        max_results : Maximum number of runs returned.
+        """
+        experiment_id = self.experiment_id(experiment_name)
+        if experiment_id is None:
+            return []
+        sql = [
+            f"SELECT {', '.join(_RUN_COLUMNS)}, signature FROM runs r",
+            "WHERE experiment_id = ? AND lifecycle_stage = 'active'",
+        ]
+        args: List[Any] = [experiment_id]
+        if run_name_like is not None:
+            sql.append("AND run_name LIKE ?")
+            args.append(run_name_like)
+        for key, value in (tags or {}).items():
+            sql.append("AND EXISTS (SELECT 1 FROM tags t WHERE t.run_id = r.run_id AND t.key = ? AND t.value = ?)")
+            args.extend([key, value])
+        # Walks runs_by_start newest first and stops after max_results matches.
+        sql.append("ORDER BY start_time DESC LIMIT ?")
+        args.append(max_results)
+        with self._lock:
+            # A few passes at most: a run that keeps changing is returned as read.
+            for _ in range(3):
+                rows = self._conn.execute(" ".join(sql), args).fetchall()
+                stale = [
+                    row for row in rows
+                    if _signature(os.path.join(self.root, row["experiment_id"], row["run_id"])) != row["signature"]
+                ]
+                if not stale:
+                    break
+                with self._conn:
+                    for row in stale:
+                        self._index_run(row["experiment_id"], row["run_id"])
+        return [{key: row[key] for key in _RUN_COLUMNS} for row in rows]
+
+    def tags(self, run_id: str) -> Dict[str, str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM tags WHERE run_id = ?", (run_id,)).fetchall()
+        return {row["key"]: row["value"] for row in rows}
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+"""Lightweight NumPy scorers compiled from fitted scikit-learn models.
+
+For small linear models most of ``predict_proba`` latency is sklearn's input
+validation and dispatch rather than arithmetic.  ``compile_model`` extracts the
+fitted coefficients into a :class:`LinearScorer` that does only the matrix
+product and softmax, and falls back to the original estimator whenever the
+model is unsupported or the compiled output disagrees with sklearn.
+
+``score_file`` uses the same scorers for offline batch scoring of large
+CSV / Parquet files in worker processes.
+"""
+
+import logging
+import multiprocessing
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "LinearScorer",
+    "compile_model",
+    "load_local_model",
+    "resolve_model_uri",
+    "score_file",
+    "warmup_model",
+]
+
+
+class LinearScorer:
+    """NumPy-only ``predict_proba`` for a fitted logistic regression.
+
+    Parameters
+    ----------
+    coef, intercept : Fitted ``coef_`` (n_classes or 1, n_features) and ``intercept_``.
+    classes : Class labels in ``predict_proba`` column order.
+    multinomial : Softmax over classes if True, otherwise normalised one-vs-rest sigmoids.
+    """
+
+    def __init__(
+        self,
+        coef: np.ndarray,
+        intercept: np.ndarray,
+        classes: np.ndarray,
+        multinomial: bool = True,
+    ) -> None:
+        # Store the transpose contiguously so scoring is a single X @ W.
+        self.coef_T = np.ascontiguousarray(np.asarray(coef, dtype=np.float64).T)
+        self.intercept_ = np.ascontiguousarray(np.asarray(intercept, dtype=np.float64))
+        self.classes_ = np.asarray(classes)
+        self.multinomial = multinomial
+        self.n_features_in_ = self.coef_T.shape[0]
+
+    @classmethod
+    def from_arrays(
+        cls,
+        coef_T: np.ndarray,
+        intercept: np.ndarray,
+        classes: np.ndarray,
+        multinomial: bool = True,
+    ) -> "LinearScorer":
+        """Wrap already transposed float64 arrays without copying them.
+
+        Used for read-only memory maps shared between processes.
+        """
+        scorer = cls.__new__(cls)
+        scorer.coef_T = coef_T
+        scorer.intercept_ = intercept
+        scorer.classes_ = classes
+        scorer.multinomial = multinomial
+        scorer.n_features_in_ = coef_T.shape[0]
+        return scorer
+
+    @classmethod
+    def from_estimator(cls, model: Any) -> "LinearScorer":
+        """Build a scorer from a fitted ``LogisticRegression``."""
+        multi_class = getattr(model, "multi_class", "auto")
+        # Mirror LogisticRegression.predict_proba's choice of link function.
+        ovr = multi_class in ("ovr", "warn") or (
+            multi_class in ("auto", "deprecated")
+            and (len(model.classes_) <= 2 or model.solver == "liblinear")
+        )
+        return cls(model.coef_, model.intercept_, model.classes_, multinomial=not ovr)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        scores = np.asarray(X, dtype=np.float64) @ self.coef_T
+        scores += self.intercept_
+        return scores
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            # Binary models keep a single coefficient row for the positive class.
+            if self.multinomial:
+                scores = np.hstack([-scores, scores])
+            else:
+                np.negative(scores, out=scores)
+                np.exp(scores, out=scores)
+                scores += 1.0
+                np.reciprocal(scores, out=scores)
+                return np.hstack([1.0 - scores, scores])
+        if self.multinomial:
+            scores -= scores.max(axis=1, keepdims=True)
+            np.exp(scores, out=scores)
+        else:
+            np.negative(scores, out=scores)
+            np.exp(scores, out=scores)
+            scores += 1.0
+            np.reciprocal(scores, out=scores)
+        scores /= scores.sum(axis=1, keepdims=True)
+        return scores
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[np.argmax(scores, axis=1)]
+
+
+def compile_model(
+    model: Any,
+    sample: np.ndarray | None = None,
+    atol: float = 1e-6,
+) -> Any:
+    """Return a :class:`LinearScorer` for ``model`` or ``model`` unchanged.
+
+    Parameters
+    ----------
+    model : Fitted estimator.  Only ``LogisticRegression`` is compiled.
+    sample : Rows used for the parity check; synthetic rows if omitted.
+    atol : Maximum absolute difference from sklearn's ``predict_proba``.
+    """
+    from sklearn.linear_model import LogisticRegression
+
+    if type(model) is not LogisticRegression:
+        logger.info("compile_model: %s is not supported, keeping sklearn model", type(model).__name__)
+        return model
+
+    scorer = LinearScorer.from_estimator(model)
+    if sample is None:
+        rng = np.random.default_rng(0)
+        sample = rng.normal(scale=3.0, size=(64, scorer.n_features_in_))
+
+    # Compare on a plain float ndarray, which is what the serving path passes.
+    sample = np.asarray(sample, dtype=np.float64)
+    expected = model.predict_proba(sample)
+    actual = scorer.predict_proba(sample)
+    if expected.shape != actual.shape or not np.allclose(expected, actual, atol=atol, rtol=0):
+        logger.warning("compile_model: parity check failed, keeping sklearn model")
+        return model
+    return scorer
+
+
+def warmup_model(
+    model: Any,
+    n_features: int | None = None,
+    batch_sizes: tuple[int, ...] = (1, 8, 64),
+    rounds: int = 3,
+) -> None:
+    """Run ``predict_proba`` on synthetic rows so first real calls are warm.
+
+    This touches lazily initialised code paths and pages in the model's
+    arrays before the model starts serving traffic.
+    """
+    n_features = n_features or getattr(model, "n_features_in_", None)
+    if not n_features:
+        raise ValueError("n_features is required for models without n_features_in_")
+    rng = np.random.default_rng(0)
+    for size in batch_sizes:
+        X = rng.normal(size=(size, n_features))
+        for _ in range(rounds):
+            model.predict_proba(X)
+
+
+def resolve_model_uri(model: str) -> str:
+    """Accept a bare run_id as shorthand for ``runs:/<run_id>/model``."""
+    return model if ":/" in model or os.path.exists(model) else f"runs:/{model}/model"
+
+
+def load_local_model(path: Union[str, Path]) -> Any:
+    """Load a local MLflow sklearn model directory, skipping the mlflow import when possible.
+
+    Importing mlflow takes seconds, which dominates process cold start.  Models
+    saved with the pickle / cloudpickle serialization format are unpickled
+    directly from the file named in ``MLmodel``; anything else goes through
+    ``mlflow.sklearn.load_model``.
+    """
+    import pickle
+
+    import yaml
+
+    path = Path(path)
+    flavors = yaml.safe_load((path / "MLmodel").read_text()).get("flavors") or {}
+    sklearn_flavor = flavors.get("sklearn") or {}
+    if (
+        sklearn_flavor.get("serialization_format") in ("pickle", "cloudpickle")
+        and sklearn_flavor.get("pickled_model")
+        and not sklearn_flavor.get("code")
+    ):
+        with open(path / sklearn_flavor["pickled_model"], "rb") as fh:
+            return pickle.load(fh)
+
+    import mlflow.sklearn
+
+    return mlflow.sklearn.load_model(str(path))
+
+
+# Per-process model set by the pool initializer.
+_WORKER_MODEL: Dict[str, Any] = {}
+
+
+def _init_score_worker(model_uri: str, tracking_uri: str | None, compile_scorer: bool) -> None:
+    if os.path.isdir(model_uri):
+        model = load_local_model(model_uri)
+    else:
+        import mlflow
+        import mlflow.sklearn
+
+        if tracking_uri:
+            mlflow.set_tracking_uri(tracking_uri)
+        model = mlflow.sklearn.load_model(model_uri)
+    _WORKER_MODEL["model"] = compile_model(model) if compile_scorer else model
+
+
+def _model_classes() -> np.ndarray:
+    return _WORKER_MODEL["model"].classes_
+
+
+def _score_chunk(X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    model = _WORKER_MODEL["model"]
+    proba = model.predict_proba(X)
+    return model.classes_[np.argmax(proba, axis=1)], proba
+
+
+def score_file(
+    model: str,
+    input_path: Union[str, Path],
+    output_path: Union[str, Path],
+    chunk_size: int = 100_000,
+    workers: int | None = None,
+    feature_columns: Sequence[str] | None = None,
+    id_columns: Sequence[str] = (),
+    compile_scorer: bool = True,
+    mlflow_tracking_uri: str | None = None,
+) -> Dict[str, Any]:
+    """Score a CSV / Parquet file in chunks and write predictions to Parquet.
+
+    Each worker process loads the model once.  At most ``2 * workers`` chunks
+    are in flight and results are written in input order as they complete,
+    so memory stays bounded regardless of the input size.
+
+    Parameters
+    ----------
+    model : run_id, ``runs:/`` / ``models:/`` URI or local model path.
+    input_path, output_path : Input table and output Parquet file.
+    chunk_size : Rows per chunk.
+    workers : Scoring processes; defaults to all cores.
+    feature_columns : Model inputs; defaults to every column not in ``id_columns``.
+    id_columns : Input columns copied to the output next to the predictions.
+    compile_scorer : Use :func:`compile_model` in the workers.
+
+    An input without rows still produces ``output_path``: an empty table with
+    the id, ``prediction`` and ``proba_<class>`` columns.
+
+    Returns
+    -------
+    dict with the number of rows and chunks written
+    """
+    import mlflow
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from concurrent.futures import ProcessPoolExecutor
+
+    from .data import iter_frames
+
+    if mlflow_tracking_uri:
+        mlflow.set_tracking_uri(mlflow_tracking_uri)
+    workers = workers or os.cpu_count() or 1
+    model_uri = resolve_model_uri(model)
+
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_score_worker,
+        initargs=(model_uri, mlflow.get_tracking_uri(), compile_scorer),
+    )
+    pending: deque = deque()
+    writer = None
+    rows = chunks = 0
+
+    def _table(ids: List[tuple], labels: np.ndarray, proba: np.ndarray) -> "pa.Table":
+        columns: Dict[str, Any] = dict(ids)
+        columns["prediction"] = labels
+        for i, cls in enumerate(classes):
+            columns[f"proba_{cls}"] = proba[:, i]
+        return pa.table(columns)
+
+    def _write(table: "pa.Table") -> None:
+        nonlocal writer
+        if writer is None:
+            writer = pq.ParquetWriter(str(output_path), table.schema)
+        writer.write_table(table)
+
+    def _write_next() -> None:
+        nonlocal rows, chunks
+        ids, future = pending.popleft()
+        labels, proba = future.result()
+        _write(_table(ids, labels, proba))
+        rows += len(labels)
+        chunks += 1
+
+    try:
+        with pool:
+            # The output columns come from a worker's copy of the model, so
+            # the parent never loads it.
+            classes = pool.submit(_model_classes).result()
+            empty_ids = [(c, pa.array([], type=pa.null())) for c in id_columns]
+            for df in iter_frames(input_path, chunk_size):
+                ids = [(c, df[c].to_numpy()) for c in id_columns]
+                if df.empty:
+                    empty_ids = ids  # keeps the id dtypes for an all-empty input
+                    continue
+                features: List[str] = list(feature_columns or [c for c in df.columns if c not in id_columns])
+                X = df[features].to_numpy(dtype=np.float64)
+                pending.append((ids, pool.submit(_score_chunk, X)))
+                if len(pending) >= 2 * workers:
+                    _write_next()
+            while pending:
+                _write_next()
+        if writer is None:
+            _write(_table(empty_ids, classes[:0], np.empty((0, len(classes)))))
+    finally:
+        if writer is not None:
+            writer.close()
+
+    logger.info("Scored %d rows in %d chunks to %s", rows, chunks, output_path)
+    return {"rows": rows, "chunks": chunks, "output_path": str(output_path)}
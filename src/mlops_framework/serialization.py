@@ -0,0 +1,296 @@
+from __future__ import annotations
+
+"""Fast request decoding and response encoding for inference endpoints.
+
+Internal high-volume callers can skip per-row JSON objects entirely:
+
+* ``application/octet-stream``: raw little-endian float32 / float64 rows
+  (``; dtype=float32`` in the content type, default float64);
+* ``application/msgpack``: rows, ``{"rows": rows}`` or one array per feature;
+* ``application/json``: the same shapes as msgpack.
+
+Responses are compact arrays in the negotiated format.  ``orjson`` and
+``msgpack`` are optional: JSON falls back to the standard library and msgpack
+requests fail with :class:`UnsupportedFormat` when it is not installed.
+
+For streaming, :class:`NDJSONReader` splits an NDJSON body into lines as it
+arrives.  :func:`decode_ndjson_rows` and :func:`encode_ndjson_predictions`
+convert one chunk of lines at a time.
+"""
+
+import json
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+__all__ = [
+    "HAVE_MSGPACK",
+    "HAVE_ORJSON",
+    "NDJSONReader",
+    "UnsupportedFormat",
+    "decode_features",
+    "decode_ndjson_rows",
+    "dumps_json",
+    "encode_ndjson_predictions",
+    "encode_predictions",
+    "loads_json",
+    "negotiate",
+]
+
+HAVE_ORJSON = orjson is not None
+HAVE_MSGPACK = msgpack is not None
+
+OCTET_STREAM = "application/octet-stream"
+MSGPACK = "application/msgpack"
+JSON = "application/json"
+NDJSON = "application/x-ndjson"
+
+_DTYPES = {"float32": np.dtype("<f4"), "float64": np.dtype("<f8")}
+
+
+class UnsupportedFormat(ValueError):
+    """Raised for media types that are unknown or need a missing optional package."""
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _finite(obj: Any) -> Any:
+    """Copy of ``obj`` with NaN / infinity replaced by None, as orjson writes them."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        obj = obj.tolist()
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {k: _finite(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(v) for v in obj]
+    return obj
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes; NumPy arrays are encoded natively with orjson.
+
+    Non-finite floats become ``null`` with or without orjson, so the output is
+    always valid JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    try:
+        return json.dumps(obj, separators=(",", ":"), default=_json_default, allow_nan=False).encode()
+    except ValueError:
+        # Rare: only payloads that contain NaN / infinity pay for the copy
+        return json.dumps(_finite(obj), separators=(",", ":"), default=_json_default, allow_nan=False).encode()
+
+
+def loads_json(body: bytes) -> Any:
+    return orjson.loads(body) if orjson is not None else json.loads(body)
+
+
+def _media_type(header: Optional[str]) -> Tuple[str, Dict[str, str]]:
+    """Split ``type/subtype; key=value`` into the lower-cased type and its parameters."""
+    parts = [p.strip() for p in (header or "").split(";")]
+    params = {}
+    for part in parts[1:]:
+        key, _, value = part.partition("=")
+        params[key.strip().lower()] = value.strip().strip('"').lower()
+    return parts[0].lower(), params
+
+
+def _dtype(params: Dict[str, str], default: str = "float64") -> np.dtype:
+    name = params.get("dtype", default)
+    if name not in _DTYPES:
+        raise ValueError(f"Unsupported dtype {name!r}; use float32 or float64")
+    return _DTYPES[name]
+
+
+def negotiate(accept: Optional[str], default: str = JSON) -> Tuple[str, Dict[str, str]]:
+    """Pick the response format from an ``Accept`` header (first supported type wins)."""
+    for candidate in (accept or "").split(","):
+        media_type, params = _media_type(candidate)
+        if media_type in (OCTET_STREAM, JSON):
+            return media_type, params
+        if media_type in (MSGPACK, "application/x-msgpack"):
+            if msgpack is None:
+                raise UnsupportedFormat("msgpack responses need the 'msgpack' package")
+            return MSGPACK, params
+    return default, {}
+
+
+def decode_features(
+    body: bytes,
+    content_type: Optional[str],
+    feature_names: Sequence[str],
+    n_features: Optional[int] = None,
+) -> np.ndarray:
+    """Decode a request body into a ``(rows, n_features)`` float array.
+
+    Raw bodies are read with ``np.frombuffer`` (no copy); ``n_features``
+    defaults to ``len(feature_names)``.
+    """
+    n_features = n_features or len(feature_names)
+    media_type, params = _media_type(content_type)
+    if media_type == OCTET_STREAM:
+        dtype = _dtype(params)
+        if len(body) % (dtype.itemsize * n_features):
+            raise ValueError(f"Body length {len(body)} is not a multiple of {n_features} {dtype.name} values")
+        return np.frombuffer(body, dtype=dtype).reshape(-1, n_features)
+
+    if media_type in (MSGPACK, "application/x-msgpack"):
+        if msgpack is None:
+            raise UnsupportedFormat("msgpack requests need the 'msgpack' package")
+        payload = msgpack.unpackb(body)
+    elif media_type in (JSON, ""):
+        payload = loads_json(body)
+    else:
+        raise UnsupportedFormat(f"Unsupported content type {media_type!r}")
+
+    if isinstance(payload, dict) and "rows" in payload:
+        payload = payload["rows"]
+    if isinstance(payload, dict):
+        missing = [name for name in feature_names if name not in payload]
+        if missing:
+            raise ValueError(f"Missing feature columns: {', '.join(missing)}")
+        columns = [np.asarray(payload[name], dtype=np.float64) for name in feature_names]
+        if len({len(col) for col in columns}) != 1:
+            raise ValueError("Feature columns must have equal length")
+        return np.column_stack(columns)
+    X = np.asarray(payload, dtype=np.float64)
+    if X.size == 0:
+        return X.reshape(0, n_features)
+    if X.ndim != 2 or X.shape[1] != n_features:
+        raise ValueError(f"Expected rows of {n_features} features, got shape {X.shape}")
+    return X
+
+
+def encode_predictions(
+    labels: np.ndarray,
+    probabilities: np.ndarray,
+    class_names: Sequence[str],
+    model_version: Optional[str],
+    media_type: str = JSON,
+    params: Optional[Dict[str, str]] = None,
+) -> Tuple[bytes, Dict[str, str]]:
+    """Encode predictions as ``(body, headers)`` for ``media_type``.
+
+    Raw responses hold only the probability matrix (rows x classes,
+    little-endian ``dtype``); class names, shape and model version travel in
+    ``X-`` headers.  JSON and msgpack carry compact arrays.
+    """
+    if media_type == OCTET_STREAM:
+        dtype = _dtype(params or {})
+        body = np.ascontiguousarray(probabilities, dtype=dtype).tobytes()
+        headers = {
+            "Content-Type": f"{OCTET_STREAM}; dtype={dtype.name}",
+            "X-Shape": f"{probabilities.shape[0]},{probabilities.shape[1]}",
+            "X-Class-Names": ",".join(class_names),
+            "X-Model-Version": str(model_version),
+        }
+        return body, headers
+
+    # orjson encodes float arrays natively; msgpack and the stdlib need lists.
+    native = HAVE_ORJSON and media_type == JSON
+    payload = {
+        "predictions": labels.tolist(),
+        "probabilities": np.ascontiguousarray(probabilities) if native else probabilities.tolist(),
+        "class_names": list(class_names),
+        "model_version": model_version,
+    }
+    if media_type == MSGPACK:
+        return msgpack.packb(payload), {"Content-Type": MSGPACK}
+    return dumps_json(payload), {"Content-Type": JSON}
+
+
+class NDJSONReader:
+    """Split an NDJSON body into complete lines as it arrives.
+
+    Parameters
+    ----------
+    max_line_bytes : Longest accepted line; bounds the bytes held for a line
+        whose newline has not arrived yet.
+    """
+
+    def __init__(self, max_line_bytes: int = 1 << 20) -> None:
+        self.max_line_bytes = max_line_bytes
+        self._partial = b""
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Non-blank lines completed by ``data``."""
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        if len(self._partial) > self.max_line_bytes:
+            raise ValueError(f"NDJSON line exceeds {self.max_line_bytes} bytes")
+        return [line for line in lines if line.strip()]
+
+    def close(self) -> List[bytes]:
+        """The last line when the body does not end with a newline."""
+        rest, self._partial = self._partial, b""
+        return [rest] if rest.strip() else []
+
+
+def decode_ndjson_rows(
+    lines: Sequence[bytes],
+    feature_names: Sequence[str],
+    n_features: Optional[int] = None,
+    offset: int = 0,
+) -> np.ndarray:
+    """Decode NDJSON lines into a ``(rows, n_features)`` float array.
+
+    Each line is a feature array or an object keyed by ``feature_names``.
+    ``offset`` is the index of the first line in the stream, used in errors.
+    """
+    n_features = n_features or len(feature_names)
+    if not lines:
+        return np.empty((0, n_features))
+    # Fast path: array rows parsed as one JSON document.
+    try:
+        values = loads_json(b"[" + b",".join(lines) + b"]")
+        if len(values) == len(lines) and all(isinstance(v, list) for v in values):
+            X = np.asarray(values, dtype=np.float64)
+            if X.ndim == 2 and X.shape[1] == n_features:
+                return X
+    except (TypeError, ValueError):
+        pass
+
+    # Object rows, or an error to report with its row number.
+    rows = []
+    for i, line in enumerate(lines):
+        try:
+            value = loads_json(line)
+            if isinstance(value, dict):
+                value = [value[name] for name in feature_names]
+            if len(value) != n_features:
+                raise ValueError(f"expected {n_features} features, got {len(value)}")
+            rows.append(value)
+        except (KeyError, TypeError, ValueError) as exc:
+            detail = f"missing feature {exc}" if isinstance(exc, KeyError) else str(exc)
+            raise ValueError(f"Row {offset + i}: {detail}") from None
+    try:
+        return np.asarray(rows, dtype=np.float64).reshape(-1, n_features)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Rows {offset}-{offset + len(lines) - 1}: {exc}") from None
+
+
+def encode_ndjson_predictions(labels: np.ndarray, probabilities: np.ndarray, class_names: Sequence[str]) -> bytes:
+    """One ``{"prediction": ..., "probabilities": {class: p}}`` line per row, as ``/predict`` returns."""
+    names = list(class_names)
+    return b"".join(
+        dumps_json({"prediction": label, "probabilities": dict(zip(names, row))}) + b"\n"
+        for label, row in zip(labels.tolist(), probabilities.tolist())
+    )
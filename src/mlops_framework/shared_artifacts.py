@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+"""Native model artifacts shared read-only between server workers.
+
+``mlflow.sklearn.load_model`` unpickles a private copy of the model in every
+worker process.  :func:`export_scorer` instead writes the coefficients of a
+compiled :class:`~mlops_framework.scoring.LinearScorer` as ``.npy`` files that
+:func:`load_shared_scorer` memory-maps read-only, so all workers on a node
+share one copy through the page cache.
+
+Layout under the artifact root::
+
+    versions/<version>/coef_T.npy, intercept.npy, classes.npy, meta.json
+    CURRENT            # name of the version workers should serve
+
+Both the version directory and ``CURRENT`` are replaced atomically.
+:class:`ArtifactWatcher` polls ``CURRENT`` so every worker switches to a newly
+exported version within one poll interval.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+import numpy as np
+
+from .scoring import LinearScorer, compile_model, load_local_model, resolve_model_uri
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["ArtifactWatcher", "current_version", "export_model", "export_scorer", "load_shared_scorer"]
+
+_FORMAT = 1
+_ARRAYS = ("coef_T", "intercept", "classes")
+
+
+def _safe_version(version: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in version)
+
+
+def current_version(root: Union[str, Path]) -> Optional[str]:
+    """Version named by ``<root>/CURRENT``, or None before the first export."""
+    try:
+        return (Path(root) / "CURRENT").read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def export_scorer(
+    model: Any,
+    root: Union[str, Path],
+    version: str,
+    activate: bool = True,
+    keep: int = 3,
+) -> Path:
+    """Write ``model`` as a memory-mappable artifact and optionally make it current.
+
+    Parameters
+    ----------
+    model : Fitted ``LogisticRegression`` or :class:`LinearScorer`.
+    root : Artifact root shared by the workers (``SERVING_SHARED_ARTIFACT_DIR``).
+    version : Version name, e.g. the MLflow run_id.
+    activate : Point ``CURRENT`` at the new version.
+    keep : Number of most recent versions to keep (the current one is never removed).
+
+    Returns
+    -------
+    Path of the version directory
+    """
+    scorer = model if isinstance(model, LinearScorer) else compile_model(model)
+    if not isinstance(scorer, LinearScorer):
+        raise ValueError(f"{type(model).__name__} cannot be exported as a shared linear scorer")
+
+    root = Path(root)
+    version = _safe_version(version)
+    versions = root / "versions"
+    versions.mkdir(parents=True, exist_ok=True)
+    classes = scorer.classes_
+    if classes.dtype == object:
+        # Python objects cannot be memory-mapped.
+        classes = classes.astype(str)
+
+    tmp = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=versions))
+    arrays = {"coef_T": scorer.coef_T, "intercept": scorer.intercept_, "classes": classes}
+    for name, arr in arrays.items():
+        np.save(tmp / f"{name}.npy", np.ascontiguousarray(arr))
+    (tmp / "meta.json").write_text(json.dumps({
+        "version": version,
+        "multinomial": scorer.multinomial,
+        "n_features": scorer.n_features_in_,
+        "created_at": time.time(),
+        "format": _FORMAT,
+    }))
+    target = versions / version
+    if target.exists():
+        shutil.rmtree(target)
+    os.replace(tmp, target)
+
+    if activate:
+        fd, pointer = tempfile.mkstemp(prefix=".CURRENT-", dir=root)
+        with os.fdopen(fd, "w") as fh:
+            fh.write(version)
+        os.replace(pointer, root / "CURRENT")
+    _prune(versions, keep, current_version(root))
+    logger.info("Exported %s to %s", version, target)
+    return target
+
+
+def export_model(
+    model: str,
+    root: Union[str, Path],
+    version: Optional[str] = None,
+    mlflow_tracking_uri: Optional[str] = None,
+    keep: int = 3,
+) -> Path:
+    """Load an MLflow model and export it with :func:`export_scorer`.
+
+    ``model`` is a run_id, ``runs:/`` or ``models:/`` URI or a local model
+    directory.  ``version`` defaults to a timestamp plus the model reference,
+    so re-exporting a moving stage always produces a new version.
+    """
+    if os.path.isdir(model):
+        loaded = load_local_model(model)
+    else:
+        import mlflow
+        import mlflow.sklearn
+
+        if mlflow_tracking_uri:
+            mlflow.set_tracking_uri(mlflow_tracking_uri)
+        loaded = mlflow.sklearn.load_model(resolve_model_uri(model))
+    if version is None:
+        version = f"{time.strftime('%Y%m%dT%H%M%S')}-{_safe_version(model)[-48:]}"
+    return export_scorer(loaded, root, version, keep=keep)
+
+
+def _prune(versions: Path, keep: int, current: Optional[str]) -> None:
+    # Workers that still map a removed version keep their pages until they swap.
+    complete = [p for p in versions.iterdir() if p.is_dir() and (p / "meta.json").exists()]
+    complete.sort(key=lambda p: (p / "meta.json").stat().st_mtime, reverse=True)
+    for old in complete[max(keep, 1):]:
+        if old.name != current:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def load_shared_scorer(root: Union[str, Path], version: Optional[str] = None) -> LinearScorer:
+    """Memory-map an exported version (the current one by default) read-only."""
+    version = version or current_version(root)
+    if version is None:
+        raise FileNotFoundError(f"No shared artifact has been exported to {root}")
+    path = Path(root) / "versions" / _safe_version(version)
+    meta = json.loads((path / "meta.json").read_text())
+    if meta.get("format") != _FORMAT:
+        raise ValueError(f"Unsupported shared artifact format {meta.get('format')} in {path}")
+    coef_T, intercept, classes = (np.load(path / f"{name}.npy", mmap_mode="r") for name in _ARRAYS)
+    return LinearScorer.from_arrays(coef_T, intercept, classes, multinomial=meta["multinomial"])
+
+
+class ArtifactWatcher:
+    """Poll ``<root>/CURRENT`` and call ``on_change(version)`` when it changes.
+
+    Parameters
+    ----------
+    root : Artifact root.
+    on_change : Loads and swaps in the new version; called from the watcher thread.
+    interval : Seconds between polls.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        on_change: Callable[[str], None],
+        interval: float = 2.0,
+    ) -> None:
+        self.root = Path(root)
+        self.on_change = on_change
+        self.interval = interval
+        self.version: Optional[str] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, version: Optional[str] = None) -> None:
+        """Start polling; ``version`` is the one already being served."""
+        self.version = version
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="artifact-watcher", daemon=True)
+            self._thread.start()
+
+    def check(self) -> None:
+        version = current_version(self.root)
+        if version is None or version == self.version:
+            return
+        try:
+            self.on_change(version)
+        except Exception as exc:
+            logger.warning("Shared artifact watcher failed to load %s: %s", version, exc)
+            return
+        self.version = version
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
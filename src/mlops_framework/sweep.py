@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+"""Parallel hyper-parameter sweeps for the demo logistic regression.
+
+The dataset is loaded once in the parent and shipped to each worker process
+once (through the pool initializer), after which trials only exchange their
+parameters and metrics.  Every trial is logged as a nested MLflow run under a
+single parent ``sweep`` run.  With ``halving=True`` configurations are
+evaluated with a growing ``max_iter`` budget and only the best ``1/eta`` of
+each rung is promoted, so weak configurations stop early.
+"""
+
+import itertools
+import logging
+import math
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Sequence, Tuple
+
+import mlflow
+
+from .data import load_dataset, load_demo_iris
+from .profiling import StageTimer
+from .tracking import RunLogger
+from .train import fit_and_evaluate
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["sample_space", "sweep"]
+
+# Per-process state set by the pool initializer.
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def sample_space(
+    space: Dict[str, Any],
+    mode: str = "grid",
+    n_trials: int | None = None,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Expand a search space into a list of parameter dicts.
+
+    Each value in ``space`` is either a list of choices or, for random search
+    only, a ``{"low": .., "high": .., "log": bool}`` range (ints stay ints).
+    Grid mode takes the cartesian product; random mode draws ``n_trials``.
+    """
+    if mode == "grid":
+        names = list(space)
+        for name in names:
+            if not isinstance(space[name], (list, tuple)):
+                raise ValueError(f"Grid search needs a list of values for '{name}'")
+        grid = [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+        return grid[:n_trials] if n_trials else grid
+    if mode != "random":
+        raise ValueError(f"Unknown sweep mode: {mode}")
+
+    rng = random.Random(seed)
+    trials = []
+    for _ in range(n_trials or 10):
+        params = {}
+        for name, spec in space.items():
+            if isinstance(spec, dict):
+                low, high = spec["low"], spec["high"]
+                if spec.get("log"):
+                    value = math.exp(rng.uniform(math.log(low), math.log(high)))
+                else:
+                    value = rng.uniform(low, high)
+                params[name] = int(round(value)) if isinstance(low, int) and isinstance(high, int) else value
+            else:
+                params[name] = rng.choice(list(spec))
+        trials.append(params)
+    return trials
+
+
+def _init_worker(data: Tuple[Any, Any, Any, Any], tracking_uri: str | None) -> None:
+    _WORKER_STATE["data"] = data
+    if tracking_uri:
+        mlflow.set_tracking_uri(tracking_uri)
+
+
+def _run_trial(
+    params: Dict[str, Any],
+    parent_run_id: str,
+    experiment_id: str,
+    trial: int,
+    rung: int | None = None,
+) -> Dict[str, Any]:
+    """Fit one configuration and log it as a child of ``parent_run_id``."""
+    X_train, y_train, X_test, y_test = _WORKER_STATE["data"]
+    tags = {"mlflow.parentRunId": parent_run_id, "trial": str(trial)}
+    if rung is not None:
+        tags["rung"] = str(rung)
+    with mlflow.start_run(
+        run_name=f"trial_{trial}" if rung is None else f"trial_{trial}_rung_{rung}",
+        experiment_id=experiment_id,
+        tags=tags,
+    ) as run, RunLogger(run.info.run_id) as tracker:
+        timer = StageTimer()
+        with timer.stage("trial"):
+            _, metrics = fit_and_evaluate(X_train, y_train, X_test, y_test, **params)
+        tracker.log_params(params)
+        tracker.log_metrics(metrics)
+        tracker.log_metrics(timer.metrics())
+    return {"trial": trial, "rung": rung, "params": params, "metrics": metrics, "run_id": run.info.run_id}
+
+
+def _score(result: Dict[str, Any], metric: str) -> float:
+    return result["metrics"][metric]
+
+
+def sweep(
+    space: Dict[str, Any],
+    mode: str = "grid",
+    n_trials: int | None = None,
+    max_workers: int | None = None,
+    halving: bool = False,
+    eta: int = 3,
+    min_iter: int = 10,
+    metric: str = "accuracy",
+    seed: int = 0,
+    mlflow_tracking_uri: str | None = None,
+    data_source: str | None = None,
+    target: str = "target",
+) -> Dict[str, Any]:
+    """Run a hyper-parameter sweep over ``space`` in a process pool.
+
+    Parameters
+    ----------
+    space : Search space for ``fit_and_evaluate`` kwargs, e.g.
+        ``{"C": [0.1, 1, 10], "max_iter": [100, 200]}``.
+    mode : ``"grid"`` or ``"random"``; see :func:`sample_space`.
+    n_trials : Number of random draws (or a cap on the grid size).
+    max_workers : Worker processes; defaults to all cores.
+    halving : Successive halving over ``max_iter``.  The budget starts at
+        ``min_iter`` and grows by ``eta`` per rung up to the largest
+        ``max_iter`` in the space (or 200); the top ``1/eta`` survive each rung.
+        ``max_iter`` is the budget, not a dimension: configurations that
+        differ only in it are run once.
+    metric : Metric to maximise.
+    data_source, target : Optional CSV / Parquet input, see ``load_dataset``.
+
+    The parent run logs ``stage_load_seconds`` and ``stage_trials_seconds``
+    (wall time of the whole pool, including worker start-up); each trial run
+    logs ``stage_trial_seconds``.
+
+    Returns
+    -------
+    dict with the parent ``run_id``, ``best`` trial and all ``trials``
+    """
+    if mlflow_tracking_uri:
+        mlflow.set_tracking_uri(mlflow_tracking_uri)
+    experiment = mlflow.set_experiment("iris-demo")
+
+    configs = sample_space(space, mode=mode, n_trials=n_trials, seed=seed)
+    if halving:
+        unique: Dict[str, Dict[str, Any]] = {}
+        for params in configs:
+            params = {k: v for k, v in params.items() if k != "max_iter"}
+            unique.setdefault(repr(sorted(params.items())), params)
+        configs = list(unique.values())
+    if not configs:
+        raise ValueError("Search space is empty")
+    max_workers = max_workers or os.cpu_count() or 1
+    timer = StageTimer()
+    with timer:
+        with timer.stage("load"):
+            data = load_dataset(data_source, target=target) if data_source else load_demo_iris()
+
+    with mlflow.start_run(run_name="sweep") as parent, RunLogger(parent.info.run_id) as tracker:
+        tracker.log_params({"mode": mode, "n_configs": len(configs), "halving": halving})
+        pool = ProcessPoolExecutor(
+            max_workers=min(max_workers, len(configs)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(data, mlflow.get_tracking_uri()),
+        )
+
+        def submit(params: Dict[str, Any], trial: int, rung: int | None = None):
+            return pool.submit(_run_trial, params, parent.info.run_id, experiment.experiment_id, trial, rung)
+
+        with timer, timer.stage("trials"), pool:
+            if halving:
+                results = _successive_halving(submit, configs, space, eta, min_iter, metric)
+            else:
+                futures = [submit(params, i) for i, params in enumerate(configs)]
+                results = [f.result() for f in futures]
+        tracker.log_metrics(timer.metrics())
+
+        # With halving only the last rung ran at the full budget.
+        final = [r for r in results if r["rung"] == results[-1]["rung"]]
+        best = max(final, key=lambda r: _score(r, metric))
+        tracker.log_metrics({f"best_{k}": v for k, v in best["metrics"].items()})
+        tracker.log_params({f"best_{k}": v for k, v in best["params"].items()})
+        tracker.set_tags({"best_run_id": best["run_id"]})
+
+    logger.info("Sweep finished: best %s=%.4f with %s", metric, _score(best, metric), best["params"])
+    return {"run_id": parent.info.run_id, "best": best, "trials": results}
+
+
+def _successive_halving(
+    submit: Any,
+    configs: Sequence[Dict[str, Any]],
+    space: Dict[str, Any],
+    eta: int,
+    min_iter: int,
+    metric: str,
+) -> List[Dict[str, Any]]:
+    choices = space.get("max_iter")
+    max_iter = max(choices) if isinstance(choices, (list, tuple)) else 200
+    survivors = list(enumerate(configs))
+    results: List[Dict[str, Any]] = []
+    rung, budget = 0, min(min_iter, max_iter)
+    while True:
+        futures = [submit({**params, "max_iter": budget}, trial, rung) for trial, params in survivors]
+        rung_results = [f.result() for f in futures]
+        results.extend(rung_results)
+        if budget >= max_iter or len(survivors) <= 1:
+            return results
+        keep = max(len(survivors) // eta, 1)
+        ranked = sorted(rung_results, key=lambda r: _score(r, metric), reverse=True)[:keep]
+        kept = {r["trial"] for r in ranked}
+        survivors = [(trial, params) for trial, params in survivors if trial in kept]
+        # A lone survivor goes straight to the full budget.
+        budget = max_iter if len(survivors) == 1 else min(budget * eta, max_iter)
+        rung += 1
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+"""Batched, asynchronous MLflow logging.
+
+Every fluent ``mlflow.log_*`` call is a round trip to the tracking server.
+:class:`RunLogger` buffers params, metrics and tags and sends them with
+``MlflowClient.log_batch``.  Artifact uploads run on a background thread, and
+:meth:`RunLogger.close` is the barrier that flushes the buffer and waits for
+the uploads to finish.
+"""
+
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+__all__ = ["RunLogger"]
+
+# Per-request limits of the MLflow log_batch REST API.
+_MAX_METRICS_PER_BATCH = 1000
+_MAX_PARAMS_PER_BATCH = 100
+_MAX_TAGS_PER_BATCH = 100
+
+
+class RunLogger:
+    """Buffer logging calls for one MLflow run.
+
+    Parameters
+    ----------
+    run_id : Run to log to.
+    client : ``MlflowClient``; a new one is created if omitted.
+
+    Use as a context manager so the final flush always happens::
+
+        with mlflow.start_run() as run, RunLogger(run.info.run_id) as tracker:
+            tracker.log_params({"C": 1.0})
+            tracker.log_model(model, "model")
+    """
+
+    def __init__(self, run_id: str, client: Any = None) -> None:
+        if client is None:
+            from mlflow.tracking import MlflowClient
+
+            client = MlflowClient()
+        self.run_id = run_id
+        self.client = client
+        self._params: Dict[str, Any] = {}
+        self._tags: Dict[str, Any] = {}
+        self._metrics: List[Any] = []
+        self._uploads: List[Future] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Wall time of background uploads, filled in on the upload thread.
+        self.timings: Dict[str, float] = {}
+
+    def __enter__(self) -> "RunLogger":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close(raise_errors=exc_type is None)
+
+    def log_params(self, params: Dict[str, Any]) -> None:
+        self._params.update(params)
+
+    def set_tags(self, tags: Dict[str, Any]) -> None:
+        self._tags.update(tags)
+
+    def log_metrics(self, metrics: Dict[str, float], step: int = 0) -> None:
+        from mlflow.entities import Metric
+
+        timestamp = int(time.time() * 1000)
+        self._metrics.extend(Metric(k, float(v), timestamp, step) for k, v in metrics.items())
+
+    def flush(self) -> None:
+        """Send buffered params, metrics and tags with as few ``log_batch`` calls as possible."""
+        from mlflow.entities import Param, RunTag
+
+        params = [Param(k, str(v)) for k, v in self._params.items()]
+        tags = [RunTag(k, str(v)) for k, v in self._tags.items()]
+        metrics = self._metrics
+        self._params, self._tags, self._metrics = {}, {}, []
+        while params or tags or metrics:
+            self.client.log_batch(
+                self.run_id,
+                metrics=metrics[:_MAX_METRICS_PER_BATCH],
+                params=params[:_MAX_PARAMS_PER_BATCH],
+                tags=tags[:_MAX_TAGS_PER_BATCH],
+            )
+            metrics = metrics[_MAX_METRICS_PER_BATCH:]
+            params = params[_MAX_PARAMS_PER_BATCH:]
+            tags = tags[_MAX_TAGS_PER_BATCH:]
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Run ``fn`` on the background upload thread."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mlflow-upload")
+        future = self._executor.submit(fn, *args, **kwargs)
+        self._uploads.append(future)
+        return future
+
+    def log_model(
+        self, model: Any, artifact_path: str = "model", timing_metric: Optional[str] = None
+    ) -> Future:
+        """Save an sklearn model and upload it as a run artifact in the background.
+
+        With ``timing_metric`` set, the save + upload time is measured on the
+        upload thread and logged under that name when the logger closes, so
+        timing the upload never blocks the caller.
+        """
+        if timing_metric is None:
+            return self.submit(self._upload_sklearn_model, model, artifact_path)
+        return self.submit(self._timed, timing_metric, self._upload_sklearn_model, model, artifact_path)
+
+    def _timed(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def log_artifact(self, local_path: str, artifact_path: Optional[str] = None) -> Future:
+        return self.submit(self.client.log_artifact, self.run_id, local_path, artifact_path)
+
+    def _upload_sklearn_model(self, model: Any, artifact_path: str) -> None:
+        import mlflow.sklearn
+        from mlflow.models import Model
+
+        # What mlflow.sklearn.log_model does, but addressed by run_id rather than
+        # the (thread-local) active run, so it works on the upload thread.  Unlike
+        # save_model + log_artifacts it also records the mlflow.log-model.history
+        # tag that the UI's "Register model" and logged-model lookups rely on.
+        Model.log(artifact_path=artifact_path, flavor=mlflow.sklearn, run_id=self.run_id, sk_model=model)
+
+    def close(self, raise_errors: bool = True) -> None:
+        """Barrier: flush buffered values and wait for all uploads.
+
+        The first flush overlaps the uploads still in flight; upload timings
+        only exist once those finish and go out in a second, small batch.
+        """
+        try:
+            self.flush()
+        finally:
+            uploads, self._uploads = self._uploads, []
+            errors = [f.exception() for f in uploads]
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+        if uploads and self.timings:
+            self.log_metrics(self.timings)
+            self.flush()
+        errors = [e for e in errors if e is not None]
+        if errors and raise_errors:
+            raise errors[0]
@@ -2,22 +2,92 @@ from __future__ import annotations
 
 """Training utilities that fit a model and log artifacts to MLflow."""
 
-from typing import Dict
+import tempfile
+from typing import Any, Callable, Dict, Iterable, Tuple
 
 import mlflow
 import mlflow.sklearn
-from sklearn.linear_model import LogisticRegression
+import numpy as np
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.metrics import accuracy_score, f1_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
 
-from .data import load_demo_iris
+from .data import iter_array_chunks, iter_file_chunks, load_dataset, load_demo_iris
+from .profiling import StageTimer, profile_run, write_profile
+from .tracking import RunLogger
 
-__all__ = ["train_demo"]
+__all__ = ["fit_and_evaluate", "train_demo", "train_streaming"]
+
+ChunkSource = Callable[[], Iterable[Tuple[np.ndarray, np.ndarray]]]
+
+
+def fit_and_evaluate(
+    X_train: Any,
+    y_train: Any,
+    X_test: Any,
+    y_test: Any,
+    C: float = 1.0,
+    max_iter: int = 200,
+) -> Tuple[LogisticRegression, Dict[str, float]]:
+    """Fit the demo logistic regression and score it on the test split."""
+    model = _fit(X_train, y_train, C=C, max_iter=max_iter)
+    return model, _evaluate(model, X_test, y_test)
+
+
+def _fit(
+    X_train: Any,
+    y_train: Any,
+    C: float = 1.0,
+    max_iter: int = 200,
+    init: LogisticRegression | None = None,
+) -> LogisticRegression:
+    """Fit from scratch, or continue from ``init``'s coefficients when given."""
+    model = LogisticRegression(C=C, max_iter=max_iter, multi_class="auto", warm_start=init is not None)
+    if init is not None:
+        classes = np.unique(y_train)
+        if not np.array_equal(classes, init.classes_):
+            raise ValueError(f"Warm start needs the parent's classes {init.classes_.tolist()}, got {classes.tolist()}")
+        if np.shape(X_train)[1] != init.coef_.shape[1]:
+            raise ValueError(
+                f"Warm start needs {init.coef_.shape[1]} features like the parent, got {np.shape(X_train)[1]}"
+            )
+        # lbfgs starts from these and stops as soon as the updated data has converged.
+        model.coef_ = init.coef_.copy()
+        model.intercept_ = init.intercept_.copy()
+    return model.fit(X_train, y_train)
+
+
+def _load_parent_model(parent_run_id: str) -> LogisticRegression:
+    model = mlflow.sklearn.load_model(f"runs:/{parent_run_id}/model")
+    if not isinstance(model, LogisticRegression):
+        raise ValueError(f"Run {parent_run_id} holds a {type(model).__name__}; warm start needs a LogisticRegression")
+    return model
+
+
+def _evaluate(model: Any, X_test: Any, y_test: Any) -> Dict[str, float]:
+    preds = model.predict(X_test)
+    return {
+        "accuracy": accuracy_score(y_test, preds),
+        "f1_micro": f1_score(y_test, preds, average="micro"),
+    }
+
+
+def _attach_profile(tracker: RunLogger, profiler: Any, directory: str) -> None:
+    """Upload the cProfile dump and summary under the run's ``profile/`` artifacts."""
+    for path in write_profile(profiler, directory, name="train_profile"):
+        tracker.log_artifact(str(path), "profile")
 
 
 def train_demo(
     C: float = 1.0,
     max_iter: int = 200,
     mlflow_tracking_uri: str | None = None,
+    data_source: str | None = None,
+    target: str = "target",
+    profile: bool = False,
+    parent_run_id: str | None = None,
+    track_memory: bool = False,
 ) -> Dict[str, float | str]:
     """Train a logistic regression on the Iris dataset and log to MLflow.
 
@@ -25,6 +95,23 @@ def train_demo(
     ----------
     C, max_iter : Logistic regression hyper-parameters.
     mlflow_tracking_uri : If provided, overrides env `MLFLOW_TRACKING_URI`.
+    data_source : CSV / Parquet path loaded through the dataset cache
+        (see `load_dataset`) instead of the builtin Iris data.
+    target : Label column of `data_source`.
+    profile : Run under ``cProfile`` and attach the stats as ``profile/``
+        run artifacts.
+    parent_run_id : Warm-start from the model of this earlier run instead of
+        fitting from scratch.  The data must have the parent's classes and
+        features.  The run is tagged ``parent_run_id`` for lineage.
+    track_memory : Also log ``stage_<stage>_peak_mb`` from ``tracemalloc``
+        (implied by ``profile``).  Off by default: tracing slows fitting down
+        and would inflate the stage timings.
+
+    Every run also logs ``stage_<stage>_seconds`` for the ``load``,
+    ``load_parent`` (warm start only), ``fit`` and ``evaluate`` stages, the
+    background model upload as ``stage_log_model_seconds``, and the solver
+    iterations as ``n_iter``; compare both with the parent run to see what the
+    warm start saved.
 
     Returns
     -------
@@ -36,21 +123,159 @@ def train_demo(
     # Ensure experiment exists – keep name consistent with tests & serving
     mlflow.set_experiment("iris-demo")
 
-    X_train, y_train, X_test, y_test = load_demo_iris()
+    with StageTimer(trace_memory=track_memory or profile) as timer, profile_run(profile) as profiler:
+        with timer.stage("load"):
+            if data_source:
+                X_train, y_train, X_test, y_test = load_dataset(data_source, target=target)
+            else:
+                X_train, y_train, X_test, y_test = load_demo_iris()
+        parent = None
+        if parent_run_id:
+            with timer.stage("load_parent"):
+                parent = _load_parent_model(parent_run_id)
+
+        # The temporary directory outlives the RunLogger, which waits for the uploads.
+        with tempfile.TemporaryDirectory(prefix="mlops_profile_") as tmp, \
+                mlflow.start_run(run_name="logreg_demo") as run, RunLogger(run.info.run_id) as tracker:
+            with timer.stage("fit"):
+                model = _fit(X_train, y_train, C=C, max_iter=max_iter, init=parent)
+            with timer.stage("evaluate"):
+                metrics = _evaluate(model, X_test, y_test)
+
+            tracker.log_params({"C": C, "max_iter": max_iter, "warm_start": parent is not None})
+            if parent_run_id:
+                tracker.set_tags({"parent_run_id": parent_run_id})
+            n_iter = int(np.max(model.n_iter_))
+            tracker.log_metrics({**metrics, "n_iter": n_iter})
+            # The upload overlaps the rest of the run; its time is measured on the
+            # upload thread and logged when the RunLogger closes.
+            tracker.log_model(model, "model", timing_metric="stage_log_model_seconds")
+
+            tracker.log_metrics(timer.metrics())
+            if profiler is not None:
+                _attach_profile(tracker, profiler, tmp)
+
+    stages = {**timer.metrics(), **tracker.timings}
+    return {"run_id": run.info.run_id, "metrics": metrics, "stages": stages, "n_iter": n_iter}
+
+
+def _chunk_source(source: str | ChunkSource, target: str, chunk_size: int) -> ChunkSource:
+    """Turn ``"iris"``, a file path or a callable into a re-iterable chunk source."""
+    if callable(source):
+        return source
+    if source == "iris":
+        X_train, y_train, X_test, y_test = load_demo_iris()
+        X = np.concatenate([X_train.to_numpy(), X_test.to_numpy()])
+        y = np.concatenate([y_train.to_numpy(), y_test.to_numpy()])
+        return lambda: iter_array_chunks(X, y, chunk_size)
+    return lambda: iter_file_chunks(source, target=target, chunk_size=chunk_size)
+
+
+def train_streaming(
+    source: str | ChunkSource = "iris",
+    target: str = "target",
+    chunk_size: int = 10_000,
+    epochs: int = 5,
+    alpha: float = 1e-4,
+    holdout_every: int = 5,
+    classes: Iterable[Any] | None = None,
+    mlflow_tracking_uri: str | None = None,
+    profile: bool = False,
+    track_memory: bool = False,
+) -> Dict[str, float | str]:
+    """Train an incremental logistic model on data streamed in chunks.
+
+    Only one chunk is in memory at a time, so peak memory does not grow with
+    the dataset.  A first pass fits a ``StandardScaler`` and collects the class
+    labels; each epoch then calls ``SGDClassifier.partial_fit`` chunk by chunk.
+    Every ``holdout_every``-th row is held out and scored in a final streaming
+    pass.  Metrics and the model artifact are logged like ``train_demo``.
+
+    Parameters
+    ----------
+    source : ``"iris"``, a CSV / Parquet path, or a callable returning a fresh
+        iterable of ``(X, y)`` chunks on every call.
+    target : Label column for file sources.
+    chunk_size : Rows per chunk for file sources.
+    epochs, alpha : Passes over the data and ``SGDClassifier`` regularisation.
+    holdout_every : Row stride of the evaluation holdout.
+    classes : All class labels; discovered in the first pass if omitted.
+    profile : Run under ``cProfile`` and attach the stats as ``profile/``
+        run artifacts.
+    track_memory : Also log per-stage ``tracemalloc`` peaks, as in ``train_demo``.
+
+    Stage metrics are logged for ``scan`` (first pass), ``fit``, ``evaluate``
+    and the background ``log_model`` upload, as in ``train_demo``.
+
+    Returns
+    -------
+    metrics dict
+    """
+    if mlflow_tracking_uri:
+        mlflow.set_tracking_uri(mlflow_tracking_uri)
+    mlflow.set_experiment("iris-demo")
+
+    chunks = _chunk_source(source, target, chunk_size)
+
+    def _split(X, y, offset):
+        holdout = (np.arange(offset, offset + len(X)) % holdout_every) == 0
+        return X[~holdout], y[~holdout], X[holdout], y[holdout]
+
+    with StageTimer(trace_memory=track_memory or profile) as timer, profile_run(profile) as profiler:
+        # Pass 1: scaler statistics and label set
+        with timer.stage("scan"):
+            scaler = StandardScaler()
+            seen = set()
+            offset = 0
+            for X, y in chunks():
+                X_tr, y_tr, _, _ = _split(X, y, offset)
+                offset += len(X)
+                if len(X_tr):
+                    scaler.partial_fit(X_tr)
+                if classes is None:
+                    seen.update(np.unique(y).tolist())
+            classes = np.asarray(sorted(seen) if classes is None else list(classes))
+
+        with tempfile.TemporaryDirectory(prefix="mlops_profile_") as tmp, \
+                mlflow.start_run(run_name="logreg_demo_streaming") as run, RunLogger(run.info.run_id) as tracker:
+            with timer.stage("fit"):
+                clf = SGDClassifier(loss="log_loss", alpha=alpha, random_state=0)
+                for epoch in range(epochs):
+                    offset = 0
+                    for X, y in chunks():
+                        X_tr, y_tr, _, _ = _split(X, y, offset)
+                        offset += len(X)
+                        if len(X_tr):
+                            clf.partial_fit(scaler.transform(X_tr), y_tr, classes=classes)
+
+            # Streaming evaluation: accumulate confusion counts over the holdout
+            with timer.stage("evaluate"):
+                confusion = np.zeros((len(classes), len(classes)), dtype=np.int64)
+                offset = 0
+                for X, y in chunks():
+                    _, _, X_te, y_te = _split(X, y, offset)
+                    offset += len(X)
+                    if len(X_te):
+                        preds = clf.predict(scaler.transform(X_te))
+                        np.add.at(confusion, (np.searchsorted(classes, y_te), np.searchsorted(classes, preds)), 1)
 
-    with mlflow.start_run(run_name="logreg_demo") as run:
-        model = LogisticRegression(C=C, max_iter=max_iter, multi_class="auto")
-        model.fit(X_train, y_train)
+            tp = np.trace(confusion)
+            total = confusion.sum()
+            errors = total - tp  # each error is one FP and one FN under micro averaging
+            metrics = {
+                "accuracy": float(tp / total) if total else 0.0,
+                "f1_micro": float(2 * tp / (2 * tp + 2 * errors)) if total else 0.0,
+            }
 
-        preds = model.predict(X_test)
-        metrics = {
-            "accuracy": accuracy_score(y_test, preds),
-            "f1_micro": f1_score(y_test, preds, average="micro"),
-        }
+            tracker.log_params(
+                {"mode": "streaming", "chunk_size": chunk_size, "epochs": epochs, "alpha": alpha}
+            )
+            tracker.log_metrics(metrics)
+            # Log model artifact
+            tracker.log_model(make_pipeline(scaler, clf), "model", timing_metric="stage_log_model_seconds")
 
-        mlflow.log_params({"C": C, "max_iter": max_iter})
-        mlflow.log_metrics(metrics)
-        # Log model artifact
-        mlflow.sklearn.log_model(model, "model")
+            tracker.log_metrics(timer.metrics())
+            if profiler is not None:
+                _attach_profile(tracker, profiler, tmp)
 
-        return {"run_id": run.info.run_id, "metrics": metrics}
+    return {"run_id": run.info.run_id, "metrics": metrics, "stages": {**timer.metrics(), **tracker.timings}}
@@ -13,6 +13,10 @@ if str(PROJECT_ROOT) not in sys.path:
 _MLRUNS_DIR = tempfile.mkdtemp(prefix="mlruns_test_")
 # 設定測試環境變數（必須在匯入 mlflow 之前）
 os.environ["MLFLOW_TRACKING_URI"] = f"file:{_MLRUNS_DIR}"
+# 資料集、步驟快取與 run 索引改寫到暫存目錄，避免測試寫入使用者的 ~/.cache（必須在匯入套件之前；子行程會繼承）
+_CACHE_DIR = tempfile.mkdtemp(prefix="mlops_cache_test_")
+os.environ["MLOPS_DATA_CACHE_DIR"] = os.path.join(_CACHE_DIR, "datasets")
+os.environ["MLOPS_RUN_INDEX_DIR"] = os.path.join(_CACHE_DIR, "run_index")
 
 from fastapi.testclient import TestClient
 from fastapi import status
@@ -45,5 +49,6 @@ def _cleanup():
     if os.path.exists(_MLRUNS_DIR):
         shutil.rmtree(_MLRUNS_DIR, ignore_errors=True)
         print(f"Cleaned up temporary MLflow directory: {_MLRUNS_DIR}")
+    shutil.rmtree(_CACHE_DIR, ignore_errors=True)
 
 atexit.register(_cleanup)
@@ -0,0 +1,122 @@
+import pytest
+
+from src.mlops_framework import dag
+from src.mlops_framework.pipeline import run
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """測試中註冊的步驟只存在於測試期間，不影響其他測試"""
+    monkeypatch.setattr(dag, "_REGISTRY", dict(dag._REGISTRY))
+    return dag._REGISTRY
+
+
+def _steps(C=1.0):
+    return [
+        {"name": "load"},
+        {"name": "split"},
+        {"name": "featurize"},
+        {"name": "train", "params": {"C": C}},
+        {"name": "evaluate", "inputs": ["train", "featurize"]},
+    ]
+
+
+def test_rerun_skips_unchanged_steps(tmp_path):
+    """測試重跑時未變更的步驟直接使用快取，只改超參數時不重跑資料與特徵步驟"""
+    first = run({"steps": _steps(), "cache_dir": tmp_path})
+    assert not any(s["cached"] for s in first["steps"].values())
+    assert first["outputs"]["evaluate"]["accuracy"] > 0.9
+
+    again = run({"steps": _steps(), "cache_dir": tmp_path})
+    assert all(s["cached"] for s in again["steps"].values())
+
+    tuned = run({"steps": _steps(C=0.5), "cache_dir": tmp_path})
+    cached = {name for name, s in tuned["steps"].items() if s["cached"]}
+    assert cached == {"load", "split", "featurize"}
+
+
+def test_independent_branches_run_concurrently(tmp_path, registry):
+    """測試互不相依的分支會並行執行"""
+    import threading
+
+    barrier = threading.Barrier(2, timeout=5)
+
+    @dag.register_step("wait_for_sibling", cache=False)
+    def wait_for_sibling(value):
+        barrier.wait()  # 兩個分支必須同時在執行才會通過
+        return value
+
+    @dag.register_step("const")
+    def const(value=1):
+        return value
+
+    result = dag.run_steps(
+        [
+            {"name": "root", "step": "const"},
+            {"name": "a", "step": "wait_for_sibling", "inputs": ["root"]},
+            {"name": "b", "step": "wait_for_sibling", "inputs": ["root"]},
+        ],
+        cache_dir=tmp_path,
+    )
+    assert result["outputs"] == {"root": 1, "a": 1, "b": 1}
+
+
+def test_invalid_graph(tmp_path):
+    """測試未知步驟與循環相依的錯誤處理"""
+    with pytest.raises(ValueError):
+        dag.run_steps([{"name": "nope"}], cache_dir=tmp_path)
+    with pytest.raises(ValueError):
+        dag.run_steps([
+            {"name": "load", "inputs": ["split"]},
+            {"name": "split", "inputs": ["load"]},
+        ], cache_dir=tmp_path)
+
+
+def test_step_key_tracks_helper_code(tmp_path, monkeypatch, registry):
+    """測試步驟呼叫的本地 helper（另一模組或同一模組）變更時快取鍵跟著改變"""
+    import importlib
+    import sys
+
+    helper = tmp_path / "step_helper.py"
+    helper.write_text("def work(x):\n    return x + 1\n")
+    steps = tmp_path / "step_defs.py"
+    source = (
+        "import step_helper\n\n"
+        "def scale(x):\n    return x * {factor}\n\n"
+        "def double(x=1):\n    return scale(step_helper.work(x))\n"
+    )
+    steps.write_text(source.format(factor=2))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    module = importlib.import_module("step_defs")
+    dag.register_step("helper_step")(module.double)
+    step = dag.Step(name="helper_step")
+
+    try:
+        before = dag.step_key(step, [])
+        helper.write_text("def work(x):\n    return x + 2\n")
+        dag._code_hash.cache_clear()
+        after_helper = dag.step_key(step, [])
+        assert after_helper != before
+
+        # 同一模組中的 helper 改變，步驟本身原始碼不變
+        steps.write_text(source.format(factor=3))
+        dag._code_hash.cache_clear()
+        assert dag.step_key(step, []) != after_helper
+    finally:
+        dag._code_hash.cache_clear()
+        for name in ("step_defs", "step_helper"):
+            sys.modules.pop(name, None)
+
+
+def test_step_cache_evicts_least_recently_used(tmp_path):
+    """測試步驟快取超過容量時淘汰最久未使用的項目"""
+    import os
+
+    cache = dag.StepCache(tmp_path, max_bytes=2500)
+    for i, key in enumerate(["aa01", "bb02"]):
+        cache.put(key, b"x" * 1000)
+        os.utime(cache._path(key), (i, i))
+    cache.get("aa01")  # 讀取後成為最近使用
+    cache.put("cc03", b"x" * 1000)
+    assert "aa01" in cache and "cc03" in cache and "bb02" not in cache
+    assert cache.clear() == 2
@@ -0,0 +1,32 @@
+import numpy as np
+from sklearn.datasets import load_iris
+
+from src.mlops_framework.data import dataset_cache_key, load_dataset, load_demo_iris
+
+
+def test_load_dataset_caches_memmapped_splits(tmp_path):
+    """測試資料集快取：第二次載入使用 memory-map 且結果相同"""
+    first = load_dataset("iris", cache_dir=tmp_path)
+    second = load_dataset("iris", cache_dir=tmp_path)
+    assert isinstance(second[0], np.memmap)
+    for a, b in zip(first, second):
+        assert np.array_equal(a, b)
+
+    # 與 load_demo_iris 的切分一致
+    X_train, y_train, _, _ = load_demo_iris()
+    assert np.array_equal(first[0], X_train.to_numpy())
+    assert np.array_equal(first[1], y_train.to_numpy())
+
+
+def test_load_dataset_csv_and_eviction(tmp_path):
+    """測試 CSV 來源、切分參數進入 cache key，以及大小上限淘汰"""
+    csv = tmp_path / "iris.csv"
+    load_iris(as_frame=True).frame.to_csv(csv, index=False)
+    cache = tmp_path / "cache"
+
+    assert dataset_cache_key(csv) != dataset_cache_key(csv, test_size=0.3)
+    load_dataset(csv, cache_dir=cache, test_size=0.3)
+    X_train, _, X_test, _ = load_dataset(csv, cache_dir=cache, max_cache_bytes=1)
+    assert len(X_test) == 30 and X_train.shape[1] == 4
+    # 預算只容得下最新的項目
+    assert len([p for p in cache.iterdir() if p.is_dir()]) == 1
@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from src.mlops_framework.jobs import JobExecutor, JobQueueFull
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+
+
+def _wait(job, timeout=60):
+    deadline = time.time() + timeout
+    while job.status in ("queued", "running") and time.time() < deadline:
+        time.sleep(0.05)
+    return job.status
+
+
+def test_job_executor_runs_and_reports_errors():
+    """測試工作在子行程執行並回報成功與失敗狀態"""
+    executor = JobExecutor(max_workers=1, max_queue=4)
+    try:
+        ok = executor.submit("pow", pow, base=2, exp=10)
+        bad = executor.submit("pow", pow, base="x", exp=2)
+        assert _wait(ok) == "succeeded" and ok.result == 1024
+        assert _wait(bad) == "failed" and "TypeError" in bad.error
+    finally:
+        executor.shutdown()
+
+
+def test_job_executor_queue_limit_and_cancel():
+    """測試佇列上限與取消尚未開始的工作；等待中的工作不會先交給行程池"""
+    executor = JobExecutor(max_workers=1, max_queue=1)
+    try:
+        running = executor.submit("sleep", _sleep, seconds=2)
+        queued = executor.submit("sleep", _sleep, seconds=2)
+        assert running.status == "running" and queued.status == "queued"
+        assert queued.future is None
+        with pytest.raises(JobQueueFull):
+            executor.submit("sleep", _sleep, seconds=2)
+        assert executor.cancel(queued.job_id) and queued.status == "cancelled"
+        assert not executor.cancel(running.job_id)
+        assert _wait(running) == "succeeded" and running.error is None
+    finally:
+        executor.shutdown()
+
+
+def test_job_executor_shutdown_reports_cancelled_jobs():
+    """測試關閉時被取消的排隊工作也會呼叫 on_done"""
+    done = []
+    executor = JobExecutor(max_workers=1, max_queue=2, on_done=done.append)
+    running = executor.submit("sleep", _sleep, seconds=1)
+    queued = executor.submit("sleep", _sleep, seconds=1)
+    executor.shutdown(wait=True)
+    assert queued.status == "cancelled" and queued in done
+    assert _wait(running) == "succeeded"
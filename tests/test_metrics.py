@@ -0,0 +1,37 @@
+import pytest
+
+from src.mlops_framework.metrics import MetricsRegistry
+
+
+def test_render_prometheus_text_format():
+    """測試計數器、量表與直方圖輸出為 Prometheus 文字格式"""
+    registry = MetricsRegistry()
+    errors = registry.counter("errors_total", "Errors", ["route"])
+    version = registry.gauge("model_info", "Model", ["version"])
+    latency = registry.histogram("latency_seconds", "Latency", ["route"], buckets=(0.1, 1.0))
+
+    errors.inc(route="/predict")
+    errors.inc(2, route="/predict")
+    version.set(1, version='a"b')
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, route="/predict")
+
+    text = registry.render()
+    assert "# TYPE errors_total counter" in text
+    assert 'errors_total{route="/predict"} 3.0' in text
+    assert 'model_info{version="a\\"b"} 1.0' in text
+    assert 'latency_seconds_bucket{route="/predict",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/predict",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/predict",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/predict"} 3' in text
+    assert latency.count(route="/predict") == 3
+
+
+def test_label_mismatch_and_duplicate_names():
+    """測試標籤不符與重複註冊的錯誤處理"""
+    registry = MetricsRegistry()
+    counter = registry.counter("c_total", "C", ["route"])
+    with pytest.raises(ValueError):
+        counter.inc(method="GET")
+    with pytest.raises(ValueError):
+        registry.gauge("c_total", "dup")
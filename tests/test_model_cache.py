@@ -0,0 +1,26 @@
+from src.mlops_framework.model_cache import ModelCache
+
+
+def test_lru_eviction_respects_budget_and_aliases():
+    """測試超過記憶體預算時依 LRU 淘汰，且別名指向的模型不被淘汰"""
+    cache = ModelCache(max_bytes=250)
+    cache.put("a", "model-a", nbytes=100, aliases=["default"])
+    cache.put("b", "model-b", nbytes=100)
+    cache.put("c", "model-c", nbytes=100)
+
+    # "b" 為最久未使用且未被別名釘住
+    assert "b" not in cache
+    assert cache.get("default").key == "a"
+
+    cache.get("c")
+    cache.put("d", "model-d", nbytes=100)
+    assert "c" not in cache and "a" in cache and "d" in cache
+
+
+def test_remove_drops_aliases():
+    """測試移除模型時同時移除別名"""
+    cache = ModelCache()
+    cache.put("a", "model-a", aliases=["default", "tenant-1"])
+    assert cache.remove("a") is not None
+    assert cache.get("default") is None
+    assert cache.aliases() == {}
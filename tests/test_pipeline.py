@@ -55,4 +55,43 @@ class TestPredictionAPI:
         )
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+def test_train_streaming(tmp_path):
+    """測試串流 partial_fit 訓練（CSV 分塊讀取）"""
+    from sklearn.datasets import load_iris
+    from src.mlops_framework.train import train_streaming
+
+    # 打亂順序，避免每個分塊只有單一類別
+    frame = load_iris(as_frame=True).frame.sample(frac=1.0, random_state=0)
+    csv = tmp_path / "iris.csv"
+    frame.to_csv(csv, index=False)
+
+    result = train_streaming(str(csv), chunk_size=32, epochs=10)
+    assert result["metrics"]["accuracy"] > 0.8
+
+def test_train_demo_warm_start(trained_model):
+    """測試以父 run 的模型暖啟動：迭代次數較少，並記錄 lineage tag"""
+    import mlflow
+    from src.mlops_framework.train import train_demo
+
+    parent_run_id, _ = trained_model
+    parent = mlflow.get_run(parent_run_id)
+    result = train_demo(parent_run_id=parent_run_id)
+    run = mlflow.get_run(result["run_id"])
+
+    assert run.data.tags["parent_run_id"] == parent_run_id
+    assert run.data.params["warm_start"] == "True"
+    assert run.data.metrics["n_iter"] < parent.data.metrics["n_iter"]
+    assert result["metrics"]["accuracy"] > 0.9
+
+def test_train_demo_warm_start_rejects_mismatched_data(trained_model, tmp_path):
+    """測試資料類別與父模型不一致時拒絕暖啟動"""
+    from sklearn.datasets import load_iris
+    from src.mlops_framework.train import train_demo
+
+    frame = load_iris(as_frame=True).frame
+    csv = tmp_path / "two_classes.csv"
+    frame[frame["target"] < 2].to_csv(csv, index=False)
+    with pytest.raises(ValueError, match="classes"):
+        train_demo(data_source=str(csv), parent_run_id=trained_model[0])
+
 # 執行測試: pytest -v tests/
@@ -0,0 +1,28 @@
+import numpy as np
+
+from src.mlops_framework.prediction_cache import PredictionCache
+
+
+def test_hits_misses_and_lru_bound():
+    """測試命中/未命中統計與 LRU 容量上限"""
+    cache = PredictionCache(max_entries=2)
+    assert cache.get("v1", [1.0, 2.0]) is None
+    cache.put("v1", [1.0, 2.0], [0.3, 0.7])
+    np.testing.assert_array_equal(cache.get("v1", [1.0, 2.0]), [0.3, 0.7])
+    assert cache.get("v2", [1.0, 2.0]) is None  # 不同模型版本不共用
+
+    cache.put("v1", [3.0, 4.0], [1.0, 0.0])
+    cache.put("v1", [5.0, 6.0], [0.0, 1.0])
+    assert cache.get("v1", [1.0, 2.0]) is None  # 最久未使用者被淘汰
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 2)
+
+
+def test_quantization_and_invalidate():
+    """測試特徵量化與依模型失效"""
+    cache = PredictionCache(decimals=2)
+    cache.put(("m", 1), [5.1000001, 3.5], [1.0, 0.0])
+    assert cache.get(("m", 1), [5.1, 3.4999999]) is not None
+    cache.put(("other", 1), [0.0, 0.0], [0.5, 0.5])
+    assert cache.invalidate(lambda token: token[0] == "m") == 1
+    assert cache.stats()["entries"] == 1
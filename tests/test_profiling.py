@@ -0,0 +1,58 @@
+import mlflow
+import numpy as np
+import pytest
+from mlflow.tracking import MlflowClient
+
+from src.mlops_framework.profiling import StageTimer
+
+
+def test_stage_timer_records_time_and_peak_memory():
+    """測試各階段記錄耗時與記憶體峰值，重複階段會累加時間"""
+    with StageTimer(trace_memory=True) as timer:
+        with timer.stage("alloc"):
+            buffer = np.ones(2_000_000)  # 約 16 MB
+            del buffer
+        with timer.stage("noop"):
+            pass
+        with timer.stage("noop"):
+            pass
+    metrics = timer.metrics()
+    assert metrics["stage_alloc_peak_mb"] >= 15
+    assert metrics["stage_noop_peak_mb"] < 1
+    assert metrics["stage_noop_seconds"] >= 0
+    assert set(metrics) == {
+        "stage_alloc_seconds", "stage_alloc_peak_mb", "stage_noop_seconds", "stage_noop_peak_mb",
+    }
+
+
+def test_train_demo_logs_stage_metrics_and_profile(trained_model):
+    """測試 train_demo 記錄階段指標，並在 profile=True 時附上 cProfile 產物"""
+    from src.mlops_framework.train import train_demo
+
+    result = train_demo(profile=True)
+    run = mlflow.get_run(result["run_id"])
+    for stage in ("load", "fit", "evaluate"):
+        assert run.data.metrics[f"stage_{stage}_seconds"] > 0
+        assert f"stage_{stage}_peak_mb" in run.data.metrics
+    # 模型上傳在背景執行緒計時，於 RunLogger 關閉時才記錄
+    assert run.data.metrics["stage_log_model_seconds"] > 0
+    assert result["stages"]["stage_log_model_seconds"] == pytest.approx(run.data.metrics["stage_log_model_seconds"])
+    artifacts = {a.path for a in MlflowClient().list_artifacts(result["run_id"], "profile")}
+    assert artifacts == {"profile/train_profile.prof", "profile/train_profile.txt"}
+
+
+def test_stage_timer_memory_tracing_is_opt_in(trained_model):
+    """測試預設不啟用 tracemalloc，只記錄耗時；暖啟動的父模型載入自成一個階段"""
+    import tracemalloc
+
+    from src.mlops_framework.train import train_demo
+
+    with StageTimer() as timer:
+        assert not tracemalloc.is_tracing()
+        with timer.stage("noop"):
+            pass
+    assert set(timer.metrics()) == {"stage_noop_seconds"}
+
+    result = train_demo(parent_run_id=trained_model[0])
+    assert not any(k.endswith("_peak_mb") for k in result["stages"])
+    assert result["stages"]["stage_load_parent_seconds"] > 0
@@ -0,0 +1,68 @@
+from mlflow.tracking import MlflowClient
+
+from src.mlops_framework.run_index import RunIndex
+
+
+def _store(tmp_path):
+    root = tmp_path / "mlruns"
+    root.mkdir()
+    client = MlflowClient(tracking_uri=f"file:{root}")
+    experiment_id = client.create_experiment("iris-demo")
+    return root, client, experiment_id
+
+
+def _run(client, experiment_id, name, start_time, tags=None):
+    run = client.create_run(experiment_id, start_time=start_time, tags=tags or {}, run_name=name)
+    client.set_terminated(run.info.run_id)
+    return run.info.run_id
+
+
+def test_run_index_search_by_name_and_tag(tmp_path):
+    """測試索引依 run 名稱、tag 查詢並依開始時間由新到舊排序"""
+    root, client, exp = _store(tmp_path)
+    old = _run(client, exp, "logreg_demo", 1000, {"model_name": "a"})
+    new = _run(client, exp, "logreg_demo", 2000, {"model_name": "b"})
+    _run(client, exp, "sweep", 3000)
+
+    index = RunIndex(root, path=tmp_path / "index.sqlite")
+    assert index.refresh() == 3
+    latest = index.search("iris-demo", run_name_like="%logreg_demo%", max_results=1)
+    assert [r["run_id"] for r in latest] == [new]
+    assert latest[0]["status"] == "FINISHED"
+    assert index.search("iris-demo", tags={"model_name": "a"})[0]["run_id"] == old
+    assert [r["start_time"] for r in index.search("iris-demo")] == [3000, 2000, 1000]
+    assert index.search("missing") == [] and index.experiment_id("missing") is None
+
+
+def test_run_index_refresh_is_incremental(tmp_path):
+    """測試增量更新只讀取新建或尚未穩定的 run，full 才會重讀全部"""
+    root, client, exp = _store(tmp_path)
+    first = _run(client, exp, "logreg_demo", 1000)
+    index = RunIndex(root, path=tmp_path / "index.sqlite", settle_seconds=0)
+    assert index.refresh() == 1
+    assert index.refresh() == 0  # 無變更時不重讀任何 run
+
+    second = _run(client, exp, "logreg_demo", 2000)
+    assert index.refresh() == 1
+    assert index.search("iris-demo", max_results=1)[0]["run_id"] == second
+
+    # 剛結束的 run 仍在 settle 期間：只有檔案變動時才重讀
+    index.settle_seconds = 300
+    assert index.refresh() == 0
+    client.set_tag(second, "model_name", "nightly")
+    assert index.refresh() == 1
+    assert index.search("iris-demo", tags={"model_name": "nightly"})[0]["run_id"] == second
+    index.settle_seconds = 0
+
+    # 已結束的舊 run 被刪除或改 tag：refresh 不會重讀，但查詢時會依檔案 mtime 重讀回傳的 run
+    client.delete_run(second)
+    client.set_tag(first, "model_name", "late")
+    assert index.refresh() == 0
+    assert [r["run_id"] for r in index.search("iris-demo", max_results=1)] == [first]
+    assert index.tags(first)["model_name"] == "late"
+    assert index.refresh(full=True) == 2
+    assert [r["run_id"] for r in index.search("iris-demo")] == [first]
+    assert index.tags(first)["model_name"] == "late"
+
+    # 重新開啟同一個索引檔沿用既有內容
+    assert RunIndex(root, path=tmp_path / "index.sqlite", settle_seconds=0).refresh() == 0
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from sklearn.datasets import load_iris
+from sklearn.linear_model import LogisticRegression
+from sklearn.tree import DecisionTreeClassifier
+
+from src.mlops_framework.scoring import LinearScorer, compile_model, score_file
+
+
+@pytest.mark.parametrize("kwargs, n_classes", [
+    ({}, 3),
+    ({"solver": "liblinear"}, 3),
+    ({}, 2),
+])
+def test_linear_scorer_matches_sklearn(kwargs, n_classes):
+    """測試編譯後的 scorer 與 sklearn predict_proba 一致"""
+    X, y = load_iris(return_X_y=True)
+    mask = y < n_classes
+    model = LogisticRegression(max_iter=500, **kwargs).fit(X[mask], y[mask])
+
+    scorer = compile_model(model, sample=X)
+    assert isinstance(scorer, LinearScorer)
+    assert np.allclose(scorer.predict_proba(X), model.predict_proba(X), atol=1e-9)
+    assert (scorer.predict(X) == model.predict(X)).all()
+
+
+def test_compile_model_falls_back_for_unsupported():
+    """測試不支援的模型會保留原 sklearn 物件"""
+    X, y = load_iris(return_X_y=True)
+    model = DecisionTreeClassifier().fit(X, y)
+    assert compile_model(model) is model
+
+
+def test_score_file_matches_model(tmp_path, trained_model):
+    """測試離線批次評分輸出與模型預測一致"""
+    import mlflow.sklearn
+    import pandas as pd
+
+    run_id, _ = trained_model
+    frame = load_iris(as_frame=True).frame.rename(columns={"target": "label"})
+    frame.insert(0, "row_id", range(len(frame)))
+    csv = tmp_path / "input.csv"
+    frame.to_csv(csv, index=False)
+    out = tmp_path / "scores.parquet"
+
+    features = [c for c in frame.columns if c not in ("row_id", "label")]
+    summary = score_file(run_id, csv, out, chunk_size=40, workers=2,
+                         feature_columns=features, id_columns=["row_id"])
+    assert summary == {"rows": 150, "chunks": 4, "output_path": str(out)}
+
+    scores = pd.read_parquet(out)
+    model = mlflow.sklearn.load_model(f"runs:/{run_id}/model")
+    assert scores["row_id"].tolist() == list(range(150))
+    assert (scores["prediction"].to_numpy() == model.predict(frame[features])).all()
+    assert np.allclose(scores[[f"proba_{c}" for c in model.classes_]].to_numpy(),
+                       model.predict_proba(frame[features]))
+
+
+def test_score_file_empty_input_writes_schema(tmp_path, trained_model):
+    """測試沒有資料列的輸入仍寫出含完整欄位的空 Parquet"""
+    import pandas as pd
+
+    run_id, _ = trained_model
+    csv = tmp_path / "empty.csv"
+    csv.write_text("row_id,sepal length (cm),sepal width (cm),petal length (cm),petal width (cm)\n")
+    out = tmp_path / "scores.parquet"
+
+    summary = score_file(run_id, csv, out, workers=1, id_columns=["row_id"])
+    assert summary == {"rows": 0, "chunks": 0, "output_path": str(out)}
+    scores = pd.read_parquet(out)
+    assert len(scores) == 0
+    assert list(scores.columns) == ["row_id", "prediction", "proba_0", "proba_1", "proba_2"]
+
+def test_load_local_model_without_mlflow(tmp_path):
+    """測試本地 MLflow 模型目錄可直接反序列化載入"""
+    import mlflow.sklearn
+
+    from src.mlops_framework.scoring import load_local_model
+
+    X, y = load_iris(return_X_y=True)
+    model = LogisticRegression(max_iter=200).fit(X, y)
+    mlflow.sklearn.save_model(model, str(tmp_path / "model"))
+
+    loaded = load_local_model(tmp_path / "model")
+    np.testing.assert_allclose(loaded.predict_proba(X[:5]), model.predict_proba(X[:5]))
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+from src.mlops_framework import serialization
+from src.mlops_framework.serialization import (
+    NDJSONReader,
+    UnsupportedFormat,
+    decode_features,
+    decode_ndjson_rows,
+    encode_ndjson_predictions,
+    encode_predictions,
+    negotiate,
+)
+
+FEATURES = ["a", "b"]
+
+
+def test_decode_raw_json_and_columns():
+    """測試原始位元組、JSON 列與欄式輸入的解碼"""
+    X = np.arange(6, dtype="<f4").reshape(3, 2)
+    raw = decode_features(X.tobytes(), "application/octet-stream; dtype=float32", FEATURES)
+    np.testing.assert_array_equal(raw, X)
+
+    rows = decode_features(b'{"rows": [[1, 2], [3, 4]]}', "application/json", FEATURES)
+    cols = decode_features(b'{"a": [1, 3], "b": [2, 4]}', "application/json", FEATURES)
+    np.testing.assert_array_equal(rows, cols)
+
+    with pytest.raises(ValueError):
+        decode_features(b"\x00" * 12, "application/octet-stream", FEATURES)  # 非 2 個 float64 的倍數
+    with pytest.raises(UnsupportedFormat):
+        decode_features(b"", "text/csv", FEATURES)
+
+
+def test_encode_negotiated_formats(monkeypatch):
+    """測試依 Accept 協商輸出格式，並在沒有 orjson 時退回標準 json"""
+    labels = np.array(["x", "y"])
+    proba = np.array([[0.9, 0.1], [0.2, 0.8]])
+
+    media_type, params = negotiate("application/octet-stream; dtype=float32")
+    body, headers = encode_predictions(labels, proba, ["x", "y"], "v1", media_type, params)
+    np.testing.assert_allclose(np.frombuffer(body, dtype="<f4").reshape(2, 2), proba, rtol=1e-6)
+    assert headers["X-Shape"] == "2,2"
+
+    monkeypatch.setattr(serialization, "orjson", None)
+    monkeypatch.setattr(serialization, "HAVE_ORJSON", False)
+    body, headers = encode_predictions(labels, proba, ["x", "y"], "v1", *negotiate("*/*"))
+    assert serialization.loads_json(body)["probabilities"] == proba.tolist()
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_dumps_json_writes_non_finite_as_null(monkeypatch, fast):
+    """測試 NaN / Infinity 在有無 orjson 時都輸出為 null（合法 JSON）"""
+    import json
+
+    if fast:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    payload = {"p": np.array([0.5, np.nan]), "x": float("inf"), "n": [np.float64(-np.inf)], "ok": 1}
+    body = serialization.dumps_json(payload)
+    assert json.loads(body, parse_constant=lambda c: pytest.fail(f"invalid JSON constant {c}")) == {
+        "p": [0.5, None], "x": None, "n": [None], "ok": 1,
+    }
+
+def test_msgpack_roundtrip():
+    """測試 msgpack 輸入與輸出（需安裝 msgpack）"""
+    msgpack = pytest.importorskip("msgpack")
+    X = decode_features(msgpack.packb([[1.0, 2.0]]), "application/msgpack", FEATURES)
+    assert X.shape == (1, 2)
+    body, _ = encode_predictions(np.array(["x"]), np.array([[1.0, 0.0]]), ["x", "y"], "v1", *negotiate("application/msgpack"))
+    assert msgpack.unpackb(body)["predictions"] == ["x"]
+
+
+def test_ndjson_reader_and_rows():
+    """測試 NDJSON 跨網路區塊切行，並解碼陣列與物件列"""
+    reader = NDJSONReader(max_line_bytes=64)
+    lines = reader.feed(b'[1, 2]\n{"a": 3, "b"') + reader.feed(b': 4}\n\n[5, 6]') + reader.close()
+    assert decode_ndjson_rows(lines, FEATURES).tolist() == [[1, 2], [3, 4], [5, 6]]
+    assert decode_ndjson_rows(lines[::2], FEATURES).tolist() == [[1, 2], [5, 6]]  # 快速路徑
+
+    with pytest.raises(ValueError, match="Row 11: missing feature 'b'"):
+        decode_ndjson_rows([b'[1, 2]', b'{"a": 1}'], FEATURES, offset=10)
+    with pytest.raises(ValueError, match="exceeds 64 bytes"):
+        reader.feed(b"[" + b"1," * 40)
+
+    body = encode_ndjson_predictions(np.array(["x"]), np.array([[0.25, 0.75]]), ["x", "y"])
+    assert body.endswith(b"\n")
+    assert serialization.loads_json(body) == {"prediction": "x", "probabilities": {"x": 0.25, "y": 0.75}}
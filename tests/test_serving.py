@@ -0,0 +1,547 @@
+import asyncio
+import os
+
+import numpy as np
+from fastapi import status
+
+from src.mlops_framework.batching import MicroBatcher
+
+IRIS_ROW = {
+    "sepal_length": 5.1,
+    "sepal_width": 3.5,
+    "petal_length": 1.4,
+    "petal_width": 0.2
+}
+
+
+class _CountingModel:
+    """假模型：記錄每次 predict_proba 收到的批次大小"""
+    classes_ = np.array([0, 1, 2])
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, X):
+        self.calls.append(len(X))
+        proba = np.zeros((len(X), 3))
+        proba[:, 0] = 1.0
+        return proba
+
+
+def test_micro_batcher_groups_concurrent_rows():
+    """測試並發請求會合併成單次 predict_proba"""
+    model = _CountingModel()
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=50)
+
+    async def _run():
+        return await asyncio.gather(*[batcher.submit(model, [i, 0, 0, 0]) for i in range(8)])
+
+    results = asyncio.run(_run())
+    assert model.calls == [8]
+    assert all(r[0] == 1.0 for r in results)
+    assert batcher.stats()["batch_sizes"] == {"8": 1}
+
+
+def test_micro_batcher_close_fails_pending_rows():
+    """測試關閉 batcher 時等待中的請求以錯誤結束而不是永遠懸著"""
+    model = _CountingModel()
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=10_000)
+
+    async def _run():
+        pending = [asyncio.ensure_future(batcher.submit(model, [i, 0, 0, 0])) for i in range(3)]
+        await asyncio.sleep(0.05)
+        await batcher.aclose()
+        return await asyncio.gather(*pending, return_exceptions=True)
+
+    results = asyncio.run(_run())
+    assert model.calls == []
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+def test_predict_with_batching(test_client, trained_model, monkeypatch):
+    """測試啟用 micro-batching 時 /predict 結果一致"""
+    import serving.main as main
+
+    run_id, _ = trained_model
+    assert test_client.post("/load-model", json={"run_id": run_id}).status_code == status.HTTP_200_OK
+    expected = test_client.post("/predict", json=IRIS_ROW).json()
+
+    monkeypatch.setattr(main, "_batcher", MicroBatcher(max_batch_size=4, max_wait_ms=1))
+    response = test_client.post("/predict", json=IRIS_ROW)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["prediction"] == expected["prediction"]
+    assert test_client.get("/predict/batching").json()["batches"] == 1
+
+
+def test_predict_batch_rows_and_columns(test_client, trained_model):
+    """測試 /predict/batch 列式與欄式輸入結果一致"""
+    run_id, _ = trained_model
+    assert test_client.post("/load-model", json={"run_id": run_id}).status_code == status.HTTP_200_OK
+
+    rows = [IRIS_ROW, {**IRIS_ROW, "petal_length": 5.5, "petal_width": 2.1}]
+    by_rows = test_client.post("/predict/batch", json={"rows": rows})
+    assert by_rows.status_code == status.HTTP_200_OK
+
+    columns = {name: [r[name] for r in rows] for name in IRIS_ROW}
+    by_columns = test_client.post("/predict/batch", json=columns)
+    assert by_columns.status_code == status.HTTP_200_OK
+
+    result = by_rows.json()
+    assert result == by_columns.json()
+    assert result["predictions"][0] == test_client.post("/predict", json=IRIS_ROW).json()["prediction"]
+    assert np.allclose(np.sum(result["probabilities"], axis=1), 1.0)
+
+
+def test_predict_batch_rejects_ragged_columns(test_client, trained_model):
+    """測試欄位長度不一致時回傳 422"""
+    run_id, _ = trained_model
+    test_client.post("/load-model", json={"run_id": run_id})
+    columns = {name: [1.0, 2.0] for name in IRIS_ROW}
+    columns["petal_width"] = [1.0]
+    response = test_client.post("/predict/batch", json=columns)
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_load_model_compiled(test_client, trained_model):
+    """測試以編譯 scorer 載入後預測結果不變"""
+    run_id, _ = trained_model
+    test_client.post("/load-model", json={"run_id": run_id, "compile": False})
+    expected = test_client.post("/predict", json=IRIS_ROW).json()
+
+    response = test_client.post("/load-model", json={"run_id": run_id, "compile": True})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["scorer"] == "LinearScorer"
+
+    result = test_client.post("/predict", json=IRIS_ROW).json()
+    assert result["prediction"] == expected["prediction"]
+    for name, prob in expected["probabilities"].items():
+        assert np.isclose(result["probabilities"][name], prob, atol=1e-6)
+
+
+def test_predict_selects_model_by_key(test_client, trained_model):
+    """測試以 header 或 query 參數指定快取中的模型"""
+    run_id, _ = trained_model
+    response = test_client.post("/load-model", json={"run_id": run_id, "alias": "tenant-a"})
+    assert response.status_code == status.HTTP_200_OK
+
+    by_header = test_client.post("/predict", json=IRIS_ROW, headers={"X-Model-Key": "tenant-a"})
+    by_query = test_client.post("/predict", params={"model": run_id}, json=IRIS_ROW)
+    assert by_header.status_code == by_query.status_code == status.HTTP_200_OK
+    assert by_header.json()["model_version"] == run_id
+
+    missing = test_client.post("/predict", json=IRIS_ROW, headers={"X-Model-Key": "unknown"})
+    assert missing.status_code == status.HTTP_404_NOT_FOUND
+
+    loaded = test_client.get("/loaded-models").json()["models"]
+    assert any("tenant-a" in m["aliases"] for m in loaded)
+
+
+def test_background_load_model(test_client, trained_model):
+    """測試背景載入模型並以 job_id 查詢狀態"""
+    import time
+
+    run_id, _ = trained_model
+    response = test_client.post(
+        "/load-model", json={"run_id": run_id, "alias": "canary", "reload": True, "background": True}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    job_id = response.json()["job_id"]
+
+    for _ in range(100):
+        job = test_client.get(f"/load-model/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            break
+        time.sleep(0.1)
+    assert job["status"] == "done", job
+    response = test_client.post("/predict", json=IRIS_ROW, headers={"X-Model-Key": "canary"})
+    assert response.status_code == status.HTTP_200_OK
+
+    assert test_client.get("/load-model/unknown").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_load_job_history_keeps_unfinished_jobs(test_client, trained_model, monkeypatch):
+    """測試載入工作紀錄超過上限時只淘汰已完成的工作"""
+    import time
+    from collections import OrderedDict
+
+    import serving.main as main
+
+    run_id, _ = trained_model
+    stuck = {"job_id": "stuck", "status": "running"}
+    old = {"job_id": "old", "status": "done"}
+    monkeypatch.setattr(main, "_load_jobs", OrderedDict(stuck=stuck, old=old))
+    monkeypatch.setattr(main, "MAX_LOAD_JOBS", 2)
+
+    job_id = test_client.post(
+        "/load-model", json={"run_id": run_id, "alias": "", "reload": True, "background": True}
+    ).json()["job_id"]
+    assert list(main._load_jobs) == ["stuck", job_id]
+    for _ in range(100):
+        job = test_client.get(f"/load-model/{job_id}").json()
+        if job["status"] in ("done", "failed"):
+            break
+        time.sleep(0.1)
+    assert job["status"] == "done", job
+
+
+def test_load_registry_stage_follows_promotion(test_client, trained_model):
+    """測試以 models:/<name>/<stage> 載入並在晉升新版本後切換"""
+    import serving.main as main
+    from mlflow.tracking import MlflowClient
+
+    run_id, _ = trained_model
+    name = "iris-stage-test"
+    MlflowClient().create_registered_model(name)
+    v1 = test_client.post("/register-model", json={"run_id": run_id, "model_name": name}).json()["version"]
+    test_client.post(f"/model/{name}/{v1}/promote", json={"stage": "Staging"})
+
+    response = test_client.post(
+        "/load-model", json={"model_uri": f"models:/{name}/Staging", "alias": "staging"}
+    )
+    assert response.status_code == status.HTTP_200_OK, response.json()
+    assert response.json()["model_version"] == f"{name}/{v1}"
+
+    v2 = test_client.post("/register-model", json={"run_id": run_id, "model_name": name}).json()["version"]
+    test_client.post(f"/model/{name}/{v2}/promote", json={"stage": "Staging"})
+    main._promotion_watcher.check()
+
+    result = test_client.post("/predict", json=IRIS_ROW, headers={"X-Model-Key": "staging"})
+    assert result.json()["model_version"] == f"{name}/{v2}"
+    assert test_client.get("/loaded-models").json()["watching"][f"models:/{name}/Staging"] == str(v2)
+
+
+def test_promotion_watcher_checks_do_not_overlap():
+    """測試同時呼叫 check 時新版本只會被載入一次"""
+    import threading
+    import time
+
+    from src.mlops_framework.registry import ModelVersionRef, PromotionWatcher
+
+    class Resolver:
+        def resolve(self, name, stage, refresh=False):
+            return ModelVersionRef(name=name, version="2", run_id="r", stage=stage)
+
+    loads = []
+
+    def on_change(ref):
+        time.sleep(0.2)  # 模擬載入與暖機
+        loads.append(ref.version)
+
+    watcher = PromotionWatcher(Resolver(), on_change, interval=3600)
+    watcher.watch("iris", "Production", "1")
+    threads = [threading.Thread(target=watcher.check) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    watcher.stop()
+    assert loads == ["2"]
+    assert watcher.watched() == {"models:/iris/Production": "2"}
+
+
+def test_failed_stage_load_registers_no_watch(test_client, tmp_path):
+    """測試 stage 模型載入失敗時不會留下追蹤設定"""
+    from mlflow.tracking import MlflowClient
+
+    client = MlflowClient()
+    name = "iris-broken-stage"
+    client.create_registered_model(name)
+    version = client.create_model_version(name, source=str(tmp_path / "missing")).version
+    client.transition_model_version_stage(name, version, "Production")
+
+    response = test_client.post("/load-model", json={"model_uri": f"models:/{name}/Production", "alias": ""})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert f"models:/{name}/Production" not in test_client.get("/loaded-models").json()["watching"]
+
+def test_query_endpoints_etag_and_invalidation(test_client, trained_model):
+    """測試查詢端點的 ETag 304 與註冊後快取失效"""
+    from mlflow.tracking import MlflowClient
+
+    run_id, _ = trained_model
+    first = test_client.get("/models")
+    assert first.status_code == status.HTTP_200_OK
+    etag = first.headers["ETag"]
+
+    cached = test_client.get("/models", headers={"If-None-Match": etag})
+    assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+
+    MlflowClient().create_registered_model("iris-cache-test")
+    test_client.post("/register-model", json={"run_id": run_id, "model_name": "iris-cache-test"})
+    refreshed = test_client.get("/models", headers={"If-None-Match": etag})
+    assert refreshed.status_code == status.HTTP_200_OK
+    assert "iris-cache-test" in [m["name"] for m in refreshed.json()]
+
+
+def test_train_job_lifecycle(test_client):
+    """測試 /train 透過行程池執行並可查詢工作狀態"""
+    import time
+
+    response = test_client.post("/train", json={"model_name": "iris-job-test", "max_iter": 100})
+    assert response.status_code == status.HTTP_200_OK
+    job_id = response.json()["job_id"]
+
+    for _ in range(600):
+        job = test_client.get(f"/train/jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed"):
+            break
+        time.sleep(0.1)
+    assert job["status"] == "succeeded", job
+    assert job["result"]["metrics"]["accuracy"] > 0.9
+
+    status_response = test_client.get("/train-status", params={"model_name": "iris-job-test"})
+    assert status_response.json()["run_id"] == job["result"]["run_id"]
+    assert test_client.delete(f"/train/jobs/{job_id}").status_code == status.HTTP_409_CONFLICT
+
+
+def test_import_does_not_load_mlflow():
+    """測試匯入 serving 不會載入 mlflow（冷啟動延遲匯入）"""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    code = "import sys, serving.main; assert 'mlflow' not in sys.modules, 'mlflow imported eagerly'"
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parents[1])
+
+
+def test_preload_and_readiness(test_client, trained_model, monkeypatch):
+    """測試啟動預載模型完成並暖機後 /ready 才回報就緒"""
+    import serving.main as main
+
+    run_id, _ = trained_model
+    monkeypatch.setattr(main, "_preload_state", {"status": "pending", "target": run_id})
+    response = test_client.get("/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    main._preload_model(run_id)
+    response = test_client.get("/ready")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["model_version"] == run_id
+    assert response.json()["model_loaded"]
+    assert test_client.post("/predict", json=IRIS_ROW).json()["model_version"] == run_id
+
+
+def test_failed_preload_is_reported_by_ready(test_client, monkeypatch):
+    """測試 latest 預載失敗時 /ready 回報失敗原因"""
+    import serving.main as main
+    from src.mlops_framework.model_cache import ModelCache
+
+    monkeypatch.setattr(main, "_models", ModelCache())
+    monkeypatch.setattr(main, "_preload_state", {"status": "pending", "target": "latest"})
+    monkeypatch.setenv("SERVING_MODEL_URI", "models:/no-such-model/Production")
+    main._preload_model("latest")
+    response = test_client.get("/ready")
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response.json()["status"] == "failed"
+    assert "no-such-model" in response.json()["error"]
+
+
+def test_app_restart_gets_fresh_executors():
+    """測試同一行程內重新啟動 app 時重新建立已關閉的執行器"""
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    code = (
+        "from fastapi.testclient import TestClient\n"
+        "import serving.main as main\n"
+        "for _ in range(2):\n"
+        "    with TestClient(main.app) as client:\n"
+        "        assert main._load_executor.submit(int, '1').result() == 1\n"
+        "        assert client.get('/train/jobs').json() == []\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=Path(__file__).resolve().parents[1])
+
+def test_metrics_endpoint(test_client, trained_model):
+    """測試 /metrics 匯出路由延遲、推論階段、模型載入與錯誤計數"""
+    run_id, _ = trained_model
+    assert test_client.post("/load-model", json={"run_id": run_id, "alias": "metrics-test"}).status_code == 200
+    test_client.post("/predict", json=IRIS_ROW, headers={"X-Model-Key": "metrics-test"})
+    test_client.post("/predict/batch", json={"rows": [IRIS_ROW] * 3}, headers={"X-Model-Key": "metrics-test"})
+    test_client.post("/predict", json={"invalid": "data"})
+
+    response = test_client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'http_request_duration_seconds_count{method="POST",route="/predict",status="200"}' in text
+    assert 'http_request_errors_total{method="POST",route="/predict",status="422"}' in text
+    for stage in ("convert", "predict_proba", "respond"):
+        assert f'predict_stage_seconds_count{{endpoint="predict",stage="{stage}"}}' in text
+    assert 'predict_batch_rows_bucket{endpoint="predict_batch",le="4.0"}' in text
+    assert 'model_load_seconds_count{phase="warmup"}' in text
+    assert f'model_loaded_info{{key="{run_id}",version="{run_id}",alias="metrics-test"}} 1.0' in text
+
+
+def test_predict_raw_content_negotiation(test_client, trained_model):
+    """測試 /predict/raw 支援原始 float32 輸入輸出與 JSON 精簡陣列"""
+    run_id, _ = trained_model
+    assert test_client.post("/load-model", json={"run_id": run_id, "alias": "raw-test"}).status_code == 200
+    X = np.array([list(IRIS_ROW.values())] * 3, dtype="<f4")
+
+    response = test_client.post(
+        "/predict/raw?model=raw-test",
+        content=X.tobytes(),
+        headers={"Content-Type": "application/octet-stream; dtype=float32",
+                 "Accept": "application/octet-stream; dtype=float32"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["x-shape"] == "3,3"
+    proba = np.frombuffer(response.content, dtype="<f4").reshape(3, 3)
+    np.testing.assert_allclose(proba.sum(axis=1), 1.0, atol=1e-5)
+
+    response = test_client.post("/predict/raw?model=raw-test", json={"rows": X.tolist()})
+    body = response.json()
+    assert body["predictions"] == ["setosa"] * 3
+    np.testing.assert_allclose(body["probabilities"], proba, atol=1e-5)
+
+    response = test_client.post("/predict/raw?model=raw-test", content=b"a,b", headers={"Content-Type": "text/csv"})
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+def test_predict_raw_rejects_oversized_body(test_client, trained_model, monkeypatch):
+    """測試 /predict/raw 在讀完整個 body 前就以 413 拒絕過大的請求"""
+    import serving.main as main
+
+    run_id, _ = trained_model
+    monkeypatch.setattr(main, "MAX_RAW_BODY_BYTES", 64)
+    headers = {"Content-Type": "application/octet-stream; dtype=float32"}
+    big = np.zeros((8, 4), dtype="<f4").tobytes()
+    response = test_client.post(f"/predict/raw?model={run_id}", content=big, headers=headers)
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    # 沒有 Content-Length 的分塊上傳也在超過上限時中止
+    response = test_client.post(f"/predict/raw?model={run_id}", content=iter([big[:48], big[48:]]), headers=headers)
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+    small = np.zeros((2, 4), dtype="<f4").tobytes()
+    assert test_client.post(f"/predict/raw?model={run_id}", content=small, headers=headers).status_code == 200
+
+
+def test_prediction_cache_hits_and_swap_invalidation(test_client, trained_model, monkeypatch):
+    """測試重複特徵向量不經過模型，且模型重新載入後快取失效"""
+    import serving.main as main
+    from src.mlops_framework.prediction_cache import PredictionCache
+
+    run_id, _ = trained_model
+    monkeypatch.setattr(main, "_prediction_cache", PredictionCache(max_entries=100))
+    assert test_client.post("/load-model", json={"run_id": run_id, "alias": "memo-test"}).status_code == 200
+
+    first = test_client.post("/predict?model=memo-test", json=IRIS_ROW).json()
+    second = test_client.post("/predict?model=memo-test", json=IRIS_ROW).json()
+    assert first == second
+    stats = test_client.get("/predict/cache").json()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    # 重新載入（熱抽換）後舊結果被清除
+    assert test_client.post("/load-model", json={"run_id": run_id, "alias": "memo-test", "reload": True}).status_code == 200
+    assert test_client.get("/predict/cache").json()["entries"] == 0
+    test_client.post("/predict?model=memo-test", json=IRIS_ROW)
+    assert test_client.get("/predict/cache").json()["misses"] == 2
+
+
+def test_shared_artifact_hot_swap(test_client, tmp_path, monkeypatch):
+    """測試所有 worker 共用的記憶體映射模型與依版本指標熱抽換"""
+    import serving.main as main
+    from sklearn.datasets import load_iris
+    from sklearn.linear_model import LogisticRegression
+    from src.mlops_framework.shared_artifacts import ArtifactWatcher, export_scorer
+
+    X, y = load_iris(return_X_y=True)
+    export_scorer(LogisticRegression(max_iter=500).fit(X, y), tmp_path, "v1")
+    watcher = ArtifactWatcher(tmp_path, main._load_shared_sync, interval=3600)
+    monkeypatch.setattr(main, "SHARED_ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "_artifact_watcher", watcher)
+
+    main._preload_model("shared")
+    try:
+        assert test_client.post("/predict", json=IRIS_ROW).json()["model_version"] == "v1"
+
+        export_scorer(LogisticRegression(C=0.1, max_iter=500).fit(X, y), tmp_path, "v2")
+        watcher.check()
+        assert test_client.post("/predict", json=IRIS_ROW).json()["model_version"] == "v2"
+        keys = [m["key"] for m in test_client.get("/loaded-models").json()["models"]]
+        assert "shared/v2" in keys and "shared/v1" not in keys
+    finally:
+        watcher.stop()
+        main._models.remove("shared/v2")
+
+
+def test_run_queries_use_file_store_index(test_client, trained_model):
+    """測試 file: tracking store 的 run 查詢改由 SQLite 索引回答"""
+    import serving.main as main
+
+    run_id, _ = trained_model
+    main._runs_changed()
+    index = main._run_index()
+    assert index is not None
+    assert str(index.path).startswith(os.environ["MLOPS_RUN_INDEX_DIR"])  # 測試不寫入使用者快取目錄
+    runs = test_client.get("/experiments/iris-demo/runs", params={"max_results": 1000}).json()
+    assert run_id in [r["run_id"] for r in runs]
+    assert [r["start_time"] for r in runs] == sorted((r["start_time"] for r in runs), reverse=True)
+    assert test_client.get("/experiments/no-such-experiment/runs").status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_run_index_refresh_is_throttled(test_client, monkeypatch):
+    """測試 run 索引在最短間隔內不重複刷新，訓練完成後才強制刷新"""
+    import serving.main as main
+
+    monkeypatch.setattr(main, "RUN_INDEX_REFRESH_SECONDS", 3600)
+    main._runs_changed()
+    index = main._run_index()
+    calls = []
+    monkeypatch.setattr(index, "refresh", lambda full=False: calls.append(full))
+    main._run_index()
+    main._run_index()
+    assert calls == []
+    main._runs_changed()
+    main._run_index()
+    assert calls == [False]
+
+def test_predict_stream_ndjson(test_client, trained_model, monkeypatch):
+    """測試 NDJSON 串流推論：分塊向量化預測、保持順序，壞列以錯誤行結束串流"""
+    import json
+
+    import serving.main as main
+
+    run_id, _ = trained_model
+    assert test_client.post("/load-model", json={"run_id": run_id}).status_code == status.HTTP_200_OK
+    monkeypatch.setattr(main, "STREAM_CHUNK_ROWS", 64)
+
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0.1, 7.0, size=(300, 4))
+    lines = [json.dumps(row) if i % 2 else json.dumps(dict(zip(main.FEATURE_NAMES, row))) for i, row in enumerate(X.tolist())]
+    response = test_client.post(f"/predict/stream?model={run_id}", content="\n".join(lines))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    batch = test_client.post(f"/predict/batch?model={run_id}", json=dict(zip(main.FEATURE_NAMES, X.T.tolist()))).json()
+    assert [r["prediction"] for r in results] == batch["predictions"]
+    np.testing.assert_allclose([list(r["probabilities"].values()) for r in results], batch["probabilities"])
+
+    bad = test_client.post(f"/predict/stream?model={run_id}", content="\n".join(lines[:100] + ["[1, 2]"]))
+    results = [json.loads(line) for line in bad.text.splitlines()]
+    assert len(results) == 65 and results[-1]["rows_completed"] == 64
+    assert "Row 100" in results[-1]["error"]
+
+
+def test_predict_stream_reports_model_errors_in_band(test_client):
+    """測試串流中模型拋出例外時以錯誤行正常結束串流"""
+    import json
+
+    import serving.main as main
+
+    class _BrokenModel:
+        classes_ = np.array([0, 1, 2])
+        n_features_in_ = 4
+
+        def predict_proba(self, X):
+            raise RuntimeError("scorer exploded")
+
+    main._models.put("broken-stream", _BrokenModel(), nbytes=0)
+    try:
+        response = test_client.post("/predict/stream?model=broken-stream", content="[1, 2, 3, 4]\n[1, 2, 3, 4]")
+        assert response.status_code == status.HTTP_200_OK
+        results = [json.loads(line) for line in response.text.splitlines()]
+        assert results == [{"error": "Prediction failed: RuntimeError: scorer exploded", "rows_completed": 0}]
+    finally:
+        main._models.remove("broken-stream")
@@ -0,0 +1,44 @@
+import numpy as np
+from sklearn.datasets import load_iris
+from sklearn.linear_model import LogisticRegression
+
+from src.mlops_framework.shared_artifacts import (
+    ArtifactWatcher,
+    current_version,
+    export_scorer,
+    load_shared_scorer,
+)
+
+
+def _fit(C=1.0):
+    X, y = load_iris(return_X_y=True)
+    return X, LogisticRegression(C=C, max_iter=500).fit(X, y)
+
+
+def test_export_and_memory_map(tmp_path):
+    """測試匯出的係數以唯讀記憶體映射載入且預測與 sklearn 一致"""
+    X, model = _fit()
+    export_scorer(model, tmp_path, "v1")
+    assert current_version(tmp_path) == "v1"
+
+    scorer = load_shared_scorer(tmp_path)
+    assert isinstance(scorer.coef_T, np.memmap)
+    assert not scorer.coef_T.flags.writeable
+    np.testing.assert_allclose(scorer.predict_proba(X), model.predict_proba(X), atol=1e-6)
+
+
+def test_watcher_follows_current_and_prunes(tmp_path):
+    """測試版本指標變更時觸發熱抽換，並只保留最近的版本"""
+    _, model = _fit()
+    export_scorer(model, tmp_path, "v1", keep=2)
+    seen = []
+    watcher = ArtifactWatcher(tmp_path, seen.append, interval=60)
+    watcher.version = "v1"
+    watcher.check()
+    assert seen == []
+
+    for version in ("v2", "v3"):
+        export_scorer(_fit(C=0.5)[1], tmp_path, version, keep=2)
+    watcher.check()
+    assert seen == ["v3"]
+    assert sorted(p.name for p in (tmp_path / "versions").iterdir()) == ["v2", "v3"]
@@ -0,0 +1,48 @@
+import mlflow
+
+from src.mlops_framework.sweep import sample_space, sweep
+
+
+def test_sample_space_grid_and_random():
+    """測試 grid 與 random 搜尋空間展開"""
+    grid = sample_space({"C": [0.1, 1.0], "max_iter": [50, 100]})
+    assert len(grid) == 4
+
+    trials = sample_space({"C": {"low": 0.01, "high": 10.0, "log": True}, "max_iter": [100]},
+                          mode="random", n_trials=5)
+    assert len(trials) == 5
+    assert all(0.01 <= t["C"] <= 10.0 and t["max_iter"] == 100 for t in trials)
+
+
+def test_sweep_logs_nested_trials():
+    """測試 sweep 以巢狀 run 記錄每個 trial 並回傳最佳結果"""
+    result = sweep({"C": [0.1, 1.0, 10.0], "max_iter": [100]}, max_workers=2)
+    assert len(result["trials"]) == 3
+    assert result["best"]["metrics"]["accuracy"] > 0.9
+
+    children = mlflow.search_runs(
+        experiment_names=["iris-demo"],
+        filter_string=f"tags.mlflow.parentRunId = '{result['run_id']}'",
+    )
+    assert len(children) == 3
+    assert (children["metrics.stage_trial_seconds"] > 0).all()
+    parent = mlflow.get_run(result["run_id"]).data.metrics
+    assert parent["stage_load_seconds"] > 0 and parent["stage_trials_seconds"] > 0
+
+
+def test_sweep_successive_halving():
+    """測試 successive halving 逐輪淘汰設定"""
+    result = sweep({"C": [0.01, 0.1, 1.0, 10.0], "max_iter": [90]}, max_workers=2,
+                   halving=True, eta=2, min_iter=10)
+    rungs = [t["rung"] for t in result["trials"]]
+    assert rungs.count(0) == 4 and rungs.count(1) == 2 and rungs.count(2) == 1
+    assert result["best"]["params"]["max_iter"] == 90
+
+
+def test_sweep_halving_ignores_max_iter_grid():
+    """測試 halving 時只差在 max_iter 的設定不會重複執行"""
+    result = sweep({"C": [0.1, 1.0], "max_iter": [50, 90]}, max_workers=2,
+                   halving=True, eta=2, min_iter=10)
+    first = [t["params"]["C"] for t in result["trials"] if t["rung"] == 0]
+    assert sorted(first) == [0.1, 1.0]
+    assert result["best"]["params"]["max_iter"] == 90
@@ -0,0 +1,42 @@
+import mlflow
+
+from src.mlops_framework.tracking import RunLogger
+
+
+class _RecordingClient:
+    """假 MlflowClient：記錄 log_batch 呼叫"""
+
+    def __init__(self):
+        self.batches = []
+
+    def log_batch(self, run_id, metrics=(), params=(), tags=()):
+        self.batches.append((len(metrics), len(params), len(tags)))
+
+
+def test_run_logger_batches_and_splits_limits():
+    """測試緩衝的參數與指標以批次送出，並遵守單批上限"""
+    client = _RecordingClient()
+    with RunLogger("run-1", client=client) as tracker:
+        tracker.log_params({f"p{i}": i for i in range(150)})
+        tracker.log_metrics({"accuracy": 0.9, "f1_micro": 0.9})
+        tracker.set_tags({"stage": "test"})
+        assert client.batches == []  # 結束前不應送出
+    assert client.batches == [(2, 100, 1), (0, 50, 0)]
+
+
+def test_run_logger_uploads_model_before_exit(trained_model):
+    """測試背景上傳的模型在離開 context 後可被載入"""
+    from sklearn.dummy import DummyClassifier
+
+    model = DummyClassifier().fit([[0], [1]], [0, 1])
+    with mlflow.start_run() as run, RunLogger(run.info.run_id) as tracker:
+        tracker.log_model(model, "model")
+        tracker.log_metrics({"accuracy": 1.0})
+    loaded = mlflow.sklearn.load_model(f"runs:/{run.info.run_id}/model")
+    assert loaded.predict([[0]]).shape == (1,)
+    assert mlflow.get_run(run.info.run_id).data.metrics["accuracy"] == 1.0
+    # 與 mlflow.sklearn.log_model 相同，run 帶有 logged model 紀錄
+    import json
+
+    history = json.loads(mlflow.get_run(run.info.run_id).data.tags["mlflow.log-model.history"])
+    assert [(h["artifact_path"], "sklearn" in h["flavors"]) for h in history] == [("model", True)]